@@ -0,0 +1,54 @@
+"""Animatic frame generation and rendering for a 60-scene project"""
+import os
+from io import BytesIO
+
+from studio import animatic
+from studio.images import save_reference_image
+
+SCENES = 60
+
+
+def _project(reference_images, data_dir):
+    characters = {
+        f'Character {i}': {'image_path': save_reference_image(BytesIO(payload), data_dir)}
+        for i, payload in enumerate(reference_images[:6])
+    }
+    names = list(characters)
+    scenes = [
+        {
+            'scene_number': i + 1,
+            'narration': f'Scene {i}: the footsteps stop right outside my door.',
+            'assigned_character': names[i % len(names)],
+            'visual_description': 'a dark corridor'
+        }
+        for i in range(SCENES)
+    ]
+    return {'scenes': scenes}, characters
+
+
+def bench_animatic_frames(benchmark, reference_images, data_dir):
+    script, characters = _project(reference_images, data_dir)
+    shots = [
+        (animatic.base_frame(characters[scene['assigned_character']]['image_path'], data_dir=data_dir),
+         animatic.caption_overlay(scene['narration']))
+        for scene in script['scenes']
+    ]
+
+    count = benchmark(lambda: sum(1 for _ in animatic.iter_frames(shots)))
+    assert count == SCENES * round(animatic.FPS * animatic.SCENE_SECONDS)
+
+
+def bench_animatic_render_cached_frames(benchmark, reference_images, data_dir):
+    script, characters = _project(reference_images, data_dir)
+    animatic.render_animatic(script, characters, data_dir)
+    counter = iter(range(10 ** 6))
+
+    def render_new_captions():
+        # Base frames come from the cache; only the captions and the encode are new
+        run = next(counter)
+        for scene in script['scenes']:
+            scene['narration'] = f"Take {run}: {scene['narration']}"
+        return animatic.render_animatic(script, characters, data_dir)
+
+    path = benchmark.pedantic(render_new_captions, rounds=3)
+    assert os.path.exists(path)
@@ -0,0 +1,19 @@
+"""Consistency scoring of a 60-clip project against character references"""
+import numpy as np
+
+from studio import consistency
+
+CLIPS = 60
+SIZE = consistency.FEATURE_SIZE
+
+
+def bench_clip_distances(benchmark):
+    rng = np.random.default_rng(0)
+    clip_frames = [
+        rng.integers(0, 256, (consistency.MAX_SAMPLES, SIZE, SIZE, 3), dtype=np.uint8) for _ in range(CLIPS)
+    ]
+    references = rng.integers(0, 256, (CLIPS, SIZE, SIZE, 3), dtype=np.uint8)
+
+    distances = benchmark(consistency.clip_distances, clip_frames, references)
+    assert distances.shape == (CLIPS,)
+    assert not consistency.flag_outliers(distances).all()
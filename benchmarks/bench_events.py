@@ -0,0 +1,44 @@
+"""Event log appends, recent-activity queries and throughput stats"""
+import random
+
+import pytest
+
+from studio import events
+
+EVENT_COUNT = 50000
+PLATFORMS = ('runwayml', 'kling', 'pika', 'luma')
+
+
+@pytest.fixture
+def event_log(data_dir):
+    """A log holding a day of events, enough to have rotated"""
+    rng = random.Random(1313)
+    log = events.EventLog(data_dir, max_bytes=2 * 1024 * 1024)
+    batch = []
+    for i in range(EVENT_COUNT):
+        task = {'task_id': f'{i:08x}-task', 'platform': rng.choice(PLATFORMS), 'script': f'Script {i % 200}', 'scene': i % 50}
+        if i % 3 == 0:
+            batch.append(('submitted', {**task, 'attempt': 1, 'cost': 0.25}))
+        elif i % 3 == 1:
+            batch.append(('status', {**task, 'from': 'RUNNING', 'to': 'SUCCEEDED', 'duration': rng.uniform(30, 300)}))
+        else:
+            batch.append(('activity', {'message': f'Submitted videos for: Script {i % 200}'}))
+        if len(batch) == 1000:
+            log.record_many(batch, now=1_000_000 + i)
+            batch = []
+    return log
+
+
+def bench_record_event(benchmark, data_dir):
+    log = events.EventLog(data_dir)
+    benchmark(log.record, 'status', task_id='t', platform='runwayml', to='SUCCEEDED', duration=84.0)
+
+
+def bench_recent_activity(benchmark, event_log):
+    recent = benchmark(event_log.query, kinds=('activity',), limit=5)
+    assert len(recent) == 5
+
+
+def bench_throughput_stats(benchmark, event_log):
+    per_hour, rows = benchmark(event_log.stats, now=1_000_000 + EVENT_COUNT)
+    assert per_hour and len(rows) == len(PLATFORMS)
@@ -0,0 +1,55 @@
+"""Exporting a master in three presets: one decode for all of them against one per preset"""
+import shutil
+import subprocess
+
+import pytest
+
+from studio import export
+from studio.animatic import ffmpeg_exe
+
+# Small frames keep the encode cheap enough to repeat; the decode is what's shared
+PRESETS = {
+    name: {**preset, 'size': (270, 480), 'video_bitrate': '1M'}
+    for name, preset in export.PRESETS.items()
+}
+ROUNDS = 3
+
+
+@pytest.fixture
+def master(data_dir, tmp_path):
+    ffmpeg = ffmpeg_exe()
+    if not ffmpeg:
+        pytest.skip("ffmpeg is not available")
+    clips = []
+    for i in range(3):
+        path = str(tmp_path / f"clip{i}.mp4")
+        subprocess.run([
+            ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'testsrc=size=768x1280:rate=24:duration=5',
+            '-f', 'lavfi', '-i', 'sine=frequency=220:duration=5',
+            '-c:v', 'libx264', '-preset', 'ultrafast', '-c:a', 'aac', '-shortest', path
+        ], check=True)
+        clips.append(path)
+    return export.assemble_master(clips, data_dir)
+
+
+def _clear_exports(data_dir):
+    shutil.rmtree(f"{data_dir}/{export.EXPORTS_DIR}", ignore_errors=True)
+
+
+def bench_export_one_pass(benchmark, master, data_dir):
+    paths = benchmark.pedantic(export.export_master, args=(master, PRESETS, data_dir),
+                               setup=lambda: _clear_exports(data_dir), rounds=ROUNDS)
+    assert set(paths) == set(PRESETS)
+
+
+def bench_export_pass_per_preset(benchmark, master, data_dir):
+    def export_separately():
+        return [export.export_master(master, {name: preset}, data_dir) for name, preset in PRESETS.items()]
+
+    benchmark.pedantic(export_separately, setup=lambda: _clear_exports(data_dir), rounds=ROUNDS)
+
+
+def bench_export_cached(benchmark, master, data_dir):
+    export.export_master(master, PRESETS, data_dir)
+    benchmark(export.export_master, master, PRESETS, data_dir)
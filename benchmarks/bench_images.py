@@ -0,0 +1,16 @@
+"""Reference image ingest from the add-character form"""
+from io import BytesIO
+
+from studio.images import save_reference_image
+
+INGEST_BATCH = 25
+
+
+def bench_image_ingest(benchmark, reference_images, data_dir):
+    batch = reference_images[:INGEST_BATCH]
+
+    def ingest():
+        for payload in batch:
+            save_reference_image(BytesIO(payload), data_dir)
+
+    benchmark.pedantic(ingest, rounds=5, warmup_rounds=1)
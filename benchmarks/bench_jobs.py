@@ -0,0 +1,44 @@
+"""Job queue ordering over a large backlog, and variant assembly readiness"""
+import random
+
+from studio import jobs, tasks, variants
+
+
+def bench_build_heap(benchmark, scripts):
+    rng = random.Random(11)
+    priorities = list(jobs.PRIORITIES)
+    scripts = {
+        title: {**script, 'priority': priorities[i % len(priorities)]}
+        for i, (title, script) in enumerate(scripts.items())
+    }
+    queued = {
+        f'local-{i:08x}': {
+            'script_title': f'Script {i % len(scripts)}',
+            'scene_number': i % 50 + 1,
+            'platform': 'runwayml',
+            'status': tasks.QUEUED,
+            'enqueued_at': rng.uniform(0, 3600)
+        }
+        for i in range(5000)
+    }
+
+    heap = benchmark(jobs.build_heap, queued, scripts, now=10_000)
+    assert len(heap) == len(queued)
+
+
+def bench_assembly_status(benchmark, video_tasks):
+    """A 50-scene project with four variants per scene among the other projects' tasks"""
+    rng = random.Random(12)
+    scenes = [
+        {'scene_number': number, 'variants': [{'variant': v} for v in range(1, 5)], 'winner': rng.choice([None, 1, 2])}
+        for number in range(1, 51)
+    ]
+    for number in range(1, 51):
+        for variant in range(1, 5):
+            video_tasks[f'variant-{number}-{variant}'] = {
+                'script_title': 'Variants', 'scene_number': number, 'variant': variant,
+                'status': rng.choice(['PENDING', 'RUNNING', 'SUCCEEDED'])
+            }
+
+    ready = benchmark(variants.assembly_status, {'scenes': scenes}, video_tasks, 'Variants')
+    assert len(ready['clips']) + len(ready['pick']) + len(ready['rendering']) == len(scenes)
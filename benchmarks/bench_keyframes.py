@@ -0,0 +1,31 @@
+"""Keyframe rendering and cache hits"""
+import os
+from io import BytesIO
+
+from studio.images import save_reference_image
+from studio.keyframes import render_keyframes
+
+SCENES = 40
+
+
+def _requests(reference_images, data_dir):
+    paths = [save_reference_image(BytesIO(payload), data_dir) for payload in reference_images[:4]]
+    return [(paths[i % len(paths)], f'Scene {i}: a figure waits at the end of the corridor') for i in range(SCENES)]
+
+
+def bench_keyframes_cold(benchmark, reference_images, data_dir):
+    items = _requests(reference_images, data_dir)
+    counter = iter(range(10 ** 6))
+
+    def render_fresh():
+        return render_keyframes(items, data_dir=os.path.join(data_dir, f'run{next(counter)}'))
+
+    _, rendered = benchmark.pedantic(render_fresh, rounds=3)
+    assert rendered == SCENES
+
+
+def bench_keyframes_cached(benchmark, reference_images, data_dir):
+    items = _requests(reference_images, data_dir)
+    render_keyframes(items, data_dir=data_dir)
+    _, rendered = benchmark(render_keyframes, items, data_dir=data_dir)
+    assert rendered == 0
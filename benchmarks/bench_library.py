@@ -0,0 +1,47 @@
+"""Character and script library index build, search and bulk script import"""
+import copy
+
+from studio import script_import
+from studio.library import CharacterIndex, ScriptIndex
+
+
+def bench_character_index_build(benchmark, characters):
+    benchmark(CharacterIndex, characters)
+
+
+def bench_character_search(benchmark, characters):
+    index = CharacterIndex(characters)
+    matches = benchmark(index.search, 'door dar')
+    assert matches
+
+
+def bench_script_index_build(benchmark, scripts):
+    benchmark(lambda: ScriptIndex().update(scripts))
+
+
+def bench_script_index_one_edit(benchmark, scripts):
+    scripts = copy.deepcopy(scripts)
+    index = ScriptIndex().update(scripts)
+    original = scripts['Script 7']['content']
+    counter = iter(range(10 ** 6))
+
+    def edit():
+        # One script's text changes; the rest are only compared, not re-tokenized
+        scripts['Script 7']['content'] = f"{original} Edit {next(counter)}."
+        return index.update(scripts)
+
+    benchmark(edit)
+    assert index.search('edit')
+
+
+def bench_script_search(benchmark, scripts):
+    index = ScriptIndex().update(scripts)
+    matches = benchmark(index.search, 'door dar')
+    assert matches
+
+
+def bench_script_import_directory(benchmark, scripts, tmp_path):
+    for i, data in enumerate(scripts.values()):
+        (tmp_path / f'script_{i}.txt').write_text(data['content'])
+    summary = benchmark(lambda: script_import.import_scripts(str(tmp_path), {}))
+    assert summary['imported'] == len(scripts)
@@ -0,0 +1,40 @@
+"""Media cache sweeps: scanning the media folders and choosing what to evict"""
+import os
+import random
+
+from studio import media_cache
+
+FILE_COUNT = 100000
+SCANNED_FILES = 2000
+
+
+def bench_plan_eviction(benchmark, scripts, video_tasks):
+    rng = random.Random(49)
+    now = 10_000_000
+    categories = sorted(media_cache.evictable_categories({'evict_deliverables': True}))
+    files = [
+        (rng.choice(categories), f'/srv/horror_shorts_data/cache/{i:08x}.bin', rng.randint(10_000, 5_000_000),
+         now - rng.uniform(0, 60 * 86400))
+        for i in range(FILE_COUNT)
+    ]
+    for i, task_info in enumerate(video_tasks.values()):
+        task_info['video_path'] = files[i][1]
+    total = sum(size for _, _, size, _ in files)
+
+    def plan():
+        return media_cache.plan_eviction(files, media_cache.protected_paths(scripts, video_tasks),
+                                         total // 2, 30 * 86400, now, set(categories))
+
+    evict, freed, over = benchmark(plan)
+    assert freed >= total // 2 and not over
+
+
+def bench_scan_media(benchmark, data_dir):
+    for i in range(SCANNED_FILES):
+        folder = os.path.join(data_dir, media_cache.CATEGORIES['keyframes'][1], f'{i % 256:02x}')
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f'{i:08x}.png'), 'wb') as f:
+            f.write(b'\0' * 64)
+
+    totals = benchmark(lambda: media_cache.usage(media_cache.scan(data_dir)))
+    assert totals['keyframes']['files'] == SCANNED_FILES
@@ -0,0 +1,20 @@
+"""Admission checks against the shared usage ledger"""
+from studio import metering
+from studio.storage import update_json
+
+
+def bench_reserve_batch(benchmark, data_dir):
+    budgets = {'daily_total': 0, 'daily': {}, 'project': 0}
+
+    def reserve_batch():
+        # One 60-second window's worth of submissions per platform, as a full batch would send
+        for platform in metering.PRICING:
+            for i in range(metering.LIMITS[platform]['per_minute']):
+                metering.reserve(platform, 'Bench Project', {}, budgets, now=1_000_000 + i, data_dir=data_dir)
+        update_json(metering.USAGE_FILE, lambda usage: usage.update(recent={}), data_dir=data_dir)
+
+    benchmark(reserve_batch)
+
+
+def bench_in_flight_count(benchmark, video_tasks):
+    benchmark(metering.in_flight, video_tasks, 'runwayml')
@@ -0,0 +1,21 @@
+"""Overhead of the timing instrumentation itself"""
+from studio import perf
+
+
+@perf.instrument('bench.noop')
+def _noop():
+    return None
+
+
+def bench_instrument_disabled(benchmark):
+    perf.enable(False)
+    benchmark(_noop)
+
+
+def bench_instrument_enabled(benchmark):
+    perf.enable(True)
+    try:
+        benchmark(_noop)
+    finally:
+        perf.enable(False)
+        perf.reset()
@@ -0,0 +1,20 @@
+"""Perceptual hashing at ingest and near-duplicate lookup"""
+from io import BytesIO
+
+from studio.phash import HashIndex, dhash, dhash_batch
+
+
+def bench_dhash_single(benchmark, reference_images):
+    benchmark(dhash, BytesIO(reference_images[0]))
+
+
+def bench_dhash_batch(benchmark, reference_images):
+    hashes = benchmark.pedantic(lambda: dhash_batch([BytesIO(payload) for payload in reference_images]), rounds=3)
+    assert len(hashes) == len(reference_images)
+
+
+def bench_duplicate_lookup(benchmark, reference_images):
+    hashes = dhash_batch([BytesIO(payload) for payload in reference_images])
+    index = HashIndex({f'Character {i}': h for i, h in enumerate(hashes)})
+    matches = benchmark(index.matches, hashes[7])
+    assert matches[0] == ('Character 7', 0)
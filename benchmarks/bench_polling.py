@@ -0,0 +1,11 @@
+"""Video status polling against an in-memory RunwayML stand-in"""
+from studio.providers import check_task_status
+
+
+def bench_poll_video_tasks(benchmark, video_tasks, fake_runway):
+    def poll_all():
+        for task_id, task_info in video_tasks.items():
+            check_task_status(task_id, task_info, 'test-key', http=fake_runway)
+
+    benchmark(poll_all)
+    assert fake_runway.calls
@@ -0,0 +1,17 @@
+"""Prompt compilation for a 1000-scene script, cold and memoized"""
+from studio import prompts
+
+
+def bench_compile_prompts_cold(benchmark, big_script, characters):
+    def compile_cold():
+        prompts._compile.cache_clear()
+        return prompts.compile_script_prompts(big_script, characters, 'kling')
+
+    rows = benchmark(compile_cold)
+    assert rows
+
+
+def bench_compile_prompts_cached(benchmark, big_script, characters):
+    prompts.compile_script_prompts(big_script, characters, 'kling')
+    rows = benchmark(prompts.compile_script_prompts, big_script, characters, 'kling')
+    assert rows
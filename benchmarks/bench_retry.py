@@ -0,0 +1,22 @@
+"""Failure classification and retry scheduling over a large task table"""
+import random
+
+from studio import retry
+
+FAILURES = (
+    (None, 'Too many concurrent tasks', None),
+    (None, 'Content moderation rejected the prompt', 'SAFETY'),
+    (None, 'Unsupported image dimensions', 'INPUT.INVALID'),
+    (None, 'Internal error', None),
+)
+
+
+def bench_classify_and_schedule(benchmark, video_tasks):
+    def handle_all():
+        rng = random.Random(7)
+        for i, task_info in enumerate(video_tasks.values()):
+            _, failure, failure_code = FAILURES[i % len(FAILURES)]
+            failure_class = retry.classify(failure=failure, failure_code=failure_code)
+            retry.handle_failure(dict(task_info), failure_class, failure, ['runwayml', 'kling'], now=0, rng=rng)
+
+    benchmark(handle_all)
@@ -0,0 +1,41 @@
+"""Scene generation, the per-rerun readiness scans and timing plans"""
+from studio import timing
+from studio.scenes import count_scenes, find_ready_projects, generate_scenes, scene_counts, total_counts, update_scene
+
+
+def bench_generate_scenes(benchmark, big_script_content):
+    scenes = benchmark(generate_scenes, big_script_content)
+    assert len(scenes) == 1000
+
+
+def bench_scene_builder_readiness(benchmark, big_script):
+    scene_counts(big_script)
+    benchmark(lambda: scene_counts(big_script)['ready'])
+
+
+def bench_scene_readiness_full_scan(benchmark, big_script):
+    benchmark(count_scenes, big_script['scenes'])
+
+
+def bench_update_scene(benchmark, big_script):
+    scene_counts(big_script)
+    benchmark(update_scene, big_script, 500, visual_description='A shadow at the window')
+    assert scene_counts(big_script) == count_scenes(big_script['scenes'])
+
+
+def bench_dashboard_totals(benchmark, scripts):
+    totals = benchmark(total_counts, scripts)
+    assert totals['total'] == sum(len(s['scenes']) for s in scripts.values())
+
+
+def bench_ready_projects_scan(benchmark, scripts):
+    projects = benchmark(find_ready_projects, scripts)
+    assert projects
+
+
+def bench_timing_plan_all_platforms(benchmark, big_script):
+    def plan():
+        return [timing.plan_scenes(big_script['scenes'], platform) for platform in timing.CLIP_LENGTHS]
+
+    plans = benchmark(plan)
+    assert all(p['clip_count'] for p in plans)
@@ -0,0 +1,37 @@
+"""Live status refreshes over a 5000-task table"""
+import copy
+
+from studio import status
+from studio.poller import poll_once
+from studio.storage import save_json
+
+
+def bench_status_refresh_few_changes(benchmark, video_tasks):
+    video_tasks = copy.deepcopy(video_tasks)
+    table = status.StatusTable()
+    table.update(video_tasks, {})
+    task_ids = list(video_tasks)
+    counter = iter(range(10 ** 6))
+
+    def refresh():
+        # A poll typically moves a handful of tasks along
+        run = next(counter)
+        for task_id in task_ids[run % 100::1000]:
+            video_tasks[task_id]['status'] = 'SUCCEEDED' if run % 2 else 'RUNNING'
+        changed = table.update(video_tasks, {})
+        return changed, status.summarize(video_tasks)
+
+    changed, summary = benchmark(refresh)
+    assert len(changed) <= 5
+    assert sum(summary[group] for group in ('queued', 'running', 'succeeded', 'failed', 'cancelled')) == len(video_tasks)
+
+
+def bench_poll_once(benchmark, video_tasks, fake_runway, data_dir):
+    save_json('api_keys.json', {'runwayml': 'test-key'}, data_dir)
+
+    def poll():
+        save_json('video_tasks.json', video_tasks, data_dir)
+        return poll_once(fake_runway, data_dir)
+
+    changed, errors = benchmark.pedantic(poll, rounds=3)
+    assert changed and not errors
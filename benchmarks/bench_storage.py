@@ -0,0 +1,83 @@
+"""load_data()/save_data() round trips over a large studio"""
+from studio.storage import SyncedStore, load_json, save_json
+
+
+def _save_all(characters, scripts, data_dir):
+    save_json('characters.json', characters, data_dir)
+    save_json('scripts.json', scripts, data_dir)
+    save_json('api_keys.json', {'runwayml': 'key', 'kling': '', 'pika': '', 'luma': ''}, data_dir)
+
+
+def bench_save_data(benchmark, characters, scripts, data_dir):
+    benchmark(_save_all, characters, scripts, data_dir)
+
+
+def bench_load_data(benchmark, characters, scripts, data_dir):
+    _save_all(characters, scripts, data_dir)
+
+    def load_all():
+        return (
+            load_json('characters.json', {}, data_dir),
+            load_json('scripts.json', {}, data_dir),
+            load_json('api_keys.json', {}, data_dir)
+        )
+
+    loaded_characters, loaded_scripts, _ = benchmark(load_all)
+    assert len(loaded_characters) == len(characters)
+    assert len(loaded_scripts) == len(scripts)
+
+
+def bench_synced_rerun_unchanged(benchmark, scripts, data_dir):
+    """A rerun that changed nothing: one stat on pull, a diff and no write on push"""
+    store = SyncedStore('scripts.json', data_dir)
+    data = store.push(store.pull(dict(scripts)))
+
+    def rerun():
+        return store.push(store.pull(data))
+
+    benchmark(rerun)
+
+
+def bench_synced_push_one_change(benchmark, scripts, data_dir):
+    store = SyncedStore('scripts.json', data_dir)
+    data = store.push(store.pull(dict(scripts)))
+    counter = iter(range(10 ** 9))
+
+    def edit_and_push():
+        data['Script 0'] = dict(data['Script 0'], created=str(next(counter)))
+        return store.push(data)
+
+    benchmark(edit_and_push)
+
+
+def bench_synced_push_marked_entry(benchmark, scripts, data_dir):
+    """A push that names the edited entry, so no other entry is compared"""
+    store = SyncedStore('scripts.json', data_dir)
+    data = store.push(store.pull(dict(scripts)))
+    counter = iter(range(10 ** 9))
+
+    def edit_and_push():
+        data['Script 0'] = dict(data['Script 0'], created=str(next(counter)))
+        return store.push(data, ['Script 0'])
+
+    benchmark(edit_and_push)
+
+
+def bench_synced_merge_other_scene(benchmark, scripts, data_dir):
+    """Two sessions editing different scenes of one script: a scene-level merge on every push"""
+    ours = SyncedStore('scripts.json', data_dir)
+    theirs = SyncedStore('scripts.json', data_dir)
+    save_json('scripts.json', scripts, data_dir)
+    sessions = {'ours': ours.pull({}), 'theirs': theirs.pull({})}
+    counter = iter(range(10 ** 9))
+
+    def edit_both_and_push():
+        number = str(next(counter))
+        sessions['theirs']['Script 0']['scenes'][1]['narration'] = number
+        sessions['theirs'] = theirs.push(sessions['theirs'], ['Script 0'])
+        sessions['ours']['Script 0']['scenes'][0]['narration'] = number
+        sessions['ours'] = ours.push(sessions['ours'], ['Script 0'])
+        assert sessions['ours']['Script 0']['scenes'][1]['narration'] == number
+        assert not ours.take_conflicts()
+
+    benchmark(edit_both_and_push)
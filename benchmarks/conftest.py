@@ -0,0 +1,156 @@
+"""Synthetic studio data for the benchmark suite
+
+Everything is generated from fixed seeds so runs are comparable with
+``--benchmark-compare``.
+"""
+import os
+import random
+import sys
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from studio.scenes import generate_scenes  # noqa: E402
+
+SEED = 1313
+CHARACTER_COUNT = 300
+SCRIPT_COUNT = 200
+SCENES_PER_SCRIPT = 50
+BIG_SCRIPT_SCENES = 1000
+VIDEO_TASK_COUNT = 5000
+IMAGE_SIZE = (512, 512)
+NOISE_SIZE = (64, 64)
+
+WORDS = (
+    'the door creaked open and something breathed in the dark hallway '
+    'she heard footsteps above her but nobody else was home tonight '
+    'a cold hand touched his shoulder while the lights flickered out'
+).split()
+
+
+def _sentence(rng):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))).capitalize()
+
+
+def _script_content(rng, sentences):
+    return ' '.join(_sentence(rng) + '.' for _ in range(sentences))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return str(tmp_path / 'horror_shorts_data')
+
+
+@pytest.fixture(scope='session')
+def characters():
+    rng = random.Random(SEED)
+    return {
+        f'Character {i}': {
+            'name': f'Character {i}',
+            'description': _sentence(rng),
+            'created': '2024-10-31T00:00:00',
+            'image_path': f'horror_shorts_data/images/Character_{i}.png'
+        }
+        for i in range(CHARACTER_COUNT)
+    }
+
+
+@pytest.fixture(scope='session')
+def big_script_content():
+    return _script_content(random.Random(SEED), BIG_SCRIPT_SCENES)
+
+
+@pytest.fixture(scope='session')
+def scripts(characters):
+    """Scripts whose scenes are roughly half ready for generation"""
+    rng = random.Random(SEED)
+    names = list(characters)
+    scripts = {}
+    for i in range(SCRIPT_COUNT):
+        content = _script_content(rng, SCENES_PER_SCRIPT)
+        scenes = generate_scenes(content)
+        for scene in scenes:
+            if rng.random() < 0.7:
+                scene['assigned_character'] = rng.choice(names)
+            if rng.random() < 0.7:
+                scene['visual_description'] = _sentence(rng)
+        scripts[f'Script {i}'] = {
+            'content': content,
+            'created': '2024-10-31T00:00:00',
+            'scenes': scenes
+        }
+    return scripts
+
+
+@pytest.fixture(scope='session')
+def big_script(big_script_content, characters):
+    rng = random.Random(SEED)
+    names = list(characters)
+    scenes = generate_scenes(big_script_content)
+    for scene in scenes:
+        if rng.random() < 0.5:
+            scene['assigned_character'] = rng.choice(names)
+            scene['visual_description'] = _sentence(rng)
+    return {'content': big_script_content, 'created': '2024-10-31T00:00:00', 'scenes': scenes}
+
+
+@pytest.fixture
+def video_tasks():
+    rng = random.Random(SEED)
+    return {
+        f'{i:08x}-task': {
+            'scene_number': i % SCENES_PER_SCRIPT + 1,
+            'script_title': f'Script {i % SCRIPT_COUNT}',
+            'status': rng.choice(['PENDING', 'RUNNING', 'SUCCEEDED', 'FAILED'])
+        }
+        for i in range(VIDEO_TASK_COUNT)
+    }
+
+
+@pytest.fixture(scope='session')
+def reference_images():
+    """Encoded PNG uploads, one per character"""
+    rng = random.Random(SEED)
+    uploads = []
+    for _ in range(CHARACTER_COUNT):
+        pixels = rng.randbytes(NOISE_SIZE[0] * NOISE_SIZE[1] * 3)
+        image = Image.frombytes('RGB', NOISE_SIZE, pixels).resize(IMAGE_SIZE, Image.BILINEAR)
+        buffer = BytesIO()
+        image.save(buffer, format='PNG')
+        uploads.append(buffer.getvalue())
+    return uploads
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeRunwayHttp:
+    """Answers RunwayML task lookups from memory with a fixed status cycle"""
+
+    STATUSES = ('PENDING', 'RUNNING', 'SUCCEEDED', 'FAILED')
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls += 1
+        task_id = url.rsplit('/', 1)[-1]
+        status = self.STATUSES[self.calls % len(self.STATUSES)]
+        payload = {'id': task_id, 'status': status}
+        if status == 'SUCCEEDED':
+            payload['output'] = [f'https://cdn.example.com/{task_id}.mp4']
+        return FakeResponse(200, payload)
+
+
+@pytest.fixture
+def fake_runway():
+    return FakeRunwayHttp()
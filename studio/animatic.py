@@ -0,0 +1,227 @@
+"""Low-resolution animatic previews of a project
+
+Each ready scene is shown for a couple of seconds as its keyframe (or the
+character's reference image) with a slow Ken Burns pan, captioned
+with its narration. Every scene's start image is scaled once to a small
+padded base frame cached under ``animatic_frames/``; the pan is cut from
+that base, so re-rendering a project only touches scenes whose image
+changed.
+
+Frames are piped to ffmpeg as raw RGB. ffmpeg is found on the PATH, through
+``STUDIO_FFMPEG``, or from the ``imageio-ffmpeg`` package if it is installed;
+without it the animatic is written as a smaller animated GIF instead.
+Renders run on a background thread so the page stays responsive.
+"""
+import hashlib
+import os
+import shutil
+import subprocess
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageOps
+
+from studio import perf
+from studio.blobs import content_digest
+from studio.scenes import is_scene_ready
+from studio.storage import DATA_DIR, temp_path
+from studio.tasks import start_image_path
+
+ANIMATIC_SIZE = (270, 480)
+FPS = 12
+GIF_FPS = 4
+SCENE_SECONDS = 2.0
+# Base frames are this much larger than the output so there is room to pan
+PAN_MARGIN = 0.15
+CAPTION_HEIGHT = 96
+FRAMES_DIR = 'animatic_frames'
+ANIMATICS_DIR = 'animatics'
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='animatic')
+
+
+class AnimaticError(Exception):
+    """Raised when an animatic can't be rendered"""
+
+
+def ffmpeg_exe():
+    """Path to an ffmpeg binary, or None"""
+    configured = os.environ.get('STUDIO_FFMPEG') or shutil.which('ffmpeg')
+    if configured:
+        return configured
+    try:
+        import imageio_ffmpeg
+    except ImportError:
+        return None
+    try:
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except RuntimeError:
+        return None
+
+
+def base_size(size=ANIMATIC_SIZE):
+    return tuple(int(round(d * (1 + PAN_MARGIN))) // 2 * 2 for d in size)
+
+
+def base_frame_path(source_path, size=ANIMATIC_SIZE, data_dir=DATA_DIR):
+    """Cache path of a source image's padded base frame"""
+    key = hashlib.sha256(f"{content_digest(source_path)}\0{size[0]}x{size[1]}".encode('utf-8')).hexdigest()
+    return os.path.join(data_dir, FRAMES_DIR, key[:2], key + '.png')
+
+
+def base_frame(source_path, size=ANIMATIC_SIZE, data_dir=DATA_DIR):
+    """Load (rendering on a cache miss) a scene's base frame as an RGB image"""
+    path = base_frame_path(source_path, size, data_dir)
+    if not os.path.exists(path):
+        with Image.open(source_path) as source:
+            frame = ImageOps.fit(source.convert('RGB'), base_size(size), Image.LANCZOS)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = temp_path(path)
+        try:
+            frame.save(tmp_path, format='PNG', compress_level=1)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return frame
+    with Image.open(path) as cached:
+        return cached.convert('RGB')
+
+
+def caption_overlay(text, size=ANIMATIC_SIZE):
+    """Return (rgb, alpha) arrays for a caption band across the bottom of the frame"""
+    band = Image.new('RGB', (size[0], CAPTION_HEIGHT), (0, 0, 0))
+    draw = ImageDraw.Draw(band)
+    lines = textwrap.wrap(text, width=max(10, size[0] // 7))[:5]
+    y = max(4, (CAPTION_HEIGHT - 14 * len(lines)) // 2)
+    for line in lines:
+        draw.text((8, y), line, fill=(240, 240, 240))
+        y += 14
+    rgb = np.asarray(band, dtype=np.float32)
+    # Dark gradient behind the text, fully opaque where the letters are
+    gradient = np.linspace(0.25, 0.75, CAPTION_HEIGHT, dtype=np.float32)[:, None, None]
+    alpha = np.maximum(gradient, rgb.max(axis=2, keepdims=True) / 255.0)
+    return rgb, alpha
+
+
+def pan_offsets(index, frame_count, size=ANIMATIC_SIZE):
+    """Top-left corners of the output window on the base frame; the direction changes by scene"""
+    base_w, base_h = base_size(size)
+    dx, dy = ((1, 1), (-1, 1), (1, -1), (-1, -1))[index % 4]
+    offsets = []
+    for i in range(frame_count):
+        t = i / max(1, frame_count - 1)
+        x = round((base_w - size[0]) * (t if dx > 0 else 1 - t))
+        y = round((base_h - size[1]) * (t if dy > 0 else 1 - t))
+        offsets.append((x, y))
+    return offsets
+
+
+def iter_frames(shots, size=ANIMATIC_SIZE, fps=FPS, seconds=SCENE_SECONDS):
+    """Yield output frames as uint8 arrays for a list of (base frame, caption) shots
+
+    The pan is a moving window over the base frame, so each frame is a
+    slice plus a blend of the caption band - no per-frame resampling.
+    """
+    frame_count = max(1, int(round(fps * seconds)))
+    width, height = size
+    top = height - CAPTION_HEIGHT
+    for index, (base, caption) in enumerate(shots):
+        pixels = np.asarray(base)
+        caption_rgb, caption_alpha = caption
+        caption_part = caption_rgb * caption_alpha
+        keep = 1 - caption_alpha
+        for x, y in pan_offsets(index, frame_count, size):
+            frame = pixels[y:y + height, x:x + width].copy()
+            frame[top:] = (frame[top:] * keep + caption_part).astype(np.uint8)
+            yield frame
+
+
+def _write_mp4(frames, path, size, fps, ffmpeg):
+    command = [
+        ffmpeg, '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f"{size[0]}x{size[1]}", '-r', str(fps), '-i', '-',
+        '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '30', '-pix_fmt', 'yuv420p',
+        '-movflags', '+faststart', path
+    ]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        for frame in frames:
+            process.stdin.write(frame.tobytes())
+    except BrokenPipeError:
+        pass
+    finally:
+        process.stdin.close()
+    error = process.stderr.read().decode('utf-8', 'replace')
+    process.stderr.close()
+    if process.wait() != 0:
+        raise AnimaticError(f"ffmpeg failed: {error.strip()[-500:]}")
+
+
+def _write_gif(frames, path, fps, shots):
+    """Fallback writer: one palette for the whole animatic keeps quantizing cheap"""
+    sample = np.concatenate([np.asarray(base)[::4, ::4] for base, _ in shots[:64]], axis=0)
+    palette = Image.fromarray(sample).quantize(128, method=Image.Quantize.MEDIANCUT)
+    images = (Image.fromarray(frame).quantize(palette=palette, dither=Image.Dither.NONE) for frame in frames)
+    first = next(images)
+    first.save(path, format='GIF', save_all=True, append_images=images, duration=int(1000 / fps), loop=0)
+
+
+def animatic_key(shot_inputs, size, fps, seconds, extension):
+    payload = '\0'.join([f"{size[0]}x{size[1]}", str(fps), str(seconds), extension] + [
+        f"{base}\1{narration}" for base, narration in shot_inputs
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@perf.instrument('animatic.render')
+def render_animatic(script_data, characters, data_dir=DATA_DIR, size=ANIMATIC_SIZE, fps=FPS, seconds=SCENE_SECONDS):
+    """Render a project's ready scenes to an animatic file and return its path
+
+    A finished animatic is reused when none of its shots changed.
+    """
+    shot_inputs = []
+    for scene in script_data.get('scenes', []):
+        source = start_image_path(scene, characters) if is_scene_ready(scene) else None
+        if source and os.path.exists(source):
+            shot_inputs.append((base_frame_path(source, size, data_dir), source, scene.get('narration', '')))
+    if not shot_inputs:
+        raise AnimaticError("no ready scene has an image to show")
+
+    ffmpeg = ffmpeg_exe()
+    extension = 'mp4' if ffmpeg else 'gif'
+    if not ffmpeg:
+        fps = GIF_FPS
+    key = animatic_key([(base, narration) for base, _, narration in shot_inputs], size, fps, seconds, extension)
+    path = os.path.join(data_dir, ANIMATICS_DIR, f"{key[:16]}.{extension}")
+    if os.path.exists(path):
+        return path
+
+    shots = [
+        (base_frame(source, size, data_dir), caption_overlay(narration, size))
+        for _, source, narration in shot_inputs
+    ]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = temp_path(path, f".tmp.{extension}")
+    frames = iter_frames(shots, size, fps, seconds)
+    try:
+        if ffmpeg:
+            _write_mp4(frames, tmp_path, size, fps, ffmpeg)
+        else:
+            _write_gif(frames, tmp_path, fps, shots)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def start_render(script_data, characters, data_dir=DATA_DIR):
+    """Render an animatic on the background worker, returning a Future of its path
+
+    The script and characters are copied so the page can keep editing them.
+    """
+    snapshot = {'scenes': [dict(scene) for scene in script_data.get('scenes', [])]}
+    characters = {name: dict(data) for name, data in characters.items()}
+    return _executor.submit(render_animatic, snapshot, characters, data_dir)
@@ -0,0 +1,322 @@
+"""Streaming export and import of studio data
+
+A backup is either a plain NDJSON file (one record per line) or a zip bundle
+holding ``records.ndjson`` plus the character images and downloaded videos it
+references. Records are written and read one line at a time and media is
+copied in chunks, so large backups never need to fit in memory.
+
+Backups made from the app go under the data directory's ``exports/`` folder,
+which keeps only the newest ``BACKUPS_KEPT`` of each kind (full backups and
+the characters-only and scripts-only exports).
+
+Record shape: ``{"type": "character" | "script" | "api_keys", "key": ..., "data": {...}}``
+
+Run ``python -m studio.backup export|import <path>`` to back up or restore a
+data directory without going through the browser.
+"""
+import io
+import json
+import os
+import shutil
+import sys
+import zipfile
+from datetime import datetime
+
+from studio import blobs, perf
+from studio.scenes import rebuild_scene_counts
+from studio.storage import DATA_DIR, load_json, update_json
+
+RECORDS_NAME = 'records.ndjson'
+RECORD_TYPES = ('character', 'script', 'api_keys')
+COPY_CHUNK = 1024 * 1024
+BACKUPS_KEPT = 3
+# File name prefix of each kind of backup in the exports folder
+BACKUP_PREFIXES = {
+    'all': 'horror_shorts_backup_',
+    'characters': 'horror_shorts_characters_',
+    'scripts': 'horror_shorts_scripts_'
+}
+
+
+class RecordError(ValueError):
+    """Raised when a backup record is malformed"""
+
+
+def iter_records(characters, scripts, api_keys=None):
+    """Yield one backup record per character and script (and optionally the keys)"""
+    for name, data in characters.items():
+        yield {'type': 'character', 'key': name, 'data': data}
+    for title, data in scripts.items():
+        yield {'type': 'script', 'key': title, 'data': data}
+    if api_keys is not None:
+        yield {'type': 'api_keys', 'key': 'api_keys', 'data': api_keys}
+
+
+def write_ndjson(text_file, records):
+    """Write records as JSON lines, returning how many were written"""
+    count = 0
+    for record in records:
+        text_file.write(json.dumps(record))
+        text_file.write('\n')
+        count += 1
+    return count
+
+
+def _inside(path, directory):
+    directory = os.path.realpath(directory)
+    return os.path.commonpath([directory, os.path.realpath(path)]) == directory
+
+
+def _media_files(characters, data_dir):
+    """Yield (source path, archive name) for every file a bundle should carry"""
+    for data in characters.values():
+        image_path = data.get('image_path')
+        # Only the studio's own files; a character must not pull in other server files
+        if image_path and os.path.exists(image_path) and _inside(image_path, data_dir):
+            yield image_path, f"images/{os.path.basename(image_path)}"
+    videos_dir = os.path.join(data_dir, 'videos')
+    for root, _, files in os.walk(videos_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            yield path, 'videos/' + os.path.relpath(path, videos_dir).replace(os.sep, '/')
+
+
+@perf.instrument('backup.export')
+def export_ndjson(path, characters, scripts, api_keys=None):
+    """Write a plain NDJSON backup without media"""
+    with open(path, 'w') as f:
+        write_ndjson(f, iter_records(characters, scripts, api_keys))
+    return path
+
+
+@perf.instrument('backup.export')
+def export_bundle(path, characters, scripts, api_keys=None, data_dir=DATA_DIR):
+    """Write a zip bundle with the records plus character images and videos"""
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+        with bundle.open(RECORDS_NAME, 'w') as raw:
+            with io.TextIOWrapper(raw, encoding='utf-8') as text:
+                write_ndjson(text, iter_records(characters, scripts, api_keys))
+        for source, arcname in _media_files(characters, data_dir):
+            # Media is already compressed; storing it avoids a pointless deflate pass
+            bundle.write(source, arcname, compress_type=zipfile.ZIP_STORED)
+    return path
+
+
+def prune_backups(kind='all', keep=BACKUPS_KEPT, data_dir=DATA_DIR):
+    """Delete all but the newest ``keep`` backups of a kind in the exports folder, returning how many went"""
+    exports_dir = os.path.join(data_dir, 'exports')
+    prefix = BACKUP_PREFIXES[kind]
+    try:
+        entries = [entry for entry in os.scandir(exports_dir) if entry.name.startswith(prefix) and entry.is_file()]
+    except FileNotFoundError:
+        return 0
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    removed = 0
+    for entry in entries[keep:]:
+        try:
+            os.remove(entry.path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def export_path(extension, kind='all', data_dir=DATA_DIR):
+    """Return a fresh timestamped path for a backup of a kind under the data directory's exports folder"""
+    exports_dir = os.path.join(data_dir, 'exports')
+    os.makedirs(exports_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join(exports_dir, f"{BACKUP_PREFIXES[kind]}{stamp}.{extension}")
+
+
+def write_backup(write, extension, kind='all', data_dir=DATA_DIR):
+    """Write a backup into the exports folder with ``write(path)``, then prune that kind
+
+    Older backups are only pruned once the new one is complete; a failed
+    write removes its partial file and leaves them alone.
+    """
+    path = export_path(extension, kind, data_dir)
+    try:
+        write(path)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    prune_backups(kind, BACKUPS_KEPT, data_dir)
+    return path
+
+
+def validate_record(record):
+    """Check a record's shape, raising RecordError when it cannot be imported"""
+    if not isinstance(record, dict):
+        raise RecordError("record is not an object")
+    record_type = record.get('type')
+    if record_type not in RECORD_TYPES:
+        raise RecordError(f"unknown record type: {record_type!r}")
+    if not isinstance(record.get('key'), str) or not record['key']:
+        raise RecordError("record key must be a non-empty string")
+    data = record.get('data')
+    if not isinstance(data, dict):
+        raise RecordError("record data must be an object")
+    if record_type == 'character':
+        if not isinstance(data.get('name'), str) or not isinstance(data.get('description'), str):
+            raise RecordError("character needs a name and description")
+        if not isinstance(data.get('image_path') or '', str):
+            raise RecordError("character image path must be a string")
+    elif record_type == 'script':
+        if not isinstance(data.get('content'), str):
+            raise RecordError("script needs text content")
+        if not isinstance(data.get('scenes', []), list):
+            raise RecordError("script scenes must be a list")
+    elif not all(isinstance(v, str) for v in data.values()):
+        raise RecordError("API keys must be strings")
+    return record
+
+
+def read_ndjson(lines):
+    """Yield (line number, record or RecordError) for each non-blank line
+
+    Lines may be bytes, decoded here one at a time so that a badly encoded
+    line is reported like any other bad record instead of ending the import.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            yield line_number, validate_record(json.loads(line))
+        except (ValueError, RecordError) as e:
+            yield line_number, RecordError(str(e))
+
+
+def _safe_member_path(arcname, prefix, target_dir):
+    """Map a bundle member under prefix to a path inside target_dir, or None"""
+    relative = arcname[len(prefix):]
+    parts = [p for p in relative.split('/') if p]
+    if not parts or any(p in ('.', '..') for p in parts):
+        return None
+    return os.path.join(target_dir, *parts)
+
+
+def _copy_member(bundle, arcname, target):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with bundle.open(arcname) as src, open(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst, COPY_CHUNK)
+
+
+def apply_records(records, characters, scripts, api_keys=None, image_paths=None, data_dir=DATA_DIR):
+    """Merge validated records into the studio dicts, returning an import summary
+
+    ``image_paths`` maps an image's file name to its restored blob path, so
+    characters point at the restored copy. Any other image path must be
+    inside ``data_dir``; one outside it is dropped so a crafted backup
+    can't make later exports pick up arbitrary server files.
+    """
+    summary = {'characters': 0, 'scripts': 0, 'api_keys': 0, 'skipped': 0, 'errors': []}
+    for line_number, record in records:
+        if isinstance(record, RecordError):
+            summary['skipped'] += 1
+            if len(summary['errors']) < 20:
+                summary['errors'].append(f"line {line_number}: {record}")
+            continue
+        data = record['data']
+        if record['type'] == 'character':
+            image_path = data.get('image_path')
+            if image_path and image_paths is not None:
+                restored = image_paths.get(os.path.basename(image_path))
+                if restored:
+                    data['image_path'] = restored
+            if data.get('image_path') and not _inside(data['image_path'], data_dir):
+                del data['image_path']
+                if len(summary['errors']) < 20:
+                    summary['errors'].append(f"line {line_number}: image outside the data directory was left out")
+            characters[record['key']] = data
+            summary['characters'] += 1
+        elif record['type'] == 'script':
+            data.setdefault('scenes', [])
+            rebuild_scene_counts(data)
+            scripts[record['key']] = data
+            summary['scripts'] += 1
+        elif api_keys is not None:
+            api_keys.update(data)
+            summary['api_keys'] += 1
+        else:
+            summary['skipped'] += 1
+    return summary
+
+
+@perf.instrument('backup.import')
+def import_backup(source, characters, scripts, api_keys=None, data_dir=DATA_DIR):
+    """Import an NDJSON file or zip bundle record by record
+
+    ``source`` is a path or a binary file object. Pass ``api_keys=None`` to
+    ignore any keys in the backup. Images are added to the blob store
+    uncounted; call ``blobs.reconcile()`` once the characters are saved.
+    """
+    if zipfile.is_zipfile(source):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        with zipfile.ZipFile(source) as bundle:
+            image_paths = {}
+            videos_dir = os.path.join(data_dir, 'videos')
+            for arcname in bundle.namelist():
+                if arcname.startswith('images/') and not arcname.endswith('/'):
+                    with bundle.open(arcname) as src:
+                        ext = os.path.splitext(arcname)[1] or '.png'
+                        image_paths[os.path.basename(arcname)] = blobs.put_stream(src, ext, data_dir)
+                elif arcname.startswith('videos/'):
+                    target = _safe_member_path(arcname, 'videos/', videos_dir)
+                    if target:
+                        _copy_member(bundle, arcname, target)
+            if RECORDS_NAME not in bundle.namelist():
+                raise RecordError(f"bundle has no {RECORDS_NAME}")
+            with bundle.open(RECORDS_NAME) as raw:
+                summary = apply_records(read_ndjson(raw), characters, scripts, api_keys, image_paths, data_dir)
+    elif hasattr(source, 'seek'):
+        source.seek(0)
+        summary = apply_records(read_ndjson(source), characters, scripts, api_keys, data_dir=data_dir)
+    else:
+        with open(source, 'rb') as f:
+            summary = apply_records(read_ndjson(f), characters, scripts, api_keys, data_dir=data_dir)
+
+    return summary
+
+
+def main(argv):
+    usage = "usage: python -m studio.backup export|import <path> [--with-api-keys]"
+    if len(argv) < 2 or argv[0] not in ('export', 'import'):
+        print(usage)
+        return 2
+    command, path = argv[0], argv[1]
+    with_keys = '--with-api-keys' in argv[2:]
+
+    if command == 'export':
+        characters = load_json('characters.json', {})
+        scripts = load_json('scripts.json', {})
+        keys = load_json('api_keys.json', {}) if with_keys else None
+        if path.endswith('.ndjson'):
+            export_ndjson(path, characters, scripts, keys)
+        else:
+            export_bundle(path, characters, scripts, keys)
+        print(f"Exported {len(characters)} characters and {len(scripts)} scripts to {path}")
+        return 0
+
+    # Read the backup first, then merge it into each store under its lock so
+    # that sessions writing meanwhile aren't overwritten
+    characters, scripts, api_keys = {}, {}, {}
+    summary = import_backup(path, characters, scripts, api_keys if with_keys else None)
+    update_json('characters.json', lambda data: data.update(characters), {})
+    update_json('scripts.json', lambda data: data.update(scripts), {})
+    blobs.reconcile()
+    if with_keys:
+        update_json('api_keys.json', lambda data: data.update(api_keys), {})
+    print(f"Imported {summary['characters']} characters and {summary['scripts']} scripts "
+          f"({summary['skipped']} records skipped)")
+    for error in summary['errors']:
+        print(f"  {error}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,255 @@
+"""Content-addressed media store
+
+Files live at ``blobs/<aa>/<sha256>.<ext>`` so identical content is stored
+once, whatever it is called. ``blob_refs.json`` counts how many records point
+at each blob: the last ``release()`` deletes the file straight away, and
+``collect_garbage()`` reconciles the counts with the actual references and
+sweeps anything unreferenced that the counts missed. Reconciling reads the
+characters saved on disk, never a session's copy of them, which may be
+stale or missing another session's new characters.
+
+Run ``python -m studio.blobs gc`` to migrate legacy name-based character
+images into the store and clean it up.
+"""
+import contextlib
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+from studio import perf
+from studio.storage import DATA_DIR, load_json, save_json, store_lock, update_json
+
+BLOBS_DIR = 'blobs'
+REFS_STORE = 'blob_refs.json'
+CHARACTERS_STORE = 'characters.json'
+COPY_CHUNK = 1024 * 1024
+GC_GRACE_SECONDS = 3600
+
+
+def blob_path(digest, ext='.png', data_dir=DATA_DIR):
+    return os.path.join(data_dir, BLOBS_DIR, digest[:2], digest + ext)
+
+
+def digest_from_path(path):
+    """Return the digest of a blob path, or None for paths outside the store"""
+    if not path:
+        return None
+    parts = os.path.normpath(path).split(os.sep)
+    if len(parts) < 3 or parts[-3] != BLOBS_DIR:
+        return None
+    return os.path.splitext(parts[-1])[0]
+
+
+def is_blob_path(path):
+    return digest_from_path(path) is not None
+
+
+def content_digest(path):
+    """sha256 of a file's content, read from the path itself for blobs"""
+    digest = digest_from_path(path)
+    if digest:
+        return digest
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@perf.instrument('blobs.put')
+def put_stream(fileobj, ext='.png', data_dir=DATA_DIR):
+    """Copy a binary stream into the store in chunks and return its blob path"""
+    blobs_dir = os.path.join(data_dir, BLOBS_DIR)
+    os.makedirs(blobs_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=blobs_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            for chunk in iter(lambda: fileobj.read(COPY_CHUNK), b''):
+                digest.update(chunk)
+                tmp.write(chunk)
+        path = blob_path(digest.hexdigest(), ext, data_dir)
+        if os.path.exists(path):
+            os.unlink(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        return path
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+
+
+def put_bytes(payload, ext='.png', data_dir=DATA_DIR):
+    return put_stream(BytesIO(payload), ext, data_dir)
+
+
+def put_image(image, data_dir=DATA_DIR):
+    """Store a PIL image as PNG; identical pixels encode to the same blob"""
+    buffer = BytesIO()
+    image.save(buffer, format='PNG')
+    return put_bytes(buffer.getvalue(), '.png', data_dir)
+
+
+def _remove_blob(path, data_dir):
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(os.path.join(data_dir, 'thumbnails', os.path.basename(path)))
+
+
+def retain(path, data_dir=DATA_DIR):
+    """Count one more reference to a blob"""
+    digest = digest_from_path(path)
+    if digest:
+        update_json(REFS_STORE, lambda refs: refs.update({digest: refs.get(digest, 0) + 1}), {}, data_dir)
+
+
+def release(path, data_dir=DATA_DIR):
+    """Drop one reference to a blob, deleting it when none remain"""
+    digest = digest_from_path(path)
+    if not digest:
+        return
+
+    def drop(refs):
+        count = refs.get(digest, 0) - 1
+        if count > 0:
+            refs[digest] = count
+        else:
+            refs.pop(digest, None)
+            _remove_blob(path, data_dir)
+
+    update_json(REFS_STORE, drop, {}, data_dir)
+
+
+def referenced_paths(characters):
+    """Yield every blob path the characters point at"""
+    for data in characters.values():
+        if is_blob_path(data.get('image_path')):
+            yield data['image_path']
+
+
+def count_references(characters):
+    """``{digest: references}`` for the blobs the characters point at"""
+    refs = {}
+    for path in referenced_paths(characters):
+        digest = digest_from_path(path)
+        refs[digest] = refs.get(digest, 0) + 1
+    return refs
+
+
+def _blob_mtime(digest, data_dir):
+    """Modification time of a blob whatever its extension, or None when it is gone"""
+    try:
+        entries = os.scandir(os.path.join(data_dir, BLOBS_DIR, digest[:2]))
+    except FileNotFoundError:
+        return None
+    with entries:
+        for entry in entries:
+            if entry.name.startswith(digest + '.') and not entry.name.endswith('.tmp'):
+                return entry.stat().st_mtime
+    return None
+
+
+def reconcile(data_dir=DATA_DIR, grace_seconds=GC_GRACE_SECONDS):
+    """Rewrite the reference counts from the characters saved on disk, returning them
+
+    The characters store is read under its lock, so no session can save in
+    between. A blob written within the grace period keeps a higher count it
+    already had: a session may have retained it for a character it hasn't
+    saved yet.
+    """
+    cutoff = time.time() - grace_seconds
+    with store_lock(CHARACTERS_STORE, data_dir):
+        counted = count_references(load_json(CHARACTERS_STORE, {}, data_dir))
+
+        def rebuild(refs):
+            pending = {
+                digest: count for digest, count in refs.items()
+                if count > counted.get(digest, 0) and (_blob_mtime(digest, data_dir) or 0) >= cutoff
+            }
+            return {**counted, **pending}
+
+        return update_json(REFS_STORE, rebuild, {}, data_dir)
+
+
+def migrate_legacy_images(characters, data_dir=DATA_DIR):
+    """Move name-derived character images into the store, returning how many moved"""
+    moved = {}
+    for data in characters.values():
+        path = data.get('image_path')
+        if not path or is_blob_path(path) or not os.path.exists(path):
+            continue
+        if path not in moved:
+            with open(path, 'rb') as f:
+                moved[path] = put_stream(f, os.path.splitext(path)[1] or '.png', data_dir)
+        data['image_path'] = moved[path]
+    for path in moved:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+    return len(moved)
+
+
+@perf.instrument('blobs.gc')
+def collect_garbage(data_dir=DATA_DIR, grace_seconds=GC_GRACE_SECONDS):
+    """Reconcile reference counts and delete unreferenced blobs and thumbnails
+
+    Blobs newer than the grace period are kept so an upload that is still
+    being saved by another session is never swept.
+    """
+    refs = reconcile(data_dir, grace_seconds)
+    removed, freed = 0, 0
+    cutoff = time.time() - grace_seconds
+    blobs_dir = os.path.join(data_dir, BLOBS_DIR)
+    for root, _, files in os.walk(blobs_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            digest, ext = os.path.splitext(name)
+            if ext == '.tmp' or digest in refs:
+                continue
+            stat = os.stat(path)
+            if stat.st_mtime < cutoff:
+                _remove_blob(path, data_dir)
+                removed += 1
+                freed += stat.st_size
+    thumbnails_dir = os.path.join(data_dir, 'thumbnails')
+    if os.path.isdir(thumbnails_dir):
+        for name in os.listdir(thumbnails_dir):
+            digest = os.path.splitext(name)[0]
+            if digest not in refs:
+                path = os.path.join(thumbnails_dir, name)
+                freed += os.path.getsize(path)
+                os.unlink(path)
+    return {'removed': removed, 'freed_bytes': freed}
+
+
+def usage(data_dir=DATA_DIR):
+    """Return (blob count, total bytes) for the store"""
+    count, total = 0, 0
+    for root, _, files in os.walk(os.path.join(data_dir, BLOBS_DIR)):
+        for name in files:
+            if not name.endswith('.tmp'):
+                count += 1
+                total += os.path.getsize(os.path.join(root, name))
+    return count, total
+
+
+def main(argv):
+    if argv[:1] != ['gc']:
+        print("usage: python -m studio.blobs gc")
+        return 2
+    characters = load_json(CHARACTERS_STORE, {})
+    moved = migrate_legacy_images(characters)
+    if moved:
+        save_json(CHARACTERS_STORE, characters)
+    summary = collect_garbage()
+    print(f"Migrated {moved} images, removed {summary['removed']} blobs, freed {summary['freed_bytes']} bytes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
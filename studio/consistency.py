@@ -0,0 +1,217 @@
+"""Visual-consistency checks of generated clips against character references
+
+A few frames are sampled from each downloaded clip by ffmpeg, already
+scaled down to FEATURE_SIZE, and streamed in one frame at a time, so a clip
+is never decoded in full into memory. Every frame and reference image gets
+two cheap features, computed in batch with NumPy:
+
+* a joint RGB colour histogram (4 levels per channel), and
+* an 8x8 luminance layout, zero-mean and unit-norm, compared by cosine.
+
+A clip's distance to its character's reference mixes the Bhattacharyya
+distance of its mean histogram with its best layout match. Within a
+project, clips whose distance is a robust outlier (median/MAD z-score) are
+flagged for regeneration. Clips are downloaded and decoded in parallel.
+"""
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+from PIL import Image, ImageOps
+
+from studio import events, perf
+from studio.animatic import ffmpeg_exe
+from studio.scenes import scene_index
+from studio.storage import DATA_DIR
+from studio.tasks import download_video
+
+FEATURE_SIZE = 64
+SAMPLE_FPS = 2
+MAX_SAMPLES = 12
+CLIP_ASPECT = (9, 16)
+HISTOGRAM_LEVELS = 4
+LAYOUT_GRID = 8
+# How much the colour histogram counts against the luminance layout
+HISTOGRAM_WEIGHT = 0.7
+# Robust z-score above which a clip is an outlier in its project
+OUTLIER_Z = 3.5
+# Distances below this are never flagged, however tight the rest are
+MIN_FLAG_DISTANCE = 0.15
+# Distances above this are always flagged
+MAX_DISTANCE = 0.6
+MAX_WORKERS = 4
+
+
+class ConsistencyError(Exception):
+    """Raised when clips can't be analysed"""
+
+
+def histograms(frames):
+    """Normalized joint RGB histograms for a (n, h, w, 3) uint8 batch, shape (n, levels**3)"""
+    levels = HISTOGRAM_LEVELS
+    shift = 8 - int(np.log2(levels))
+    quantized = (frames >> shift).astype(np.int64)
+    index = (quantized[..., 0] * levels + quantized[..., 1]) * levels + quantized[..., 2]
+    count = len(frames)
+    bins = levels ** 3
+    index = index.reshape(count, -1) + (np.arange(count) * bins)[:, None]
+    counts = np.bincount(index.ravel(), minlength=count * bins).reshape(count, bins)
+    return counts / counts.sum(axis=1, keepdims=True)
+
+
+def layouts(frames):
+    """Zero-mean, unit-norm LAYOUT_GRID x LAYOUT_GRID luminance features, shape (n, grid**2)"""
+    gray = frames.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    count, height, width = gray.shape
+    grid = LAYOUT_GRID
+    blocks = gray.reshape(count, grid, height // grid, grid, width // grid).mean(axis=(2, 4)).reshape(count, -1)
+    blocks -= blocks.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(blocks, axis=1, keepdims=True)
+    return blocks / np.where(norms == 0, 1, norms)
+
+
+def reference_frame(image_path):
+    """A reference image framed like a clip and scaled like a sampled frame"""
+    with Image.open(image_path) as image:
+        framed = ImageOps.fit(image.convert('RGB'), (FEATURE_SIZE * CLIP_ASPECT[0] // CLIP_ASPECT[1], FEATURE_SIZE),
+                              Image.BILINEAR)
+    return np.asarray(framed.resize((FEATURE_SIZE, FEATURE_SIZE), Image.BILINEAR))
+
+
+def sample_frames(video_path, ffmpeg=None):
+    """Return up to MAX_SAMPLES small frames of a clip as a (n, size, size, 3) uint8 array"""
+    ffmpeg = ffmpeg or ffmpeg_exe()
+    if not ffmpeg:
+        raise ConsistencyError("ffmpeg is needed to sample video frames")
+    command = [
+        ffmpeg, '-loglevel', 'error', '-i', video_path,
+        '-vf', f"fps={SAMPLE_FPS},scale={FEATURE_SIZE}:{FEATURE_SIZE}",
+        '-frames:v', str(MAX_SAMPLES), '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-'
+    ]
+    frame_bytes = FEATURE_SIZE * FEATURE_SIZE * 3
+    frames = []
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as process:
+        while True:
+            chunk = process.stdout.read(frame_bytes)
+            if len(chunk) < frame_bytes:
+                break
+            frames.append(np.frombuffer(chunk, dtype=np.uint8).reshape(FEATURE_SIZE, FEATURE_SIZE, 3))
+        error = process.stderr.read().decode('utf-8', 'replace')
+    if not frames:
+        raise ConsistencyError(f"no frames decoded from {os.path.basename(video_path)}: {error.strip()[-300:]}")
+    return np.stack(frames)
+
+
+def clip_distances(clip_frames, reference_frames):
+    """Distance of each clip to its reference, in one vectorized pass
+
+    ``clip_frames`` is a list of (n_i, size, size, 3) arrays and
+    ``reference_frames`` a (clips, size, size, 3) array, one row per clip.
+    """
+    counts = np.array([len(frames) for frames in clip_frames])
+    owners = np.repeat(np.arange(len(clip_frames)), counts)
+    frames = np.concatenate(clip_frames)
+
+    frame_histograms = histograms(frames)
+    frame_layouts = layouts(frames)
+    reference_histograms = histograms(reference_frames)
+    reference_layouts = layouts(reference_frames)
+
+    # Mean histogram per clip
+    mean_histograms = np.zeros_like(reference_histograms)
+    np.add.at(mean_histograms, owners, frame_histograms)
+    mean_histograms /= counts[:, None]
+    bhattacharyya = np.sqrt(np.clip(1 - np.sqrt(mean_histograms * reference_histograms).sum(axis=1), 0, 1))
+
+    # Best layout match per clip
+    similarity = (frame_layouts * reference_layouts[owners]).sum(axis=1)
+    best = np.full(len(clip_frames), -1.0)
+    np.maximum.at(best, owners, similarity)
+    layout_distance = (1 - best) / 2
+
+    return HISTOGRAM_WEIGHT * bhattacharyya + (1 - HISTOGRAM_WEIGHT) * layout_distance
+
+
+def flag_outliers(distances):
+    """Boolean mask of clips that drift from the rest of their project"""
+    distances = np.asarray(distances, dtype=float)
+    median = np.median(distances)
+    mad = np.median(np.abs(distances - median))
+    z = 0.6745 * (distances - median) / mad if mad > 0 else np.zeros_like(distances)
+    return ((z > OUTLIER_Z) & (distances > MIN_FLAG_DISTANCE)) | (distances > MAX_DISTANCE)
+
+
+def _clip_frames(job):
+    """Worker: download a clip if needed and sample it, returning (frames, error)"""
+    task_id, task_info, http, data_dir, ffmpeg = job
+    try:
+        path = task_info.get('video_path')
+        if not path or not os.path.exists(path):
+            path = download_video(task_id, task_info, http, data_dir, log=events.EventLog(data_dir))
+        return sample_frames(path, ffmpeg), None
+    except (ConsistencyError, requests.RequestException, OSError) as e:
+        return None, str(e)
+
+
+def _clip_character(task_info, scripts):
+    """The character a clip was generated for, falling back to the scene's current one"""
+    if task_info.get('character'):
+        return task_info['character']
+    script = scripts.get(task_info.get('script_title'))
+    index = scene_index(script, task_info.get('scene_number')) if script else None
+    return script['scenes'][index].get('assigned_character') if index is not None else None
+
+
+@perf.instrument('consistency.check_project')
+def check_project(video_tasks, scripts, characters, script_title, http=requests, data_dir=DATA_DIR,
+                  max_workers=MAX_WORKERS):
+    """Score every finished clip of a project against its character's reference
+
+    Records ``consistency`` ({'distance', 'outlier'}) on each task and
+    returns (rows, errors): one row per clip, outliers first, and
+    (task_id, message) for clips that couldn't be downloaded or decoded.
+    Clips whose character has no reference image are skipped.
+    """
+    ffmpeg = ffmpeg_exe()
+    if not ffmpeg:
+        raise ConsistencyError("ffmpeg is needed to sample video frames")
+
+    clips = []
+    for task_id, info in video_tasks.items():
+        if info.get('script_title') != script_title or info.get('status') != 'SUCCEEDED':
+            continue
+        if not (info.get('video_url') or info.get('video_path')):
+            continue
+        character = _clip_character(info, scripts)
+        reference = characters.get(character, {}).get('image_path')
+        if reference and os.path.exists(reference):
+            clips.append((task_id, info, character, reference))
+
+    jobs = [(task_id, info, http, data_dir, ffmpeg) for task_id, info, _, _ in clips]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        sampled = list(pool.map(_clip_frames, jobs))
+    errors = [(clip[0], error) for clip, (_, error) in zip(clips, sampled) if error]
+    decoded = [(clip, frames) for clip, (frames, _) in zip(clips, sampled) if frames is not None]
+    if not decoded:
+        return [], errors
+    clips = [clip for clip, _ in decoded]
+    clip_frames = [frames for _, frames in decoded]
+
+    references = {path: reference_frame(path) for path in {reference for *_, reference in clips}}
+    distances = clip_distances(clip_frames, np.stack([references[reference] for *_, reference in clips]))
+    outliers = flag_outliers(distances)
+
+    rows = []
+    for (task_id, info, character, _), distance, outlier in zip(clips, distances, outliers):
+        info['consistency'] = {'distance': round(float(distance), 4), 'outlier': bool(outlier)}
+        rows.append({
+            'task_id': task_id,
+            'scene_number': info['scene_number'],
+            'character': character,
+            'distance': round(float(distance), 4),
+            'outlier': bool(outlier)
+        })
+    rows.sort(key=lambda row: (not row['outlier'], -row['distance']))
+    return rows, errors
@@ -0,0 +1,192 @@
+"""Durable log of what happened to video tasks, for history and capacity planning
+
+Each event is one JSON line in ``events.jsonl`` inside the data directory::
+
+    {"ts": 1767000000.0, "kind": "status", "task_id": "...", "platform": "runwayml",
+     "script": "...", "scene": 3, "from": "PENDING", "to": "SUCCEEDED", "duration": 84.2}
+
+Kinds are ``submitted``, ``submit_failed``, ``deferred``, ``status``,
+``poll_error``, ``downloaded`` and ``activity``. Lines are appended under
+the store lock, so several sessions and the background poller can log to the
+same file. Once the file passes ``MAX_EVENT_BYTES`` it is rotated to
+``events.jsonl.1`` (and so on), and only ``EVENT_FILES_KEPT`` rotated files
+are kept, so the log stays bounded however long the studio runs.
+"""
+import json
+import os
+import time
+
+from studio.storage import DATA_DIR, data_path, store_lock
+
+EVENTS_FILE = 'events.jsonl'
+MAX_EVENT_BYTES = 4 * 1024 * 1024
+EVENT_FILES_KEPT = 5
+STATS_WINDOW = 86400
+
+KINDS = ('submitted', 'submit_failed', 'deferred', 'status', 'poll_error', 'downloaded', 'activity')
+
+
+def task_fields(task_id, task_info):
+    """The fields every task event carries"""
+    return {
+        'task_id': task_id,
+        'platform': task_info.get('platform'),
+        'script': task_info.get('script_title'),
+        'scene': task_info.get('scene_number')
+    }
+
+
+def quantile(values, q):
+    """Nearest-rank quantile of a sorted list, or None when it is empty"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, round(q * len(values)) - 1))]
+
+
+def stats(events, now=None, window=STATS_WINDOW):
+    """Throughput and generation latency per platform over the last ``window`` seconds
+
+    Returns ``(scenes per hour, rows)`` with one row per platform: submissions,
+    scenes finished, submission and task failures, and p50/p95 seconds from
+    submission to a finished video. Throughput is taken over the part of the
+    window the log actually covers, so a young log doesn't read as idle.
+    """
+    now = time.time() if now is None else now
+    start = now - window
+    platforms = {}
+    first = None
+    for event in events:
+        if event['ts'] < start:
+            continue
+        first = event['ts'] if first is None else min(first, event['ts'])
+        platform = event.get('platform')
+        if not platform:
+            continue
+        row = platforms.setdefault(platform, {'submitted': 0, 'succeeded': 0, 'failed': 0, 'durations': []})
+        if event['kind'] == 'submitted':
+            row['submitted'] += 1
+        elif event['kind'] == 'submit_failed':
+            row['failed'] += 1
+        elif event['kind'] == 'status' and event.get('to') == 'SUCCEEDED':
+            row['succeeded'] += 1
+            if event.get('duration') is not None:
+                row['durations'].append(event['duration'])
+        elif event['kind'] == 'status' and event.get('to') == 'FAILED':
+            row['failed'] += 1
+
+    hours = max(now - first, 60) / 3600 if first is not None else None
+    rows = []
+    for platform, row in sorted(platforms.items()):
+        durations = sorted(row.pop('durations'))
+        rows.append({
+            'platform': platform,
+            **row,
+            'per_hour': round(row['succeeded'] / hours, 1),
+            'p50_seconds': quantile(durations, 0.5),
+            'p95_seconds': quantile(durations, 0.95)
+        })
+    total = sum(row['succeeded'] for row in rows)
+    return (round(total / hours, 1) if hours else 0.0), rows
+
+
+class EventLog:
+    """Append-only, size-bounded event log in one data directory"""
+
+    def __init__(self, data_dir=DATA_DIR, max_bytes=MAX_EVENT_BYTES, keep=EVENT_FILES_KEPT):
+        self.data_dir = data_dir
+        self.max_bytes = max_bytes
+        self.keep = keep
+
+    @property
+    def path(self):
+        return data_path(EVENTS_FILE, self.data_dir)
+
+    def files(self):
+        """Log files that exist, oldest first"""
+        paths = [f"{self.path}.{i}" for i in range(self.keep, 0, -1)] + [self.path]
+        return [path for path in paths if os.path.exists(path)]
+
+    def _rotate(self):
+        for i in range(self.keep - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.keep:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def record_many(self, events, now=None):
+        """Append several ``(kind, fields)`` events in one locked write
+
+        Logging is best effort: a full disk shouldn't fail the submission or
+        poll being logged, so write errors are swallowed.
+        """
+        now = time.time() if now is None else now
+        lines = ''.join(json.dumps({'ts': now, 'kind': kind, **fields}) + '\n' for kind, fields in events)
+        if not lines:
+            return
+        try:
+            with store_lock(EVENTS_FILE, self.data_dir):
+                with open(self.path, 'a') as f:
+                    f.write(lines)
+                    size = f.tell()
+                if size > self.max_bytes:
+                    self._rotate()
+        except OSError:
+            pass
+
+    def record(self, kind, now=None, **fields):
+        self.record_many([(kind, fields)], now)
+
+    def _lines(self, path, since):
+        """One file's lines, or none when the file was written entirely before ``since``"""
+        try:
+            if since is not None and os.path.getmtime(path) < since:
+                return []
+            with open(path) as f:
+                return f.readlines()
+        except FileNotFoundError:
+            # Rotated away while we were reading
+            return []
+
+    def _decode(self, lines, since):
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # A line cut short by a crash mid-write
+                continue
+            if since is None or event.get('ts', 0) >= since:
+                yield event
+
+    def events(self, since=None):
+        """Every logged event, oldest first"""
+        for path in self.files():
+            yield from self._decode(self._lines(path, since), since)
+
+    def query(self, kinds=None, platform=None, script=None, since=None, text=None, limit=200):
+        """The newest events matching every given filter, newest first
+
+        Files are read and decoded newest first, so a limited query usually
+        stops well inside the current file.
+        """
+        text = text.lower() if text else None
+        matches = []
+        for path in reversed(self.files()):
+            for event in self._decode(reversed(self._lines(path, since)), since):
+                if kinds and event.get('kind') not in kinds:
+                    continue
+                if platform and event.get('platform') != platform:
+                    continue
+                if script and event.get('script') != script:
+                    continue
+                if text and text not in json.dumps(event).lower():
+                    continue
+                matches.append(event)
+                if limit and len(matches) >= limit:
+                    return matches
+        return matches
+
+    def stats(self, now=None, window=STATS_WINDOW):
+        now = time.time() if now is None else now
+        return stats(self.events(now - window), now, window)
@@ -0,0 +1,204 @@
+"""Exporting finished shorts in each platform's preset
+
+A project is assembled once its chosen clips are ready (see
+``studio.variants.assembly_status``): the clips are joined into a master
+under ``masters/`` without re-encoding. Exporting then makes every preset
+in ``PRESETS`` from that master in one ffmpeg run - the master is decoded
+once, scaled once per distinct frame size and rate, and the frames are
+split between the presets' encoders, instead of a full decode and scale per
+platform.
+
+Outputs are cached under ``platform_exports/`` by the master's content hash
+and the preset's settings, so exporting again only encodes presets that are
+missing or whose settings changed. Several projects are exported in a process pool.
+"""
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+
+from studio import perf, variants
+from studio.animatic import ffmpeg_exe
+from studio.blobs import content_digest
+from studio.storage import DATA_DIR, temp_path
+from studio.tasks import download_video
+
+PRESETS = {
+    'youtube_shorts': {'label': 'YouTube Shorts', 'size': (1080, 1920), 'fps': 30,
+                       'video_bitrate': '8M', 'audio_bitrate': '192k', 'max_seconds': 60},
+    'tiktok': {'label': 'TikTok', 'size': (1080, 1920), 'fps': 30,
+               'video_bitrate': '6M', 'audio_bitrate': '128k', 'max_seconds': 600},
+    'reels': {'label': 'Instagram Reels', 'size': (1080, 1920), 'fps': 30,
+              'video_bitrate': '5M', 'audio_bitrate': '128k', 'max_seconds': 90},
+}
+X264_PRESET = 'veryfast'
+MASTERS_DIR = 'masters'
+EXPORTS_DIR = 'platform_exports'
+# Every export is its own ffmpeg process, so a pool pays off from two projects up
+POOL_THRESHOLD = 2
+
+
+class ExportError(Exception):
+    """Raised when a project can't be assembled or exported"""
+
+
+def preset_key(preset):
+    """Hash of the settings that change a preset's output"""
+    settings = {key: value for key, value in preset.items() if key != 'label'}
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+def export_path(master_digest, name, preset, data_dir=DATA_DIR):
+    return os.path.join(data_dir, EXPORTS_DIR, master_digest[:2], f"{master_digest}.{name}.{preset_key(preset)}.mp4")
+
+
+def _run(command):
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise ExportError(f"ffmpeg failed: {result.stderr.decode('utf-8', 'replace').strip()[-500:]}")
+
+
+def _ffmpeg(ffmpeg):
+    ffmpeg = ffmpeg or ffmpeg_exe()
+    if not ffmpeg:
+        raise ExportError("ffmpeg is needed to export videos; install it or the imageio-ffmpeg package")
+    return ffmpeg
+
+
+@perf.instrument('export.assemble')
+def assemble_master(clip_paths, data_dir=DATA_DIR, ffmpeg=None):
+    """Join clips, in order, into a master file and return its path
+
+    The clips are copied rather than re-encoded, which works because every
+    clip of a project comes from the same provider settings. A master is
+    reused while its clips are unchanged.
+    """
+    if not clip_paths:
+        raise ExportError("there are no clips to assemble")
+    key = hashlib.sha256('\0'.join(content_digest(path) for path in clip_paths).encode('utf-8')).hexdigest()
+    path = os.path.join(data_dir, MASTERS_DIR, key[:2], key + '.mp4')
+    if os.path.exists(path):
+        return path
+    ffmpeg = _ffmpeg(ffmpeg)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = temp_path(path, '.tmp.mp4')
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as listing:
+        for clip_path in clip_paths:
+            escaped = os.path.abspath(clip_path).replace("'", "'\\''")
+            listing.write(f"file '{escaped}'\n")
+    try:
+        _run([ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', listing.name,
+              '-c', 'copy', '-movflags', '+faststart', tmp_path])
+        os.replace(tmp_path, path)
+    finally:
+        os.remove(listing.name)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def project_master(script_title, script_data, video_tasks, http=requests, data_dir=DATA_DIR, log=None, ffmpeg=None):
+    """Download a project's chosen clips as needed and assemble its master
+
+    Raises ExportError while a scene still needs a pick or a finished clip.
+    """
+    ready = variants.assembly_status(script_data, video_tasks, script_title)
+    if ready['pick'] or ready['rendering']:
+        waiting = ready['pick'] + ready['rendering']
+        raise ExportError(f"scenes {', '.join(map(str, sorted(waiting)))} don't have a finished, chosen clip yet")
+    clip_paths = []
+    try:
+        for _, task_id in ready['clips']:
+            task_info = video_tasks[task_id]
+            path = task_info.get('video_path')
+            if not path or not os.path.exists(path):
+                path = download_video(task_id, task_info, http, data_dir, log=log)
+            clip_paths.append(path)
+    except (requests.RequestException, OSError) as e:
+        raise ExportError(f"couldn't download a clip: {e}")
+    return assemble_master(clip_paths, data_dir, ffmpeg)
+
+
+def transcode_command(ffmpeg, master_path, targets):
+    """One ffmpeg command writing every (preset, output path) target from a single decode of the master
+
+    Targets that share a frame size and rate also share the scaling; the
+    scaled frames are split between their encoders.
+    """
+    groups = {}
+    for index, (preset, _) in enumerate(targets):
+        groups.setdefault((tuple(preset['size']), preset['fps']), []).append(index)
+    graph = [f"[0:v]split={len(groups)}" + ''.join(f"[g{i}]" for i in range(len(groups)))]
+    for i, (((width, height), fps), indices) in enumerate(groups.items()):
+        graph.append(
+            f"[g{i}]fps={fps},scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,split={len(indices)}"
+            + ''.join(f"[o{index}]" for index in indices)
+        )
+    command = [ffmpeg, '-y', '-loglevel', 'error', '-i', master_path, '-filter_complex', ';'.join(graph)]
+    for index, (preset, path) in enumerate(targets):
+        bitrate = preset['video_bitrate']
+        command += [
+            '-map', f"[o{index}]", '-map', '0:a?', '-t', str(preset['max_seconds']),
+            '-c:v', 'libx264', '-preset', X264_PRESET, '-b:v', bitrate, '-maxrate', bitrate,
+            '-bufsize', bitrate, '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac', '-b:a', preset['audio_bitrate'], '-movflags', '+faststart', path
+        ]
+    return command
+
+
+@perf.instrument('export.presets')
+def export_master(master_path, presets=None, data_dir=DATA_DIR, ffmpeg=None):
+    """Make each preset's file from a master, returning {preset name: path}
+
+    Cached outputs are reused; the rest are encoded together in one run.
+    """
+    presets = PRESETS if presets is None else presets
+    digest = content_digest(master_path)
+    paths = {name: export_path(digest, name, preset, data_dir) for name, preset in presets.items()}
+    missing = [name for name, path in paths.items() if not os.path.exists(path)]
+    if not missing:
+        return paths
+    ffmpeg = _ffmpeg(ffmpeg)
+    os.makedirs(os.path.dirname(paths[missing[0]]), exist_ok=True)
+    targets = [(presets[name], temp_path(paths[name], '.tmp.mp4')) for name in missing]
+    try:
+        _run(transcode_command(ffmpeg, master_path, targets))
+        for name, (_, tmp_path) in zip(missing, targets):
+            os.replace(tmp_path, paths[name])
+    finally:
+        for _, tmp_path in targets:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return paths
+
+
+def _export(job):
+    """Pool worker: export one master, returning (paths, error)"""
+    master_path, presets, data_dir, ffmpeg = job
+    try:
+        return export_master(master_path, presets, data_dir, ffmpeg), None
+    except (ExportError, OSError) as e:
+        return None, str(e)
+
+
+@perf.instrument('export.batch')
+def export_masters(master_paths, presets=None, data_dir=DATA_DIR, max_workers=None):
+    """Export several masters, in a process pool when there are enough
+
+    Returns ``(paths, error)`` per master, in order; one failing export
+    doesn't stop the others.
+    """
+    presets = PRESETS if presets is None else presets
+    ffmpeg = ffmpeg_exe()
+    if not ffmpeg:
+        raise ExportError("ffmpeg is needed to export videos; install it or the imageio-ffmpeg package")
+    jobs = [(path, presets, data_dir, ffmpeg) for path in master_paths]
+    if len(jobs) >= POOL_THRESHOLD and max_workers != 1 and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(_export, jobs))
+    return [_export(job) for job in jobs]
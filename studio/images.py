@@ -0,0 +1,71 @@
+"""Character reference image handling"""
+import base64
+import mimetypes
+import os
+
+from PIL import Image
+
+from studio import blobs, perf
+from studio.storage import DATA_DIR
+
+THUMBNAIL_SIZE = (256, 256)
+# Leading bytes -> MIME type of the formats providers accept as a start image
+IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+
+@perf.instrument('image.ingest')
+def save_reference_image(upload, data_dir=DATA_DIR):
+    """Store an uploaded (or already decoded) image in the blob store and take a reference to it"""
+    image = upload if isinstance(upload, Image.Image) else Image.open(upload)
+    image_path = blobs.put_image(image, data_dir)
+    blobs.retain(image_path, data_dir)
+    return image_path
+
+
+def release_reference_image(image_path, data_dir=DATA_DIR):
+    """Drop a character's reference to its image; the blob goes when nothing uses it"""
+    blobs.release(image_path, data_dir)
+
+
+@perf.instrument('image.encode')
+def image_to_base64(image_path):
+    """Convert image to base64 string for API"""
+    with open(image_path, "rb") as image_file:
+        return base64.b64encode(image_file.read()).decode('utf-8')
+
+
+def image_mime_type(data, image_path=''):
+    """MIME type of encoded image bytes, from their signature or else the file extension"""
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return mime_type
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    return mimetypes.guess_type(image_path)[0] or 'image/png'
+
+
+@perf.instrument('image.encode')
+def image_data_uri(image_path):
+    """A base64 data URI for an image file, typed by its actual format"""
+    with open(image_path, "rb") as image_file:
+        data = image_file.read()
+    return f"data:{image_mime_type(data, image_path)};base64,{base64.b64encode(data).decode('utf-8')}"
+
+
+@perf.instrument('image.thumbnail')
+def thumbnail_path(image_path, data_dir=DATA_DIR):
+    """Return a small cached copy of an image for grid display, creating it on first use"""
+    thumbnails_dir = os.path.join(data_dir, 'thumbnails')
+    thumb_path = os.path.join(thumbnails_dir, os.path.basename(image_path))
+    if os.path.exists(thumb_path) and os.path.getmtime(thumb_path) >= os.path.getmtime(image_path):
+        return thumb_path
+    os.makedirs(thumbnails_dir, exist_ok=True)
+    with Image.open(image_path) as image:
+        image.thumbnail(THUMBNAIL_SIZE)
+        image.save(thumb_path, format='PNG')
+    return thumb_path
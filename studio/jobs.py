@@ -0,0 +1,192 @@
+"""Prioritized job queue for scene submissions, plus cancellation
+
+Scenes waiting to be sent to a provider sit in ``video_tasks`` with status
+QUEUED. Each dispatch heapifies the queued jobs by
+
+    (priority, project deadline, time enqueued, scene number)
+
+and submits from the top for as long as admission control lets each
+platform take more, so an urgent project jumps ahead of a long backlog as
+soon as its priority or deadline is set. Priorities come from the project
+(``script['priority']`` and ``script['deadline']``) unless a job has been
+bumped individually.
+
+Cancelling removes queued jobs and calls the provider's cancel endpoint for
+jobs that are already rendering.
+"""
+import heapq
+import time
+import uuid
+from datetime import date, datetime
+
+import requests
+
+from studio import metering, retry, tasks
+from studio.providers import ProviderError, get_provider
+from studio.scenes import scene_index
+
+PRIORITIES = {'urgent': 0, 'high': 1, 'normal': 2, 'low': 3}
+DEFAULT_PRIORITY = 'normal'
+# A bumped job goes ahead of every project priority
+BUMPED = -1
+
+CANCELLED = 'CANCELLED'
+# Nothing more will happen to these without a human; cancelling one would erase its outcome
+FINISHED_STATUSES = ('SUCCEEDED', CANCELLED, retry.DEAD_LETTER)
+# Queued, scheduled for a retry or rendering
+WAITING_STATUSES = (tasks.QUEUED, retry.RETRY_SCHEDULED) + metering.IN_FLIGHT_STATUSES
+
+
+def project_priority(script):
+    return PRIORITIES.get(script.get('priority', DEFAULT_PRIORITY), PRIORITIES[DEFAULT_PRIORITY])
+
+
+def project_deadline(script):
+    """Deadline as a timestamp (end of the given day), or infinity when there is none"""
+    deadline = script.get('deadline')
+    if not deadline:
+        return float('inf')
+    day = date.fromisoformat(deadline)
+    return datetime.combine(day, datetime.max.time()).timestamp()
+
+
+def job_key(task_id, task_info, scripts):
+    script = scripts.get(task_info.get('script_title'), {})
+    priority = task_info.get('priority', project_priority(script))
+    return (
+        priority, project_deadline(script), task_info.get('enqueued_at', 0), task_info.get('scene_number', 0), task_id
+    )
+
+
+def build_heap(video_tasks, scripts, now=None):
+    """Heap of job keys for queued tasks that may be tried now"""
+    now = time.time() if now is None else now
+    heap = [
+        job_key(task_id, info, scripts) for task_id, info in video_tasks.items()
+        if info.get('status') == tasks.QUEUED and (info.get('not_before') or 0) <= now
+    ]
+    heapq.heapify(heap)
+    return heap
+
+
+def queue_order(video_tasks, scripts):
+    """Queued task ids in the order they will be dispatched"""
+    keys = [job_key(task_id, info, scripts) for task_id, info in video_tasks.items()
+            if info.get('status') == tasks.QUEUED]
+    return [key[-1] for key in sorted(keys)]
+
+
+def enqueue_scene(video_tasks, scripts, script_title, scene, platform, now=None):
+    """Add a scene to the queue and return its task id"""
+    task_id = f"local-{uuid.uuid4().hex}"
+    video_tasks[task_id] = {
+        'script_title': script_title,
+        'scene_number': scene['scene_number'],
+        'character': scene.get('assigned_character'),
+        'platform': platform,
+        'status': tasks.QUEUED,
+        'attempts': 0,
+        'enqueued_at': time.time() if now is None else now
+    }
+    tasks.set_scene_status(scripts, video_tasks[task_id], 'submitted')
+    return task_id
+
+
+def dispatch(video_tasks, scripts, characters, api_keys, http=requests, meter=None, now=None, limit=None, log=None):
+    """Submit queued jobs in priority order until every platform is full
+
+    A platform is skipped for the rest of the pass once admission control
+    holds one of its jobs back. Returns the number of jobs the providers
+    accepted; a submission that failed and went to a retry or the dead
+    letters is not counted.
+    """
+    now = time.time() if now is None else now
+    heap = build_heap(video_tasks, scripts, now)
+    blocked = set()
+    submitted = 0
+    while heap and (limit is None or submitted < limit):
+        task_id = heapq.heappop(heap)[-1]
+        task_info = video_tasks[task_id]
+        platform = task_info.get('next_platform', task_info['platform'])
+        project = task_info['script_title']
+        if platform in blocked or (platform, project) in blocked or not api_keys.get(platform):
+            continue
+        script = scripts.get(project)
+        index = scene_index(script, task_info['scene_number']) if script else None
+        if index is None:
+            task_info['status'] = CANCELLED
+            task_info['last_error'] = "scene was deleted"
+            continue
+
+        del video_tasks[task_id]
+        try:
+            new_id = tasks.submit_scene(video_tasks, scripts, project, script['scenes'][index], characters,
+                                        platform, api_keys, http, previous=task_info, now=now, meter=meter,
+                                        log=log)
+        except metering.BudgetExceeded as e:
+            task_info['last_error'] = str(e)
+            video_tasks[task_id] = task_info
+            # Daily budgets hold the whole platform; a project budget only that project
+            blocked.add(platform if e.retry_at else (platform, project))
+            continue
+        except Exception:
+            # Keep the job queued rather than losing it with the error
+            video_tasks[task_id] = task_info
+            raise
+        status = video_tasks[new_id]['status']
+        if status == tasks.QUEUED:
+            blocked.add(platform)
+        elif status in metering.IN_FLIGHT_STATUSES:
+            submitted += 1
+    return submitted
+
+
+def bump(task_info):
+    """Move one queued job to the front of the queue"""
+    task_info['priority'] = BUMPED
+
+
+def cancel_tasks(video_tasks, scripts, task_ids, api_keys, http=requests):
+    """Cancel tasks, calling the provider for ones already submitted
+
+    Returns (number cancelled, [(task_id, message)] for cancels that failed).
+    """
+    cancelled = 0
+    errors = []
+    for task_id in task_ids:
+        task_info = video_tasks.get(task_id)
+        if not task_info or task_info.get('status') in FINISHED_STATUSES:
+            continue
+        if task_info.get('status') in metering.IN_FLIGHT_STATUSES and not task_id.startswith('local-'):
+            platform = task_info.get('platform', 'runwayml')
+            try:
+                get_provider(platform).cancel(task_id, api_keys.get(platform, ''), http)
+            except ProviderError as e:
+                # 404: the provider has already dropped the task
+                if e.status_code != 404:
+                    task_info['last_error'] = f"Cancel failed: {e}"
+                    errors.append((task_id, str(e)))
+                    continue
+        task_info['status'] = CANCELLED
+        for key in ('next_retry_at', 'next_platform', 'not_before'):
+            task_info.pop(key, None)
+        tasks.set_scene_status(scripts, task_info, 'cancelled')
+        cancelled += 1
+    return cancelled, errors
+
+
+def cancel_scene(video_tasks, scripts, script_title, scene_number, api_keys, http=requests):
+    task_ids = [task_id for task_id, info in video_tasks.items()
+                if info.get('script_title') == script_title and info.get('scene_number') == scene_number]
+    return cancel_tasks(video_tasks, scripts, task_ids, api_keys, http)
+
+
+def cancel_project(video_tasks, scripts, script_title, api_keys, http=requests):
+    task_ids = [task_id for task_id, info in video_tasks.items() if info.get('script_title') == script_title]
+    return cancel_tasks(video_tasks, scripts, task_ids, api_keys, http)
+
+
+def active_tasks(video_tasks, script_title):
+    """Task ids of a project that are queued, scheduled or rendering"""
+    return [task_id for task_id, info in video_tasks.items()
+            if info.get('script_title') == script_title and info.get('status') in WAITING_STATUSES]
@@ -0,0 +1,136 @@
+"""Scene keyframe pre-generation
+
+Image-to-video providers do best with a start frame that already shows the
+scene, not just the character's reference portrait. A keyframe generator
+takes ``(reference_image, visual_description, size)`` and returns a PIL
+image; ``stub_generator`` is a local, deterministic composition used until a
+real image model is plugged in (and in tests and benchmarks).
+
+Keyframes are cached under ``keyframes/`` by a hash of everything that goes
+into them, so re-generating a project only renders scenes whose character
+image or description changed. Cache misses are rendered in a process pool.
+"""
+import hashlib
+import os
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageDraw, ImageFilter, ImageOps
+
+from studio import perf
+from studio.blobs import content_digest
+from studio.scenes import is_scene_ready, update_scene
+from studio.storage import DATA_DIR, temp_path
+
+KEYFRAME_SIZE = (540, 960)
+KEYFRAMES_DIR = 'keyframes'
+# Below this many misses the pool's start-up cost outweighs the parallelism
+POOL_THRESHOLD = 4
+
+
+def stub_generator(reference_image, visual_description, size):
+    """Compose a moody 9:16 frame from the reference image and a caption
+
+    Deterministic: the tint is derived from the description text, so the
+    same inputs always produce the same pixels.
+    """
+    frame = ImageOps.fit(reference_image.convert('RGB'), size, Image.LANCZOS)
+    tint_seed = hashlib.sha256(visual_description.encode('utf-8')).digest()
+    tint = (40 + tint_seed[0] % 80, tint_seed[1] % 40, 30 + tint_seed[2] % 90)
+    frame = Image.blend(frame, Image.new('RGB', size, tint), 0.35)
+
+    # Vignette: darken towards the edges
+    mask = Image.new('L', size, 0)
+    ImageDraw.Draw(mask).ellipse(
+        (-size[0] // 4, -size[1] // 8, size[0] + size[0] // 4, size[1] + size[1] // 8), fill=255
+    )
+    mask = mask.filter(ImageFilter.GaussianBlur(size[0] // 8))
+    frame = Image.composite(frame, Image.new('RGB', size, (0, 0, 0)), mask)
+
+    draw = ImageDraw.Draw(frame)
+    caption = textwrap.fill(visual_description, width=40)
+    draw.multiline_text((24, size[1] - 40 - 14 * caption.count('\n')), caption, fill=(235, 235, 235))
+    return frame
+
+
+def keyframe_key(reference_path, visual_description, generator=stub_generator, size=KEYFRAME_SIZE):
+    """Hash the inputs that determine a keyframe"""
+    reference_digest = content_digest(reference_path)
+    generator_name = f"{generator.__module__}.{generator.__qualname__}"
+    payload = '\0'.join([generator_name, reference_digest, visual_description, f"{size[0]}x{size[1]}"])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def keyframe_path(key, data_dir=DATA_DIR):
+    return os.path.join(data_dir, KEYFRAMES_DIR, key[:2], key + '.png')
+
+
+def _render(job):
+    """Pool worker: render one keyframe to its cache path"""
+    reference_path, visual_description, generator, size, out_path = job
+    with Image.open(reference_path) as reference:
+        frame = generator(reference, visual_description, size)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = temp_path(out_path)
+    try:
+        # Keyframes are a regenerable cache, so favour encode speed over size
+        frame.save(tmp_path, format='PNG', compress_level=1)
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return out_path
+
+
+@perf.instrument('keyframes.render_batch')
+def render_keyframes(items, generator=stub_generator, size=KEYFRAME_SIZE, data_dir=DATA_DIR, max_workers=None):
+    """Return a keyframe path for each (reference_path, visual_description) item, plus how many were rendered
+
+    Cached keyframes are reused; misses are rendered, in a process pool when
+    there are enough of them. ``generator`` must be a module-level function
+    so it can be sent to the worker processes.
+    """
+    paths = []
+    jobs = {}
+    for reference_path, visual_description in items:
+        path = keyframe_path(keyframe_key(reference_path, visual_description, generator, size), data_dir)
+        paths.append(path)
+        if path not in jobs and not os.path.exists(path):
+            jobs[path] = (reference_path, visual_description, generator, size, path)
+
+    if len(jobs) >= POOL_THRESHOLD and max_workers != 1 and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(_render, jobs.values()))
+    else:
+        for job in jobs.values():
+            _render(job)
+    return paths, len(jobs)
+
+
+def prepare_script_keyframes(script_data, characters, generator=stub_generator, data_dir=DATA_DIR, max_workers=None):
+    """Make sure every ready scene of a script has a keyframe
+
+    Records the path on each scene as ``keyframe_path`` and returns a summary
+    of how many were rendered, reused from the cache, or skipped because the
+    scene's character has no reference image.
+    """
+    targets = []
+    skipped = 0
+    for i, scene in enumerate(script_data.get('scenes', [])):
+        if not is_scene_ready(scene):
+            continue
+        character = characters.get(scene['assigned_character'], {})
+        reference_path = character.get('image_path')
+        if not reference_path or not os.path.exists(reference_path):
+            skipped += 1
+            continue
+        targets.append((i, reference_path, scene['visual_description']))
+
+    paths, rendered = render_keyframes(
+        [(reference_path, description) for _, reference_path, description in targets],
+        generator, data_dir=data_dir, max_workers=max_workers
+    )
+    for (i, _, _), path in zip(targets, paths):
+        if script_data['scenes'][i].get('keyframe_path') != path:
+            update_scene(script_data, i, keyframe_path=path)
+    return {'rendered': rendered, 'cached': len(paths) - rendered, 'skipped': skipped}
@@ -0,0 +1,169 @@
+"""Searchable character and script libraries
+
+In-memory inverted indexes over character names, descriptions and tags, and
+over script titles and text. Queries match every word by prefix, so
+"gho pal" finds "Ghost" described as "pale". Building an index is linear in
+the library size and only happens when its store changes; the script index
+only re-reads scripts whose title or text changed.
+"""
+import bisect
+import re
+
+_WORD = re.compile(r"[\w']+")
+
+
+def tokenize(text):
+    """Split text into lowercase search terms"""
+    return _WORD.findall(text.lower()) if text else []
+
+
+def parse_tags(text):
+    """Turn a comma separated tag field into a clean, de-duplicated list"""
+    tags = []
+    for tag in (text or '').split(','):
+        tag = tag.strip().lower()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+class PrefixIndex:
+    """Postings from terms to keys, with the terms kept sorted for prefix lookups"""
+
+    def __init__(self):
+        self._postings = {}
+        self._terms = []
+
+    def _prefix_matches(self, prefix):
+        keys = set()
+        start = bisect.bisect_left(self._terms, prefix)
+        for term in self._terms[start:]:
+            if not term.startswith(prefix):
+                break
+            keys |= self._postings[term]
+        return keys
+
+    def _match_words(self, query):
+        """Keys with a term starting with every query word, or None for a query without words"""
+        matches = None
+        for word in tokenize(query):
+            found = self._prefix_matches(word)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return set()
+        return matches
+
+
+class CharacterIndex(PrefixIndex):
+    """Inverted index from terms and tags to character names"""
+
+    def __init__(self, characters=None, version=None):
+        super().__init__()
+        self.version = version
+        self._tags = {}
+        self._order = []
+        if characters:
+            for name, data in characters.items():
+                self._add(name, data)
+            self._terms = sorted(self._postings)
+
+    def _add(self, name, data):
+        self._order.append(name)
+        for term in set(tokenize(name) + tokenize(data.get('description', ''))):
+            self._postings.setdefault(term, set()).add(name)
+        for tag in data.get('tags', []):
+            self._tags.setdefault(tag, set()).add(name)
+            for term in tokenize(tag):
+                self._postings.setdefault(term, set()).add(name)
+
+    def add(self, name, data):
+        """Index one new character"""
+        self._add(name, data)
+        self._terms = sorted(self._postings)
+
+    def remove(self, name):
+        """Drop a character from the index"""
+        if name in self._order:
+            self._order.remove(name)
+        for index in (self._postings, self._tags):
+            for key in list(index):
+                index[key].discard(name)
+                if not index[key]:
+                    del index[key]
+        self._terms = sorted(self._postings)
+
+    def all_tags(self):
+        return sorted(self._tags)
+
+    def search(self, query='', tags=()):
+        """Return character names matching every query word and every tag, in library order"""
+        matches = self._match_words(query)
+        if matches is not None and not matches:
+            return []
+        for tag in tags:
+            found = self._tags.get(tag, set())
+            matches = set(found) if matches is None else matches & found
+            if not matches:
+                return []
+        if matches is None:
+            return list(self._order)
+        return [name for name in self._order if name in matches]
+
+
+class ScriptIndex(PrefixIndex):
+    """Inverted index from title and text terms to script titles"""
+
+    def __init__(self):
+        super().__init__()
+        self.version = None
+        self._script_terms = {}
+        self._content = {}
+        self._order = []
+
+    def update(self, scripts, version=None):
+        """Re-index scripts that are new or whose text changed, and drop deleted ones"""
+        changed = False
+        for title in set(self._content) - set(scripts):
+            self._remove(title)
+            changed = True
+        for title, data in scripts.items():
+            content = data.get('content', '')
+            if self._content.get(title) != content:
+                self._remove(title)
+                self._add(title, content)
+                changed = True
+        if changed:
+            self._terms = sorted(self._postings)
+        self._order = list(scripts)
+        self.version = version
+        return self
+
+    def _add(self, title, content):
+        terms = set(tokenize(title)) | set(tokenize(content))
+        self._content[title] = content
+        self._script_terms[title] = terms
+        for term in terms:
+            self._postings.setdefault(term, set()).add(title)
+
+    def _remove(self, title):
+        for term in self._script_terms.pop(title, ()):
+            titles = self._postings[term]
+            titles.discard(title)
+            if not titles:
+                del self._postings[term]
+        self._content.pop(title, None)
+
+    def search(self, query=''):
+        """Return script titles matching every query word, in library order"""
+        matches = self._match_words(query)
+        if matches is None:
+            return list(self._order)
+        return [title for title in self._order if title in matches]
+
+
+def paginate(items, page, page_size):
+    """Return one page of items plus the clamped page number and page count"""
+    page_count = max(1, -(-len(items) // page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return items[start:start + page_size], page, page_count
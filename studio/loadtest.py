@@ -0,0 +1,227 @@
+"""Load testing the generation pipeline against the provider simulator
+
+``run`` starts a ``studio.simulator`` server, queues scenes across the
+platforms and drives them through the code the apps use: the job queue's
+dispatch with metering, status polling, and scheduled retries with
+fallback to another platform. Everything is also written to an event log
+as it would be in the apps. It stops once every scene has a finished clip or
+is dead-lettered. Rendering, rate-limit windows and retry backoff all run on
+the simulator's clock, ``speed`` times faster than real time.
+
+The report gives throughput in simulated time (scenes per hour) and in real
+time (how fast the client code gets through scenes), scene latency from
+queueing to a finished clip, and real request latency per kind of call.
+
+Run ``python -m studio.loadtest --scenes 2000 --speed 200`` for a report.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import requests
+from PIL import Image
+
+from studio import events, jobs, metering, retry, tasks
+from studio.scenes import rebuild_scene_counts
+from studio.simulator import PLATFORMS, Clock, ProviderSimulator, SimulatorServer, install
+
+SCENES_PER_PROJECT = 20
+POLL_INTERVAL = 5
+
+
+class TimedSession(requests.Session):
+    """A requests session that records how long each call took, by kind"""
+
+    def __init__(self):
+        super().__init__()
+        self.timings = defaultdict(list)
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() == 'DELETE':
+            kind = 'cancel'
+        elif url.endswith('/image_to_video'):
+            kind = 'submit'
+        elif '/files/' in url:
+            kind = 'download'
+        else:
+            kind = 'status'
+        started = time.perf_counter()
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            self.timings[kind].append((time.perf_counter() - started) * 1000)
+
+
+def build_projects(scene_count, data_dir):
+    """(characters, scripts) with scene_count ready scenes in projects of SCENES_PER_PROJECT"""
+    image_path = os.path.join(data_dir, 'images', 'Simulated.png')
+    os.makedirs(os.path.dirname(image_path), exist_ok=True)
+    Image.new('RGB', (64, 112), (60, 10, 20)).save(image_path)
+    characters = {'Simulated': {'name': 'Simulated', 'description': 'a pale figure', 'image_path': image_path}}
+    scripts = {}
+    for number in range(scene_count):
+        script = scripts.setdefault(f"Load test {number // SCENES_PER_PROJECT + 1}", {'content': '', 'scenes': []})
+        script['scenes'].append({
+            'scene_number': len(script['scenes']) + 1,
+            'narration': f"Scene {number}: the door at the end of the hall is open again.",
+            'assigned_character': 'Simulated',
+            'visual_description': 'a dark hallway lit by a flickering bulb',
+            'status': 'pending'
+        })
+    for script in scripts.values():
+        rebuild_scene_counts(script)
+    return characters, scripts
+
+
+def _percentiles(values, scale=1.0):
+    values = sorted(values)
+    return {
+        'p50': events.quantile(values, 0.5) * scale if values else None,
+        'p95': events.quantile(values, 0.95) * scale if values else None,
+        'p99': events.quantile(values, 0.99) * scale if values else None,
+        'max': values[-1] * scale if values else None
+    }
+
+
+def report(video_tasks, simulator, http, simulated_seconds, real_seconds):
+    """Summarize a finished run"""
+    by_platform = defaultdict(lambda: {'succeeded': 0, 'dead_letters': 0, 'latencies': []})
+    latencies = []
+    retried = fell_back = unfinished = 0
+    for info in video_tasks.values():
+        row = by_platform[info['platform']]
+        if info['status'] == 'SUCCEEDED':
+            latency = info['finished_at'] - info['enqueued_at']
+            latencies.append(latency)
+            row['succeeded'] += 1
+            row['latencies'].append(latency)
+        elif info['status'] == retry.DEAD_LETTER:
+            row['dead_letters'] += 1
+        elif info['status'] not in jobs.FINISHED_STATUSES:
+            unfinished += 1
+        retried += bool(info.get('history'))
+        fell_back += len(info.get('platforms_tried', [])) > 1
+
+    server_stats = simulator.stats()
+    platforms = {}
+    for platform, row in sorted(by_platform.items()):
+        platforms[platform] = {
+            'succeeded': row['succeeded'],
+            'dead_letters': row['dead_letters'],
+            'latency_seconds': _percentiles(row['latencies']),
+            **server_stats.get(platform, {})
+        }
+    succeeded = len(latencies)
+    return {
+        'scenes': len(video_tasks),
+        'succeeded': succeeded,
+        'dead_letters': sum(row['dead_letters'] for row in platforms.values()),
+        'unfinished': unfinished,
+        'retried': retried,
+        'fell_back': fell_back,
+        'simulated_seconds': round(simulated_seconds),
+        'real_seconds': round(real_seconds, 2),
+        'scenes_per_hour': round(succeeded * 3600 / simulated_seconds, 1) if simulated_seconds else None,
+        'scenes_per_real_second': round(succeeded / real_seconds, 1) if real_seconds else None,
+        'latency_seconds': _percentiles(latencies),
+        'platforms': platforms,
+        'requests_ms': {kind: {'count': len(times), **_percentiles(times)} for kind, times in sorted(http.timings.items())}
+    }
+
+
+def run(scenes=1000, platforms=PLATFORMS, speed=100.0, poll_interval=POLL_INTERVAL, meter=True, download=False,
+        seed=None, timeout=None, profiles=None):
+    """Push scenes through submission, polling and retries against a simulator, returning a report
+
+    ``meter=False`` leaves out client-side admission control, so the
+    providers' own rate limits and the retry policy do the pacing.
+    ``download`` also fetches every finished clip. ``timeout`` caps the run
+    in real seconds; scenes still open then are reported as unfinished.
+    """
+    clock = Clock(speed)
+    simulator = ProviderSimulator(clock, profiles, seed)
+    server = SimulatorServer(simulator).start()
+    try:
+        with tempfile.TemporaryDirectory() as data_dir, install(server, platforms):
+            characters, scripts = build_projects(scenes, data_dir)
+            video_tasks = {}
+            queued_at = clock.now()
+            for number, (title, scene) in enumerate(
+                    (title, scene) for title, script in scripts.items() for scene in script['scenes']):
+                jobs.enqueue_scene(video_tasks, scripts, title, scene, platforms[number % len(platforms)], queued_at)
+            api_keys = {platform: f"simulated-{platform}" for platform in platforms}
+            admission = metering.Meter({}, data_dir) if meter else None
+            log = events.EventLog(data_dir)
+            http = TimedSession()
+            downloaded = set()
+            started = time.monotonic()
+            while True:
+                jobs.dispatch(video_tasks, scripts, characters, api_keys, http, admission, clock.now(), log=log)
+                tasks.run_due_retries(video_tasks, scripts, characters, api_keys, http, clock.now(), admission, log=log)
+                tasks.poll_tasks(video_tasks, scripts, api_keys, http, clock.now(), log=log)
+                if download:
+                    for task_id, info in video_tasks.items():
+                        if info['status'] == 'SUCCEEDED' and task_id not in downloaded:
+                            tasks.download_video(task_id, info, http, data_dir)
+                            downloaded.add(task_id)
+                if all(info['status'] in jobs.FINISHED_STATUSES for info in video_tasks.values()):
+                    break
+                if timeout and time.monotonic() - started > timeout:
+                    break
+                clock.sleep(poll_interval)
+            return report(video_tasks, simulator, http, clock.now() - queued_at, time.monotonic() - started)
+    finally:
+        server.stop()
+
+
+def format_report(result):
+    """The report as readable lines"""
+    def seconds(row):
+        return ' / '.join('-' if row[key] is None else f"{row[key]:.0f}" for key in ('p50', 'p95', 'p99', 'max'))
+
+    def millis(row):
+        return ' / '.join('-' if row[key] is None else f"{row[key]:.1f}" for key in ('p50', 'p95', 'p99', 'max'))
+
+    lines = [
+        f"{result['succeeded']}/{result['scenes']} scenes finished, {result['dead_letters']} dead-lettered, "
+        f"{result['unfinished']} unfinished; {result['retried']} retried, {result['fell_back']} fell back",
+        f"{result['simulated_seconds']} s simulated in {result['real_seconds']} s real: "
+        f"{result['scenes_per_hour']} scenes/hour simulated, {result['scenes_per_real_second']} scenes/s real",
+        f"Scene latency p50/p95/p99/max (s): {seconds(result['latency_seconds'])}",
+    ]
+    for platform, row in result['platforms'].items():
+        lines.append(
+            f"  {platform:<9} {row['succeeded']:>6} done {row['dead_letters']:>4} dead  "
+            f"latency {seconds(row['latency_seconds'])} s  "
+            f"429s {row.get('rate_limited', 0)}  500s {row.get('errors', 0)}"
+        )
+    lines.append("Requests p50/p95/p99/max (ms, real):")
+    for kind, row in result['requests_ms'].items():
+        lines.append(f"  {kind:<9} {row['count']:>7} calls  {millis(row)}")
+    return lines
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m studio.loadtest', description="Load test against simulated providers")
+    parser.add_argument('--scenes', type=int, default=1000)
+    parser.add_argument('--speed', type=float, default=100.0, help="simulated seconds per real second")
+    parser.add_argument('--platforms', default=','.join(PLATFORMS))
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL, help="simulated seconds between rounds")
+    parser.add_argument('--no-meter', action='store_true', help="leave pacing to the providers' rate limits")
+    parser.add_argument('--download', action='store_true', help="download every finished clip")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--timeout', type=float, help="give up after this many real seconds")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+    result = run(args.scenes, tuple(args.platforms.split(',')), args.speed, args.poll_interval, not args.no_meter,
+                 args.download, args.seed, args.timeout)
+    print(json.dumps(result, indent=2) if args.json else '\n'.join(format_report(result)))
+    return 0 if not result['unfinished'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
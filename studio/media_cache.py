@@ -0,0 +1,239 @@
+"""Disk usage of generated media, and evicting it to a quota
+
+Keyframes, animatic frames, animatics, thumbnails and assembled masters can
+all be made again, so they are a cache. A sweep deletes the least recently
+used of them once the media folders together go over ``quota_gb``, and
+anything unused for ``max_age_days``; either limit is off at 0. Files are
+ranked by their last access or modification, whichever is later.
+
+Downloaded clips and platform exports are deliverables: a clip can't be
+fetched again once the provider's URL expires. They are only evicted when
+``evict_deliverables`` is turned on. Character images and backups count
+towards usage but are never evicted here (see ``studio.blobs`` for the
+image store's own clean-up).
+
+Media an active project uses - its keyframes, clips, master and animatic and
+its characters' thumbnails - is never evicted, nor is anything written in
+the last ``GRACE_SECONDS``. A project stays active until every scene is done
+and it has been exported.
+
+Each app process starts a sweeper thread (``ensure_sweeping``) that sweeps
+every ``SWEEP_INTERVAL``; run ``python -m studio.media_cache usage|sweep``
+to check or sweep from a shell.
+"""
+import os
+import sys
+import threading
+import time
+
+from studio import events, perf
+from studio.animatic import ANIMATICS_DIR, FRAMES_DIR
+from studio.blobs import BLOBS_DIR
+from studio.export import EXPORTS_DIR, MASTERS_DIR
+from studio.keyframes import KEYFRAMES_DIR
+from studio.scenes import DONE_STATUS
+from studio.storage import DATA_DIR, load_json, save_json
+from studio.tasks import VIDEOS_DIR
+
+CONFIG_FILE = 'media_cache.json'
+DEFAULT_CONFIG = {'quota_gb': 20.0, 'max_age_days': 30, 'evict_deliverables': False}
+# Eviction classes: made again on demand, evicted only when opted in, never evicted
+CACHE, DELIVERABLE, KEPT = 'cache', 'deliverable', 'kept'
+# Category -> (label, folder, eviction class)
+CATEGORIES = {
+    'videos': ("Downloaded clips", VIDEOS_DIR, DELIVERABLE),
+    'keyframes': ("Keyframes", KEYFRAMES_DIR, CACHE),
+    'animatic_frames': ("Animatic frames", FRAMES_DIR, CACHE),
+    'animatics': ("Animatics", ANIMATICS_DIR, CACHE),
+    'thumbnails': ("Thumbnails", 'thumbnails', CACHE),
+    'masters': ("Assembled masters", MASTERS_DIR, CACHE),
+    'platform_exports': ("Platform exports", EXPORTS_DIR, DELIVERABLE),
+    'images': ("Character images", BLOBS_DIR, KEPT),
+    'backups': ("Backups", 'exports', KEPT),
+}
+# Files this new may still be being written or about to be referenced
+GRACE_SECONDS = 600
+SWEEP_INTERVAL = 600
+GB = 1024 ** 3
+
+_sweepers = {}
+_sweepers_guard = threading.Lock()
+
+
+def evictable_categories(config):
+    """Categories a sweep with this config may evict from"""
+    classes = (CACHE, DELIVERABLE) if config.get('evict_deliverables') else (CACHE,)
+    return {category for category, (_, _, kind) in CATEGORIES.items() if kind in classes}
+
+
+def load_config(data_dir=DATA_DIR):
+    return {**DEFAULT_CONFIG, **load_json(CONFIG_FILE, {}, data_dir)}
+
+
+def save_config(config, data_dir=DATA_DIR):
+    save_json(CONFIG_FILE, {key: config[key] for key in DEFAULT_CONFIG}, data_dir)
+
+
+def scan(data_dir=DATA_DIR):
+    """Yield (category, absolute path, size, last used) for every media file"""
+    root = os.path.abspath(data_dir)
+    for category, (_, folder, _) in CATEGORIES.items():
+        pending = [os.path.join(root, folder)]
+        while pending:
+            try:
+                entries = list(os.scandir(pending.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and '.tmp' not in entry.name:
+                    stat = entry.stat(follow_symlinks=False)
+                    yield category, entry.path, stat.st_size, max(stat.st_atime, stat.st_mtime)
+
+
+def usage(files):
+    """{category: {'files', 'bytes'}} for scanned files, with every category present"""
+    totals = {category: {'files': 0, 'bytes': 0} for category in CATEGORIES}
+    for category, _, size, _ in files:
+        totals[category]['files'] += 1
+        totals[category]['bytes'] += size
+    return totals
+
+
+def is_finished(script_data):
+    """Whether a project has every scene done and has been exported"""
+    scenes = script_data.get('scenes', [])
+    return bool(scenes and script_data.get('exports')) and all(scene.get('status') == DONE_STATUS for scene in scenes)
+
+
+def protected_paths(scripts, video_tasks, characters=None, data_dir=DATA_DIR):
+    """Absolute paths of media that active projects still use
+
+    That is each active project's keyframes, clips, master, animatic and
+    platform exports, and the thumbnails of the characters its scenes are
+    assigned to.
+    """
+    characters = characters or {}
+    active = {title for title, script_data in scripts.items() if not is_finished(script_data)}
+    thumbnails_dir = os.path.join(os.path.abspath(data_dir), 'thumbnails')
+    paths = set()
+    for title in active:
+        script_data = scripts[title]
+        for key in ('master', 'animatic'):
+            if script_data.get(key):
+                paths.add(os.path.abspath(script_data[key]))
+        for path in script_data.get('exports', {}).values():
+            paths.add(os.path.abspath(path))
+        for scene in script_data.get('scenes', []):
+            if scene.get('keyframe_path'):
+                paths.add(os.path.abspath(scene['keyframe_path']))
+            image_path = characters.get(scene.get('assigned_character'), {}).get('image_path')
+            if image_path:
+                paths.add(os.path.join(thumbnails_dir, os.path.basename(image_path)))
+    for task_info in video_tasks.values():
+        if task_info.get('video_path') and task_info.get('script_title') in active:
+            paths.add(os.path.abspath(task_info['video_path']))
+    return paths
+
+
+def plan_eviction(files, protected, quota_bytes=0, max_age=0, now=None, evictable=None):
+    """Choose which files to delete, returning (paths, bytes freed, bytes still over the quota)
+
+    ``files`` are as scan() yields them and ``protected`` as
+    protected_paths() returns, both absolute. Only files in the
+    ``evictable`` categories (by default the cache ones) are candidates.
+    Files past ``max_age`` seconds go first, then the least recently used
+    until the total fits in ``quota_bytes``.
+    """
+    now = time.time() if now is None else now
+    evictable = evictable_categories({}) if evictable is None else evictable
+    total = 0
+    candidates = []
+    for category, path, size, last_used in files:
+        total += size
+        if category in evictable and last_used < now - GRACE_SECONDS and path not in protected:
+            candidates.append((last_used, size, path))
+    candidates.sort()
+
+    evict = []
+    freed = 0
+    for last_used, size, path in candidates:
+        expired = max_age and last_used < now - max_age
+        if not expired and (not quota_bytes or total - freed <= quota_bytes):
+            break
+        evict.append(path)
+        freed += size
+    over = max(0, total - freed - quota_bytes) if quota_bytes else 0
+    return evict, freed, over
+
+
+@perf.instrument('media_cache.sweep')
+def sweep(data_dir=DATA_DIR, config=None, now=None, log=None):
+    """Evict media over the configured quota or age, returning a summary
+
+    With a ``log`` (an events.EventLog), a sweep that removed anything is
+    recorded as activity.
+    """
+    config = load_config(data_dir) if config is None else config
+    summary = {'removed': 0, 'freed_bytes': 0, 'over_quota_bytes': 0}
+    if not config['quota_gb'] and not config['max_age_days']:
+        return summary
+    protected = protected_paths(load_json('scripts.json', {}, data_dir), load_json('video_tasks.json', {}, data_dir),
+                                load_json('characters.json', {}, data_dir), data_dir)
+    evict, freed, over = plan_eviction(
+        scan(data_dir), protected, int(config['quota_gb'] * GB), config['max_age_days'] * 86400, now,
+        evictable_categories(config)
+    )
+    for path in evict:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        summary['removed'] += 1
+    summary.update(freed_bytes=freed, over_quota_bytes=over)
+    if log and summary['removed']:
+        log.record('activity', message=f"🧹 Evicted {summary['removed']} cached media files ({freed / (1024 * 1024):.0f} MB)")
+    return summary
+
+
+def _sweep_forever(data_dir, interval):
+    log = events.EventLog(data_dir)
+    while True:
+        try:
+            sweep(data_dir, log=log)
+        except Exception as e:
+            # Keep sweeping; a file in use or a half-written store may be fine next time
+            log.record('activity', message=f"⚠️ Media cache sweep failed: {e}")
+        time.sleep(interval)
+
+
+def ensure_sweeping(data_dir=DATA_DIR, interval=SWEEP_INTERVAL):
+    """Start the process's sweeper thread for a data directory if it isn't running"""
+    with _sweepers_guard:
+        thread = _sweepers.get(data_dir)
+        if thread is None or not thread.is_alive():
+            thread = _sweepers[data_dir] = threading.Thread(
+                target=_sweep_forever, args=(data_dir, interval), name='media-sweeper', daemon=True
+            )
+            thread.start()
+        return thread
+
+
+def main(argv):
+    if argv[:1] not in (['usage'], ['sweep']):
+        print("usage: python -m studio.media_cache usage|sweep")
+        return 2
+    if argv[0] == 'sweep':
+        summary = sweep()
+        print(f"Removed {summary['removed']} files and freed {summary['freed_bytes'] / (1024 * 1024):.1f} MB")
+        if summary['over_quota_bytes']:
+            print(f"Still {summary['over_quota_bytes'] / (1024 * 1024):.1f} MB over the quota in media that can't be evicted")
+        return 0
+    for category, row in usage(scan()).items():
+        print(f"{CATEGORIES[category][0]:<20} {row['files']:>8} files {row['bytes'] / (1024 * 1024):>10.1f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
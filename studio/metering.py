@@ -0,0 +1,185 @@
+"""Local metering of provider usage, spend budgets and admission control
+
+Providers don't tell us how many credits a key has left, so every submission
+is recorded here with its requested clip length and an estimated cost from
+list prices. A submission first ``reserve``s its estimate, which checks
+
+* the user's budgets - per provider per day, all providers per day, and per
+  project - raising BudgetExceeded, and
+* each provider's submission rate and in-flight task limits, raising
+  RateLimited with the time a slot frees up, so a big batch is paced out
+  instead of tripping the provider's own rate limiter.
+
+Usage lives in ``usage.json`` and is updated under the store lock, so every
+session and worker sharing the data directory draws on the same budget.
+"""
+import time
+from datetime import date, datetime, timedelta
+
+from studio.storage import DATA_DIR, load_json, update_json
+
+USAGE_FILE = 'usage.json'
+USAGE_RETENTION_DAYS = 90
+RATE_WINDOW = 60
+
+# Estimated list prices; clip_seconds is what we ask each provider for
+PRICING = {
+    'runwayml': {'usd_per_second': 0.05, 'clip_seconds': 5},
+    'kling': {'usd_per_second': 0.028, 'clip_seconds': 5},
+    'pika': {'usd_per_second': 0.04, 'clip_seconds': 5},
+    'luma': {'usd_per_second': 0.032, 'clip_seconds': 5},
+}
+DEFAULT_PRICING = {'usd_per_second': 0.05, 'clip_seconds': 5}
+
+# Kept below the providers' published limits for entry-level keys
+LIMITS = {
+    'runwayml': {'per_minute': 10, 'in_flight': 4},
+    'kling': {'per_minute': 10, 'in_flight': 4},
+    'pika': {'per_minute': 10, 'in_flight': 4},
+    'luma': {'per_minute': 10, 'in_flight': 4},
+}
+DEFAULT_LIMITS = {'per_minute': 10, 'in_flight': 4}
+
+IN_FLIGHT_STATUSES = ('PENDING', 'RUNNING')
+
+# Budgets shape; a limit of 0 means unlimited
+DEFAULT_BUDGETS = {'daily_total': 0.0, 'daily': {}, 'project': 0.0}
+
+
+class AdmissionDenied(Exception):
+    """A submission was held back; retry_at is when it may be admitted, if known"""
+
+    def __init__(self, message, retry_at=None):
+        super().__init__(message)
+        self.retry_at = retry_at
+
+
+class BudgetExceeded(AdmissionDenied):
+    """The submission would take spend over a budget"""
+
+
+class RateLimited(AdmissionDenied):
+    """The provider is at its submission rate or in-flight task limit"""
+
+
+def estimate(platform, seconds=None):
+    """Return (clip seconds, estimated USD) for one submission"""
+    pricing = PRICING.get(platform, DEFAULT_PRICING)
+    seconds = seconds or pricing['clip_seconds']
+    return seconds, round(seconds * pricing['usd_per_second'], 4)
+
+
+def day_key(now=None):
+    return date.fromtimestamp(time.time() if now is None else now).isoformat()
+
+
+def next_midnight(now=None):
+    today = datetime.fromtimestamp(time.time() if now is None else now).date()
+    return datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+
+
+def empty_usage():
+    return {'days': {}, 'projects': {}, 'recent': {}}
+
+
+def load_usage(data_dir=DATA_DIR):
+    return load_json(USAGE_FILE, empty_usage(), data_dir)
+
+
+def in_flight(video_tasks, platform):
+    return sum(
+        1 for info in video_tasks.values()
+        if info.get('platform') == platform and info.get('status') in IN_FLIGHT_STATUSES
+    )
+
+
+def usage_for_day(usage, now=None):
+    """Per-provider {'submissions', 'seconds', 'cost'} for the day containing now"""
+    return usage.get('days', {}).get(day_key(now), {})
+
+
+def spend_today(usage, platform=None, now=None):
+    day = usage_for_day(usage, now)
+    if platform is not None:
+        return day.get(platform, {}).get('cost', 0.0)
+    return sum(entry.get('cost', 0.0) for entry in day.values())
+
+
+def project_spend(usage, project):
+    return usage.get('projects', {}).get(project, {}).get('cost', 0.0)
+
+
+def check_admission(platform, project, cost, usage, budgets, video_tasks, now=None):
+    """Raise BudgetExceeded or RateLimited if a submission must wait"""
+    now = time.time() if now is None else now
+    budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+
+    platform_budget = budgets['daily'].get(platform) or 0
+    if platform_budget and spend_today(usage, platform, now) + cost > platform_budget:
+        raise BudgetExceeded(f"{platform} daily budget of ${platform_budget:.2f} reached", next_midnight(now))
+    if budgets['daily_total'] and spend_today(usage, now=now) + cost > budgets['daily_total']:
+        raise BudgetExceeded(f"daily budget of ${budgets['daily_total']:.2f} reached", next_midnight(now))
+    if budgets['project'] and project_spend(usage, project) + cost > budgets['project']:
+        raise BudgetExceeded(f"project budget of ${budgets['project']:.2f} reached for '{project}'")
+
+    limits = LIMITS.get(platform, DEFAULT_LIMITS)
+    recent = [t for t in usage.get('recent', {}).get(platform, []) if t > now - RATE_WINDOW]
+    if len(recent) >= limits['per_minute']:
+        raise RateLimited(f"{platform} is at {limits['per_minute']} submissions a minute", recent[0] + RATE_WINDOW)
+    if in_flight(video_tasks, platform) >= limits['in_flight']:
+        raise RateLimited(f"{platform} already has {limits['in_flight']} videos rendering", now + RATE_WINDOW)
+
+
+def _add(usage, platform, project, submissions, seconds, cost, now):
+    for key, value in empty_usage().items():
+        usage.setdefault(key, value)
+    day = usage['days'].setdefault(day_key(now), {})
+    for entry in (day.setdefault(platform, {}), usage['projects'].setdefault(project, {})):
+        entry['submissions'] = entry.get('submissions', 0) + submissions
+        entry['seconds'] = entry.get('seconds', 0) + seconds
+        entry['cost'] = round(entry.get('cost', 0.0) + cost, 4)
+    cutoff = day_key(now - USAGE_RETENTION_DAYS * 86400)
+    usage['days'] = {key: entries for key, entries in usage['days'].items() if key >= cutoff}
+
+
+def reserve(platform, project, video_tasks, budgets=None, seconds=None, now=None, data_dir=DATA_DIR):
+    """Admit and record one submission in a single locked update, returning (seconds, cost)
+
+    Checking and recording together means two sessions can't both take the
+    last dollar of a budget or the last slot in a rate window.
+    """
+    now = time.time() if now is None else now
+    seconds, cost = estimate(platform, seconds)
+
+    def admit(usage):
+        check_admission(platform, project, cost, usage, budgets, video_tasks, now)
+        _add(usage, platform, project, 1, seconds, cost, now)
+        recent = usage['recent'].get(platform, [])
+        usage['recent'][platform] = [t for t in recent if t > now - RATE_WINDOW] + [now]
+
+    update_json(USAGE_FILE, admit, empty_usage(), data_dir)
+    return seconds, cost
+
+
+def refund(platform, project, seconds, cost, now=None, data_dir=DATA_DIR):
+    """Take back a reservation whose submission the provider rejected
+
+    The request still counts towards the rate window, as it did at the provider.
+    """
+    now = time.time() if now is None else now
+    update_json(USAGE_FILE, lambda usage: _add(usage, platform, project, -1, -seconds, -cost, now),
+                empty_usage(), data_dir)
+
+
+class Meter:
+    """Admission control and usage recording against one set of budgets"""
+
+    def __init__(self, budgets=None, data_dir=DATA_DIR):
+        self.budgets = budgets or {}
+        self.data_dir = data_dir
+
+    def reserve(self, platform, project, video_tasks, seconds=None, now=None):
+        return reserve(platform, project, video_tasks, self.budgets, seconds, now, self.data_dir)
+
+    def refund(self, platform, project, seconds, cost, now=None):
+        refund(platform, project, seconds, cost, now, self.data_dir)
@@ -0,0 +1,198 @@
+"""Lightweight timing instrumentation for the studio's hot paths
+
+Timings are off by default. When disabled, ``timed()`` hands back a shared
+no-op context manager and ``instrument()`` calls straight through, so the
+cost is one global lookup per call. Durations are aggregated per operation
+into fixed-bucket histograms that can be exported as JSON or Prometheus text.
+"""
+import functools
+import json
+import os
+import threading
+import time
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+SLOW_THRESHOLD_MS = 1000
+
+_enabled = os.environ.get('STUDIO_PERF', '') not in ('', '0')
+_lock = threading.Lock()
+_histograms = {}
+_slow_handler = None
+_slow_threshold_ms = SLOW_THRESHOLD_MS
+
+
+class _Histogram:
+    __slots__ = ('count', 'total_ms', 'max_ms', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def observe(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def quantile(self, q):
+        """Estimate a quantile as the upper bound of the bucket it falls in"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min(float(BUCKETS_MS[i]), self.max_ms) if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def enable(flag=True):
+    """Turn instrumentation on or off for the whole process"""
+    global _enabled
+    _enabled = bool(flag)
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_slow_handler(handler, threshold_ms=SLOW_THRESHOLD_MS):
+    """Call handler(name, ms) whenever an operation takes longer than threshold_ms"""
+    global _slow_handler, _slow_threshold_ms
+    _slow_handler = handler
+    _slow_threshold_ms = threshold_ms
+
+
+def record(name, ms):
+    """Add one duration sample for an operation"""
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = _Histogram()
+        histogram.observe(ms)
+    handler = _slow_handler
+    if handler is not None and ms >= _slow_threshold_ms:
+        handler(name, ms)
+
+
+def timed(name):
+    """Context manager that times the enclosed block when instrumentation is on"""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def start(name):
+    """Start a timer that is finished with stop(); returns None when disabled"""
+    if not _enabled:
+        return None
+    return _Timer(name)
+
+
+def stop(timer):
+    if timer is not None:
+        timer.__exit__(None, None, None)
+
+
+def instrument(name):
+    """Decorator that times every call of the wrapped function"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def snapshot():
+    """Summarize every operation as a list of dicts, slowest total first"""
+    with _lock:
+        items = [(name, h.count, h.total_ms, h.max_ms, h.quantile(0.5), h.quantile(0.95), list(h.buckets))
+                 for name, h in _histograms.items()]
+    rows = []
+    for name, count, total_ms, max_ms, p50, p95, buckets in items:
+        rows.append({
+            'operation': name,
+            'count': count,
+            'total_ms': round(total_ms, 3),
+            'mean_ms': round(total_ms / count, 3) if count else 0.0,
+            'p50_ms': p50,
+            'p95_ms': p95,
+            'max_ms': round(max_ms, 3),
+            'buckets': buckets
+        })
+    rows.sort(key=lambda row: row['total_ms'], reverse=True)
+    return rows
+
+
+def export_json():
+    return json.dumps({'buckets_ms': list(BUCKETS_MS), 'operations': snapshot()}, indent=2)
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def export_prometheus():
+    """Render the histograms in the Prometheus text exposition format"""
+    metric = 'studio_operation_duration_seconds'
+    lines = [
+        f'# HELP {metric} Duration of instrumented studio operations.',
+        f'# TYPE {metric} histogram'
+    ]
+    for row in sorted(snapshot(), key=lambda r: r['operation']):
+        op = _label(row['operation'])
+        cumulative = 0
+        for bound, n in zip(BUCKETS_MS, row['buckets']):
+            cumulative += n
+            lines.append(f'{metric}_bucket{{operation="{op}",le="{bound / 1000:g}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{operation="{op}",le="+Inf"}} {row["count"]}')
+        lines.append(f'{metric}_sum{{operation="{op}"}} {row["total_ms"] / 1000:.6f}')
+        lines.append(f'{metric}_count{{operation="{op}"}} {row["count"]}')
+    return '\n'.join(lines) + '\n'
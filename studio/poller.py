@@ -0,0 +1,121 @@
+"""Background polling of in-flight video tasks
+
+One daemon thread per process checks every in-flight task on a timer and
+writes what changed back to the shared stores. Open sessions pick the new
+statuses up on their next store pull, which costs a single stat call when
+nothing changed, so a live status view needs no "Check All" clicks.
+
+Provider requests are made on a snapshot, outside the store locks; a task's
+new state is only written back if nobody changed that task in the meantime.
+"""
+import json
+import threading
+import time
+
+import requests
+
+from studio import events, retry, tasks
+from studio.settings import API_KEYS_FILE
+from studio.storage import DATA_DIR, load_json, update_json
+
+POLL_INTERVAL = 15
+VIDEO_TASKS_FILE = 'video_tasks.json'
+SCRIPTS_FILE = 'scripts.json'
+# Scene status mirrored from a task's final state
+SCENE_STATUSES = {'SUCCEEDED': 'done', retry.DEAD_LETTER: 'failed'}
+
+_pollers = {}
+_pollers_guard = threading.Lock()
+
+
+def _fingerprint(task_info):
+    return json.dumps(task_info, sort_keys=True)
+
+
+def poll_once(http=requests, data_dir=DATA_DIR, now=None):
+    """Check every in-flight task once, returning (ids of changed tasks, errors)"""
+    video_tasks = load_json(VIDEO_TASKS_FILE, {}, data_dir)
+    before = {
+        task_id: _fingerprint(info) for task_id, info in video_tasks.items()
+        if info.get('status') not in tasks.NOT_POLLED_STATUSES and not task_id.startswith('local-')
+    }
+    if not before:
+        return [], []
+    scripts = load_json(SCRIPTS_FILE, {}, data_dir)
+    api_keys = load_json(API_KEYS_FILE, {}, data_dir)
+    errors = tasks.poll_tasks(video_tasks, scripts, api_keys, http, now, log=events.EventLog(data_dir))
+
+    changed = {
+        task_id: video_tasks[task_id] for task_id, fingerprint in before.items()
+        if _fingerprint(video_tasks[task_id]) != fingerprint
+    }
+    if not changed:
+        return [], errors
+    written = []
+
+    def apply(disk):
+        for task_id, info in changed.items():
+            # A session edited (or cancelled) the task while we were polling: theirs wins
+            if task_id in disk and _fingerprint(disk[task_id]) == before[task_id]:
+                disk[task_id] = info
+                written.append(task_id)
+
+    update_json(VIDEO_TASKS_FILE, apply, {}, data_dir)
+
+    finished = [changed[task_id] for task_id in written if changed[task_id].get('status') in SCENE_STATUSES]
+    if finished:
+        def mirror(disk_scripts):
+            for info in finished:
+                tasks.set_scene_status(disk_scripts, info, SCENE_STATUSES[info['status']])
+
+        update_json(SCRIPTS_FILE, mirror, {}, data_dir)
+    return written, errors
+
+
+class Poller:
+    """Polls in-flight tasks on a daemon thread until stopped"""
+
+    def __init__(self, interval=POLL_INTERVAL, http=requests, data_dir=DATA_DIR):
+        self.interval = interval
+        self.http = http
+        self.data_dir = data_dir
+        self.last_poll = None
+        self.last_changed = 0
+        self.errors = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='task-poller', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                changed, errors = poll_once(self.http, self.data_dir)
+                self.last_changed = len(changed)
+                self.errors = errors
+            except Exception as e:
+                # Keep polling; the next round may well succeed
+                self.errors = [('', str(e))]
+            self.last_poll = time.time()
+            self._stop.wait(self.interval)
+
+
+def ensure_running(data_dir=DATA_DIR, interval=POLL_INTERVAL):
+    """The process's poller for a data directory, started if it isn't running"""
+    with _pollers_guard:
+        poller = _pollers.get(data_dir)
+        if poller is None:
+            poller = _pollers[data_dir] = Poller(interval, data_dir=data_dir)
+        return poller.start()
@@ -0,0 +1,124 @@
+"""Compile scene fields into the prompt text each provider expects
+
+A prompt is assembled from parts in priority order - the scene's visual
+description, the assigned character, the platform's style keywords and the
+narration as mood context - and parts are dropped from the end, then the
+text is trimmed at a word boundary, until it fits the platform's length
+limit. Platforms that accept a negative prompt get one.
+
+Compilation is memoized on the fields that go into a prompt, so previewing
+or submitting a project only compiles and validates scenes that changed.
+"""
+import functools
+
+from studio import perf
+from studio.scenes import is_scene_ready
+
+# Length limits as documented by each platform; None means no negative prompt
+TEMPLATES = {
+    'runwayml': {
+        'max_length': 1000,
+        'style': "cinematic horror, low-key lighting, film grain, slow deliberate camera movement",
+        'negative': None,
+        'negative_max_length': 0
+    },
+    'kling': {
+        'max_length': 2500,
+        'style': "cinematic horror, dark atmosphere, realistic motion, consistent character appearance",
+        'negative': "blurry, low quality, distorted face, extra limbs, watermark, text, bright cheerful colors",
+        'negative_max_length': 2500
+    },
+    'pika': {
+        'max_length': 1000,
+        'style': "atmospheric horror, fog, flickering light, cinematic",
+        'negative': "blurry, low resolution, cartoon, watermark, text, deformed",
+        'negative_max_length': 1000
+    },
+    'luma': {
+        'max_length': 2000,
+        'style': "horror film still come to life, natural movement, moody shadows",
+        'negative': None,
+        'negative_max_length': 0
+    },
+}
+DEFAULT_PLATFORM = 'runwayml'
+
+
+def _trim(text, max_length):
+    """Cut text to max_length at a word boundary"""
+    if len(text) <= max_length:
+        return text
+    cut = text[:max_length].rsplit(' ', 1)[0]
+    return cut.rstrip(' ,.;:')
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile(platform, visual_description, character_name, character_description, narration):
+    template = TEMPLATES.get(platform, TEMPLATES[DEFAULT_PLATFORM])
+    warnings = []
+    visual_description = visual_description.strip().rstrip('.')
+    if not visual_description:
+        warnings.append("no visual description")
+    character = ''
+    if character_name:
+        description = character_description.strip().rstrip('.')
+        character = f"{character_name}, {description}" if description else character_name
+        if not description:
+            warnings.append(f"{character_name} has no description")
+
+    parts = [p for p in (visual_description, character, template['style']) if p]
+    if narration.strip():
+        parts.append(f"Mood: {narration.strip().rstrip('.')}")
+
+    prompt = '. '.join(parts) + '.'
+    while len(prompt) > template['max_length'] and len(parts) > 1:
+        dropped = parts.pop()
+        warnings.append(f"dropped \"{dropped[:30]}...\" to fit {template['max_length']} characters")
+        prompt = '. '.join(parts) + '.'
+    if len(prompt) > template['max_length']:
+        prompt = _trim(prompt, template['max_length'])
+        warnings.append(f"trimmed to {template['max_length']} characters")
+
+    negative = template['negative']
+    if negative:
+        negative = _trim(negative, template['negative_max_length'])
+    return prompt, negative, tuple(warnings)
+
+
+def compile_prompt(scene, character, platform=DEFAULT_PLATFORM):
+    """Return {'prompt', 'negative_prompt', 'warnings'} for one scene
+
+    ``character`` is the scene's character record, or None.
+    """
+    character = character or {}
+    prompt, negative, warnings = _compile(
+        platform,
+        scene.get('visual_description') or '',
+        scene.get('assigned_character') or '',
+        character.get('description') or '',
+        scene.get('narration') or ''
+    )
+    return {'prompt': prompt, 'negative_prompt': negative, 'warnings': list(warnings)}
+
+
+@perf.instrument('prompts.compile_batch')
+def compile_script_prompts(script_data, characters, platform=DEFAULT_PLATFORM):
+    """One preview row per ready scene of a script"""
+    rows = []
+    for scene in script_data.get('scenes', []):
+        if not is_scene_ready(scene):
+            continue
+        compiled = compile_prompt(scene, characters.get(scene['assigned_character']), platform)
+        rows.append({
+            'scene_number': scene['scene_number'],
+            'character': scene['assigned_character'],
+            'prompt': compiled['prompt'],
+            'negative_prompt': compiled['negative_prompt'] or '',
+            'length': len(compiled['prompt']),
+            'warnings': '; '.join(compiled['warnings'])
+        })
+    return rows
+
+
+def cache_info():
+    return _compile.cache_info()
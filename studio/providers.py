@@ -0,0 +1,133 @@
+"""Video provider API clients
+
+Each provider turns a scene's start image and prompt into a remote task and
+reports that task's progress in a common shape. Task statuses are normalized
+to RunwayML's vocabulary (PENDING, RUNNING, SUCCEEDED, FAILED, CANCELLED),
+which the apps already display. Failed HTTP calls raise ProviderError with
+the response status so callers can classify them.
+"""
+import os
+
+import requests
+
+from studio import perf
+
+RUNWAY_API_URL = os.environ.get('RUNWAY_API_URL', 'https://api.runwayml.com/v1')
+RUNWAY_API_VERSION = '2024-11-06'
+REQUEST_TIMEOUT = 30
+
+
+class ProviderError(Exception):
+    """A provider call failed; status_code is None for network errors"""
+
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def _call(http, method, url, **kwargs):
+    try:
+        response = getattr(http, method)(url, timeout=REQUEST_TIMEOUT, **kwargs)
+    except requests.RequestException as e:
+        raise ProviderError(str(e)) from e
+    if response.status_code >= 400:
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        detail = (body.get('error') if isinstance(body, dict) else None) or getattr(response, 'text', '')
+        raise ProviderError(f"HTTP {response.status_code}: {detail}", response.status_code, _retry_after(response))
+    return response
+
+
+def runway_headers(api_key):
+    """Build the auth headers for RunwayML requests"""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "X-Runway-Version": RUNWAY_API_VERSION
+    }
+
+
+class RunwayProvider:
+    name = 'runwayml'
+    label = 'RunwayML'
+    # Payload field for a negative prompt; RunwayML's API has none
+    negative_prompt_field = None
+
+    def __init__(self, base_url=None):
+        self.base_url = base_url or RUNWAY_API_URL
+
+    @perf.instrument('provider.runwayml.submit')
+    def submit(self, image_data_uri, prompt, api_key, http=requests, duration=5, seed=None, negative_prompt=None):
+        """Start an image-to-video task and return its id
+
+        A seed makes A/B variants differ. The negative prompt is sent only
+        when the provider has a field for it.
+        """
+        payload = {
+            'model': 'gen3a_turbo',
+            'promptImage': image_data_uri,
+            'promptText': prompt,
+            'duration': duration,
+            'ratio': '768:1280'
+        }
+        if seed is not None:
+            payload['seed'] = seed
+        if negative_prompt and self.negative_prompt_field:
+            payload[self.negative_prompt_field] = negative_prompt
+        response = _call(http, 'post', f"{self.base_url}/image_to_video", headers=runway_headers(api_key), json=payload)
+        return response.json()['id']
+
+    @perf.instrument('provider.runwayml.task_status')
+    def status(self, task_id, api_key, http=requests):
+        """Return {'status', 'video_url', 'failure', 'failure_code'} for a task"""
+        result = _call(http, 'get', f"{self.base_url}/tasks/{task_id}", headers=runway_headers(api_key)).json()
+        status = result.get('status', 'unknown')
+        if status == 'THROTTLED':
+            status = 'PENDING'
+        output = result.get('output') or []
+        return {
+            'status': status,
+            'video_url': (output[0] if isinstance(output, list) else output) if output else None,
+            'failure': result.get('failure'),
+            'failure_code': result.get('failureCode')
+        }
+
+    @perf.instrument('provider.runwayml.cancel')
+    def cancel(self, task_id, api_key, http=requests):
+        _call(http, 'delete', f"{self.base_url}/tasks/{task_id}", headers=runway_headers(api_key))
+
+
+PROVIDERS = {
+    'runwayml': RunwayProvider()
+}
+
+
+def get_provider(name):
+    return PROVIDERS[name]
+
+
+def connected_providers(api_keys):
+    """Names of registered providers that have an API key, in registry order"""
+    return [name for name in PROVIDERS if api_keys.get(name)]
+
+
+def check_task_status(task_id, task_info, api_key, http=requests):
+    """Fetch one task's status and record it (and its video URL or failure) on task_info"""
+    result = PROVIDERS[task_info.get('platform', 'runwayml')].status(task_id, api_key, http)
+    task_info['status'] = result['status']
+    if result['status'] == 'SUCCEEDED' and result['video_url']:
+        task_info['video_url'] = result['video_url']
+    if result['status'] == 'FAILED':
+        task_info['failure'] = result['failure']
+        task_info['failure_code'] = result['failure_code']
+    return task_info['status']
@@ -0,0 +1,120 @@
+"""Failure classification and retry policy for video tasks
+
+Every failure - an HTTP error while submitting, or a task the provider
+reports as FAILED - is sorted into one class, and the class's policy decides
+what happens next: resubmit to the same platform after an exponential
+backoff with jitter, fall back to another connected platform, or park the
+task in the dead-letter list for a human to look at.
+"""
+import random
+import time
+
+from studio.providers import ProviderError
+
+RATE_LIMIT = 'rate_limit'
+TRANSIENT = 'transient'
+CONTENT_POLICY = 'content_policy'
+INVALID_INPUT = 'invalid_input'
+
+RETRY_SCHEDULED = 'RETRY_SCHEDULED'
+DEAD_LETTER = 'DEAD_LETTER'
+
+# max_attempts counts submissions per platform; delays are in seconds
+POLICIES = {
+    RATE_LIMIT: {'max_attempts': 6, 'base_delay': 15, 'max_delay': 600, 'fallback': True},
+    TRANSIENT: {'max_attempts': 4, 'base_delay': 5, 'max_delay': 120, 'fallback': True},
+    # Moderation differs between platforms, so another one may accept the scene
+    CONTENT_POLICY: {'max_attempts': 1, 'base_delay': 0, 'max_delay': 0, 'fallback': True},
+    INVALID_INPUT: {'max_attempts': 1, 'base_delay': 0, 'max_delay': 0, 'fallback': False},
+}
+
+# Phrases rather than single words: "content" alone turns up in "content-type" or "no content"
+_MODERATION_PHRASES = (
+    'content policy', 'content_policy', 'content moderation', 'moderation', 'safety', 'nsfw', 'usage policy',
+    'policy violation', 'violates our', 'inappropriate content',
+)
+_FAILURE_KEYWORDS = (
+    (CONTENT_POLICY, _MODERATION_PHRASES),
+    (RATE_LIMIT, ('rate limit', 'rate_limit', 'ratelimit', 'throttl', 'quota', 'too many', 'concurren')),
+    (INVALID_INPUT, ('invalid', 'unsupported', 'too large', 'dimension', 'format', 'must be', 'asset')),
+)
+
+
+def _mentions_moderation(text):
+    text = text.lower()
+    return any(phrase in text for phrase in _MODERATION_PHRASES)
+
+
+def classify(error=None, failure=None, failure_code=None):
+    """Return the failure class for an exception or a provider's failure report
+
+    A 4xx response other than 408 and 429 is invalid input unless its body
+    talks about moderation, which is a content-policy rejection.
+    """
+    if isinstance(error, ProviderError):
+        code = error.status_code
+        if code == 429:
+            return RATE_LIMIT
+        if code is None or code == 408 or code >= 500:
+            return TRANSIENT
+        return CONTENT_POLICY if _mentions_moderation(str(error)) else INVALID_INPUT
+    if error is not None:
+        return TRANSIENT
+
+    text = f"{failure_code or ''} {failure or ''}".lower()
+    for failure_class, keywords in _FAILURE_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return failure_class
+    return TRANSIENT
+
+
+def backoff_delay(attempt, policy, rng=random):
+    """Exponential backoff with equal jitter: half the capped delay plus a random half"""
+    cap = min(policy['max_delay'], policy['base_delay'] * 2 ** max(0, attempt - 1))
+    return cap / 2 + rng.uniform(0, cap / 2)
+
+
+def handle_failure(task_info, failure_class, message, connected_platforms, retry_after=None, now=None, rng=random):
+    """Record a failure on a task and schedule its retry, fallback or dead-lettering
+
+    Returns the new task status: RETRY_SCHEDULED or DEAD_LETTER.
+    """
+    now = time.time() if now is None else now
+    policy = POLICIES[failure_class]
+    platform = task_info.get('platform', 'runwayml')
+    attempts = task_info.get('attempts', 1)
+    tried = task_info.setdefault('platforms_tried', [platform])
+
+    task_info['failure_class'] = failure_class
+    task_info['last_error'] = message
+    task_info.setdefault('history', []).append({
+        'time': now, 'platform': platform, 'failure_class': failure_class, 'error': message
+    })
+
+    fallbacks = [p for p in connected_platforms if p not in tried]
+    if attempts < policy['max_attempts']:
+        delay = backoff_delay(attempts, policy, rng)
+        if retry_after:
+            delay = max(delay, retry_after)
+        task_info['next_platform'] = platform
+        task_info['next_retry_at'] = now + delay
+        task_info['status'] = RETRY_SCHEDULED
+    elif policy['fallback'] and fallbacks:
+        task_info['next_platform'] = fallbacks[0]
+        task_info['next_retry_at'] = now
+        task_info['status'] = RETRY_SCHEDULED
+    else:
+        task_info.pop('next_retry_at', None)
+        task_info.pop('next_platform', None)
+        task_info['status'] = DEAD_LETTER
+    return task_info['status']
+
+
+def is_due(task_info, now=None):
+    now = time.time() if now is None else now
+    return task_info.get('status') == RETRY_SCHEDULED and task_info.get('next_retry_at', 0) <= now
+
+
+def dead_letters(video_tasks):
+    """Return (task_id, task_info) pairs that need a human decision"""
+    return [(task_id, info) for task_id, info in video_tasks.items() if info.get('status') == DEAD_LETTER]
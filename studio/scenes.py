@@ -0,0 +1,124 @@
+"""Scene generation and readiness helpers
+
+Each script carries a ``scene_counts`` record (total/ready/submitted/done)
+that is kept up to date as scenes change, so pages can read readiness per
+script without rescanning every scene on each rerun.
+"""
+
+SUBMITTED_STATUSES = ('submitted', 'processing')
+DONE_STATUS = 'done'
+
+
+def generate_scenes(content):
+    """Split script content into one pending scene per sentence"""
+    sentences = [s.strip() + '.' for s in content.split('.') if s.strip()]
+    scenes = []
+    for i, sentence in enumerate(sentences):
+        scenes.append({
+            'scene_number': i + 1,
+            'narration': sentence,
+            'assigned_character': None,
+            'visual_description': '',
+            'status': 'pending'
+        })
+    return scenes
+
+
+def is_scene_ready(scene):
+    """A scene is ready once it has a character and a visual description"""
+    return bool(scene.get('assigned_character') and scene.get('visual_description'))
+
+
+def filter_ready_scenes(scenes):
+    """Return the scenes that are ready for video generation"""
+    return [s for s in scenes if is_scene_ready(s)]
+
+
+def _scene_flags(scene):
+    status = scene.get('status')
+    return (
+        1 if is_scene_ready(scene) else 0,
+        1 if status in SUBMITTED_STATUSES else 0,
+        1 if status == DONE_STATUS else 0
+    )
+
+
+def count_scenes(scenes):
+    """Count total/ready/submitted/done scenes with a full scan"""
+    counts = {'total': len(scenes), 'ready': 0, 'submitted': 0, 'done': 0}
+    for scene in scenes:
+        ready, submitted, done = _scene_flags(scene)
+        counts['ready'] += ready
+        counts['submitted'] += submitted
+        counts['done'] += done
+    return counts
+
+
+def rebuild_scene_counts(script_data):
+    """Recompute a script's scene counts, e.g. after an import"""
+    script_data['scene_counts'] = count_scenes(script_data.get('scenes', []))
+    return script_data['scene_counts']
+
+
+def scene_counts(script_data):
+    """Return a script's scene counts, building them once if missing"""
+    counts = script_data.get('scene_counts')
+    if counts is None:
+        counts = rebuild_scene_counts(script_data)
+    return counts
+
+
+def set_scenes(script_data, scenes):
+    """Replace a script's scenes and reset its counts"""
+    script_data['scenes'] = scenes
+    return rebuild_scene_counts(script_data)
+
+
+def update_scene(script_data, index, **changes):
+    """Apply field changes to one scene and adjust the script's counts"""
+    counts = scene_counts(script_data)
+    scene = script_data['scenes'][index]
+    before = _scene_flags(scene)
+    scene.update(changes)
+    after = _scene_flags(scene)
+    counts['ready'] += after[0] - before[0]
+    counts['submitted'] += after[1] - before[1]
+    counts['done'] += after[2] - before[2]
+    return scene
+
+
+def total_counts(scripts):
+    """Sum scene counts across scripts"""
+    totals = {'total': 0, 'ready': 0, 'submitted': 0, 'done': 0}
+    for script_data in scripts.values():
+        for key, value in scene_counts(script_data).items():
+            totals[key] += value
+    return totals
+
+
+def find_ready_projects(scripts):
+    """Collect every script that has at least one ready scene"""
+    projects = []
+    for script_title, script_data in scripts.items():
+        counts = scene_counts(script_data)
+        if counts['ready']:
+            projects.append({
+                'title': script_title,
+                'total_scenes': counts['total'],
+                'ready_scenes': counts['ready'],
+                'submitted_scenes': counts['submitted'],
+                'done_scenes': counts['done']
+            })
+    return projects
+
+
+def scene_index(script_data, scene_number):
+    """Return the list index of a scene by its number, or None"""
+    scenes = script_data.get('scenes', [])
+    guess = scene_number - 1
+    if 0 <= guess < len(scenes) and scenes[guess].get('scene_number') == scene_number:
+        return guess
+    for i, scene in enumerate(scenes):
+        if scene.get('scene_number') == scene_number:
+            return i
+    return None
@@ -0,0 +1,212 @@
+"""Bulk import of scripts from a directory or zip of text files
+
+Every ``.txt`` or ``.md`` file becomes one script titled after its file name,
+or after a leading ``# Heading`` in Markdown. Reading, decoding and splitting
+each file into scenes happen together in one worker call, so a file is only
+touched once. Large imports are spread over a process pool.
+
+Run ``python -m studio.script_import <directory|zip> [--overwrite]`` to
+import a folder on the server without going through the browser. The web UI
+only imports server folders below ``IMPORT_ROOT``.
+"""
+import os
+import re
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from studio import perf
+from studio.scenes import generate_scenes, rebuild_scene_counts
+from studio.storage import DATA_DIR, update_json
+
+SCRIPT_EXTENSIONS = ('.txt', '.md')
+# Larger files are almost certainly not a short's script
+MAX_SCRIPT_BYTES = 1024 * 1024
+TOO_LARGE = "file is too large to be a script"
+# Server folders the web UI may import from; set STUDIO_IMPORT_ROOT to move it
+IMPORT_ROOT = os.environ.get('STUDIO_IMPORT_ROOT') or os.path.join(DATA_DIR, 'imports')
+POOL_THRESHOLD = 64
+POOL_CHUNK = 32
+
+_HEADING = re.compile(r'#+\s+(.+)')
+
+
+class ScriptImportError(ValueError):
+    """Raised when an import source can't be read at all"""
+
+
+def decode(raw):
+    """Text of a script file: UTF-8 (with or without BOM), else Windows-1252"""
+    try:
+        return raw.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return raw.decode('cp1252', errors='replace')
+
+
+def parse_script(name, text):
+    """Return (title, content) for a file's text"""
+    title = os.path.splitext(os.path.basename(name))[0].strip()
+    lines = text.strip().splitlines()
+    if name.lower().endswith('.md') and lines:
+        heading = _HEADING.fullmatch(lines[0].strip())
+        if heading:
+            title = heading.group(1).strip()
+            lines = lines[1:]
+    return title, '\n'.join(lines).strip()
+
+
+def _parse(job):
+    """Pool worker: read, decode and segment one file, returning (name, title, script data, error)"""
+    name, path, raw = job
+    try:
+        if raw is None:
+            if os.path.getsize(path) > MAX_SCRIPT_BYTES:
+                return name, None, None, TOO_LARGE
+            with open(path, 'rb') as f:
+                raw = f.read()
+        title, content = parse_script(name, decode(raw))
+    except OSError as e:
+        return name, None, None, str(e)
+    if not title or not content:
+        return name, None, None, "file is empty"
+    script_data = {'content': content, 'created': datetime.now().isoformat(), 'scenes': generate_scenes(content)}
+    rebuild_scene_counts(script_data)
+    return name, title, script_data, None
+
+
+def resolve_import_folder(folder, root=None):
+    """Real path of a folder (or zip) given relative to the import root
+
+    Raises ScriptImportError for anything that resolves outside the root,
+    including through ``..`` or symlinks.
+    """
+    root = os.path.realpath(root or IMPORT_ROOT)
+    path = os.path.realpath(os.path.join(root, folder))
+    if os.path.commonpath([root, path]) != root:
+        raise ScriptImportError(f"only folders inside {root} can be imported")
+    return path
+
+
+def is_script_file(name):
+    base = os.path.basename(name)
+    return not base.startswith('.') and base.lower().endswith(SCRIPT_EXTENSIONS)
+
+
+def collect_jobs(source):
+    """Worker jobs for a directory path, a zip (path or binary file), or (name, bytes) pairs
+
+    Returns ``(jobs, rejected)``; rejected holds ``(name, error)`` for files
+    over ``MAX_SCRIPT_BYTES`` and zip members that couldn't be read.
+    """
+    if isinstance(source, (list, tuple)):
+        jobs = []
+        rejected = []
+        for name, raw in source:
+            if not is_script_file(name):
+                continue
+            if len(raw) > MAX_SCRIPT_BYTES:
+                rejected.append((name, TOO_LARGE))
+            else:
+                jobs.append((name, None, raw))
+        return jobs, rejected
+    if isinstance(source, str) and os.path.isdir(source):
+        jobs = []
+        real_source = os.path.realpath(source)
+        for root, dirs, files in os.walk(source):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for file_name in sorted(files):
+                path = os.path.join(root, file_name)
+                # A symlink must not pull in a file from outside the folder
+                if is_script_file(file_name) \
+                        and os.path.commonpath([real_source, os.path.realpath(path)]) == real_source:
+                    jobs.append((os.path.relpath(path, source), path, None))
+        return jobs, []
+    if not zipfile.is_zipfile(source):
+        raise ScriptImportError("expected a directory or a zip file of .txt/.md scripts")
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    jobs = []
+    rejected = []
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not is_script_file(info.filename) or '__MACOSX/' in info.filename:
+                continue
+            if info.file_size > MAX_SCRIPT_BYTES:
+                rejected.append((info.filename, TOO_LARGE))
+                continue
+            try:
+                jobs.append((info.filename, None, archive.read(info)))
+            except (zipfile.BadZipFile, OSError) as e:
+                rejected.append((info.filename, str(e)))
+    return jobs, rejected
+
+
+@perf.instrument('scripts.parse')
+def parse_sources(source, max_workers=None):
+    """Read and segment every script file in source, returning (name, title, script data, error) per file"""
+    jobs, rejected = collect_jobs(source)
+    if len(jobs) >= POOL_THRESHOLD and max_workers != 1 and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_parse, jobs, chunksize=POOL_CHUNK))
+    else:
+        results = [_parse(job) for job in jobs]
+    return results + [(name, None, None, error) for name, error in rejected]
+
+
+def add_scripts(results, scripts, overwrite=False):
+    """Add parsed scripts to scripts, returning an import summary
+
+    A title that is already taken is skipped unless ``overwrite`` is set; a
+    replaced script loses its scene assignments.
+    """
+    summary = {'imported': 0, 'replaced': 0, 'skipped': 0, 'scenes': 0, 'errors': []}
+    seen = set()
+    for name, title, script_data, error in results:
+        if error is None and title in seen:
+            error = f"another file in this import is also titled '{title}'"
+        elif error is None and title in scripts and not overwrite:
+            error = f"'{title}' already exists"
+        if error:
+            summary['skipped'] += 1
+            if len(summary['errors']) < 20:
+                summary['errors'].append(f"{name}: {error}")
+            continue
+        seen.add(title)
+        summary['replaced' if title in scripts else 'imported'] += 1
+        summary['scenes'] += len(script_data['scenes'])
+        scripts[title] = script_data
+    return summary
+
+
+def import_scripts(source, scripts, overwrite=False, max_workers=None):
+    """Parse every script file in source and add it to scripts, returning an import summary"""
+    return add_scripts(parse_sources(source, max_workers), scripts, overwrite)
+
+
+def main(argv):
+    usage = "usage: python -m studio.script_import <directory|zip> [--overwrite]"
+    if not argv or argv[0].startswith('--'):
+        print(usage)
+        return 2
+    try:
+        results = parse_sources(argv[0])
+    except ScriptImportError as e:
+        print(e)
+        return 1
+    summary = {}
+
+    def add(scripts):
+        summary.update(add_scripts(results, scripts, overwrite='--overwrite' in argv[1:]))
+
+    # Files are parsed before taking the store lock, so sessions aren't held up
+    update_json('scripts.json', add, {}, DATA_DIR)
+    print(f"Imported {summary['imported']} scripts ({summary['scenes']} scenes), "
+          f"replaced {summary['replaced']}, skipped {summary['skipped']}")
+    for error in summary['errors']:
+        print(f"  {error}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
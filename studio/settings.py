@@ -0,0 +1,81 @@
+"""Provider API keys, and migration between the apps' two settings formats
+
+Keys live in ``api_keys.json`` as one entry per provider::
+
+    {"runwayml": "...", "kling": "", "pika": "", "luma": ""}
+
+The RunwayML-only app used to keep a single ``{"api_key": "..."}`` in
+``settings.json`` instead, so a data directory shared by both apps held the
+RunwayML key twice. ``migrate_settings`` folds the legacy file into
+``api_keys.json`` once; a key already in ``api_keys.json`` wins over the
+legacy one.
+"""
+import os
+
+from studio.storage import DATA_DIR, data_path, load_json, store_lock, update_json
+
+API_KEYS_FILE = 'api_keys.json'
+LEGACY_SETTINGS_FILE = 'settings.json'
+PLATFORMS = ('runwayml', 'kling', 'pika', 'luma')
+
+
+def empty_api_keys():
+    return {platform: '' for platform in PLATFORMS}
+
+
+def from_legacy(settings):
+    """API keys held by a legacy ``{'api_key': ...}`` settings dict"""
+    api_key = (settings or {}).get('api_key')
+    return {'runwayml': api_key} if api_key else {}
+
+
+def to_legacy(api_keys):
+    """The legacy settings dict for a set of API keys"""
+    return {'api_key': (api_keys or {}).get('runwayml', '')}
+
+
+def keys_from_export(data):
+    """API keys in a single-document JSON export from either app"""
+    if isinstance(data.get('api_keys'), dict):
+        return {key: value for key, value in data['api_keys'].items() if value}
+    return from_legacy(data.get('settings'))
+
+
+def merge_keys(api_keys, incoming):
+    """Copy keys from incoming into api_keys where api_keys has none; returns whether any were added"""
+    added = False
+    for platform, key in incoming.items():
+        if key and not api_keys.get(platform):
+            api_keys[platform] = key
+            added = True
+    return added
+
+
+def migrate_settings(data_dir=DATA_DIR):
+    """Move a legacy ``settings.json`` key into ``api_keys.json``
+
+    Other settings in the legacy file are left where they are; the file is
+    removed once nothing is left in it. Returns whether anything was migrated.
+    """
+    if 'api_key' not in (load_json(LEGACY_SETTINGS_FILE, None, data_dir) or {}):
+        return False
+    migrated = []
+
+    def migrate(legacy):
+        if not isinstance(legacy, dict) or 'api_key' not in legacy:
+            return None
+
+        def merge(api_keys):
+            api_keys = {**empty_api_keys(), **api_keys}
+            merge_keys(api_keys, from_legacy(legacy))
+            return api_keys
+
+        update_json(API_KEYS_FILE, merge, {}, data_dir)
+        migrated.append(True)
+        return {key: value for key, value in legacy.items() if key != 'api_key'}
+
+    if update_json(LEGACY_SETTINGS_FILE, migrate, None, data_dir) == {}:
+        with store_lock(LEGACY_SETTINGS_FILE, data_dir):
+            if load_json(LEGACY_SETTINGS_FILE, None, data_dir) == {}:
+                os.remove(data_path(LEGACY_SETTINGS_FILE, data_dir))
+    return bool(migrated)
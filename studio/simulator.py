@@ -0,0 +1,330 @@
+"""An offline stand-in for the video providers' task APIs
+
+``SimulatorServer`` serves a RunwayML-compatible task API for each platform
+under ``/<platform>/v1`` - submit (``POST /image_to_video``), status
+(``GET /tasks/<id>``) and cancel (``DELETE /tasks/<id>``) - with each
+platform's ``PROFILES`` deciding how it behaves:
+
+* request latency and render time are drawn from log-normal distributions,
+* a share of submissions fail with HTTP 500 and a share of renders end
+  FAILED, some of them for content moderation,
+* submissions past the per-minute or in-flight limit for an API key get a
+  429 with Retry-After, and
+* finished tasks link to a tiny MP4 served from ``/files/``.
+
+Time runs on a ``Clock`` that can go faster than real time, so hours of
+rendering pass in seconds; give the same clock's ``now`` to the code under
+test. ``install`` points ``studio.providers`` at a running server.
+
+Run ``python -m studio.simulator [--port 8750] [--speed 1]`` to serve it on
+its own and start the RunwayML app with
+``RUNWAY_API_URL=http://127.0.0.1:8750/runwayml/v1`` to use the UI offline.
+"""
+import argparse
+import contextlib
+import json
+import math
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from studio import prompts, providers, timing
+from studio.animatic import ffmpeg_exe
+
+PLATFORMS = ('runwayml', 'kling', 'pika', 'luma')
+# Medians and log-normal sigmas; latency in seconds, limits per API key
+PROFILES = {
+    'runwayml': {'latency': (0.25, 0.5), 'render': (timing.RENDER_SECONDS['runwayml'], 0.35),
+                 'error_rate': 0.02, 'failure_rate': 0.03, 'per_minute': 20, 'in_flight': 8},
+    'kling': {'latency': (0.6, 0.6), 'render': (timing.RENDER_SECONDS['kling'], 0.5),
+              'error_rate': 0.04, 'failure_rate': 0.05, 'per_minute': 12, 'in_flight': 6},
+    'pika': {'latency': (0.3, 0.5), 'render': (timing.RENDER_SECONDS['pika'], 0.4),
+             'error_rate': 0.03, 'failure_rate': 0.04, 'per_minute': 15, 'in_flight': 6},
+    'luma': {'latency': (0.4, 0.5), 'render': (timing.RENDER_SECONDS['luma'], 0.45),
+             'error_rate': 0.03, 'failure_rate': 0.04, 'per_minute': 15, 'in_flight': 6},
+}
+# Share of failed renders reported as a moderation failure rather than an internal one
+MODERATION_SHARE = 0.3
+# A task shows PENDING for this share of its render time, then RUNNING
+PENDING_SHARE = 0.1
+RATE_WINDOW = 60
+
+_TASK_PATH = re.compile(r'/(\w+)/v1/tasks/([\w-]+)')
+_SUBMIT_PATH = re.compile(r'/(\w+)/v1/image_to_video')
+_FILE_PATH = re.compile(r'/files/([\w-]+)\.mp4')
+
+
+class Clock:
+    """Simulated time: ``speed`` simulated seconds pass per real second"""
+
+    def __init__(self, speed=1.0, start=None):
+        self.speed = speed
+        self.start = time.time() if start is None else start
+        self._real_start = time.monotonic()
+
+    def now(self):
+        return self.start + (time.monotonic() - self._real_start) * self.speed
+
+    def sleep(self, seconds):
+        """Sleep for simulated seconds"""
+        time.sleep(seconds / self.speed)
+
+
+def lognormal(rng, median, sigma):
+    return median * math.exp(rng.gauss(0, sigma))
+
+
+def tiny_mp4():
+    """A one-second 64x112 MP4, rendered with ffmpeg when it's available"""
+    ffmpeg = ffmpeg_exe()
+    if ffmpeg:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/tiny.mp4"
+            result = subprocess.run([
+                ffmpeg, '-y', '-loglevel', 'error', '-f', 'lavfi', '-i', 'testsrc=size=64x112:rate=12:duration=1',
+                '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p', '-movflags', '+faststart', path
+            ])
+            if result.returncode == 0:
+                with open(path, 'rb') as f:
+                    return f.read()
+    # Just the file-type box: enough for downloads, not for playback
+    return b'\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2'
+
+
+class ProviderSimulator:
+    """Task state and behaviour of the simulated platforms, shared by the server's threads"""
+
+    def __init__(self, clock=None, profiles=None, seed=None):
+        self.clock = clock or Clock()
+        self.profiles = profiles or PROFILES
+        self.rng = random.Random(seed)
+        self.tasks = {}
+        self.submissions = defaultdict(deque)
+        self.active = defaultdict(list)
+        self.counts = defaultdict(int)
+        self.lock = threading.Lock()
+        self.video = tiny_mp4()
+
+    def latency(self, platform):
+        with self.lock:
+            return lognormal(self.rng, *self.profiles[platform]['latency'])
+
+    def _in_flight(self, platform, api_key, now):
+        """Tasks still rendering for a key; the list never grows past the in-flight limit"""
+        active = [
+            task_id for task_id in self.active[platform, api_key]
+            if not self.tasks[task_id]['cancelled'] and self.tasks[task_id]['done_at'] > now
+        ]
+        self.active[platform, api_key] = active
+        return active
+
+    def submit(self, platform, api_key, payload):
+        """Return (HTTP status, body, headers) for a submission"""
+        profile = self.profiles[platform]
+        if not payload.get('promptImage') or not payload.get('promptText'):
+            return 400, {'error': 'promptImage and promptText must be provided'}, {}
+        with self.lock:
+            now = self.clock.now()
+            window = self.submissions[platform, api_key]
+            while window and window[0] <= now - RATE_WINDOW:
+                window.popleft()
+            if len(window) >= profile['per_minute']:
+                self.counts[platform, 'rate_limited'] += 1
+                return 429, {'error': 'Too many requests'}, {'Retry-After': str(math.ceil(window[0] + RATE_WINDOW - now))}
+            active = self._in_flight(platform, api_key, now)
+            if len(active) >= profile['in_flight']:
+                self.counts[platform, 'rate_limited'] += 1
+                return 429, {'error': 'Too many concurrent tasks'}, {'Retry-After': '5'}
+            if self.rng.random() < profile['error_rate']:
+                self.counts[platform, 'errors'] += 1
+                return 500, {'error': 'Internal server error'}, {}
+            window.append(now)
+            task_id = str(uuid.uuid4())
+            failed = self.rng.random() < profile['failure_rate']
+            render = lognormal(self.rng, *profile['render'])
+            self.tasks[task_id] = {
+                'platform': platform, 'api_key': api_key, 'created': now, 'done_at': now + render,
+                'render': render, 'cancelled': False,
+                'failure_code': (('SAFETY.INPUT.IMAGE' if self.rng.random() < MODERATION_SHARE else 'INTERNAL.BAD_OUTPUT')
+                                 if failed else None)
+            }
+            active.append(task_id)
+            self.counts[platform, 'submitted'] += 1
+            if payload.get('negativePrompt'):
+                self.counts[platform, 'negative_prompts'] += 1
+        return 200, {'id': task_id}, {}
+
+    def status(self, platform, task_id, base_url):
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if not task or task['platform'] != platform:
+                return 404, {'error': 'Task not found'}, {}
+            self.counts[platform, 'status_checks'] += 1
+            now = self.clock.now()
+            if task['cancelled']:
+                return 200, {'id': task_id, 'status': 'CANCELLED'}, {}
+            if now < task['created'] + task['render'] * PENDING_SHARE:
+                return 200, {'id': task_id, 'status': 'PENDING'}, {}
+            if now < task['done_at']:
+                progress = (now - task['created']) / task['render']
+                return 200, {'id': task_id, 'status': 'RUNNING', 'progress': round(progress, 2)}, {}
+            if task['failure_code']:
+                return 200, {'id': task_id, 'status': 'FAILED', 'failure': 'Generation failed',
+                             'failureCode': task['failure_code']}, {}
+            return 200, {'id': task_id, 'status': 'SUCCEEDED', 'output': [f"{base_url}/files/{task_id}.mp4"]}, {}
+
+    def cancel(self, platform, task_id):
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if not task or task['platform'] != platform:
+                return 404, {'error': 'Task not found'}, {}
+            task['cancelled'] = True
+            self.counts[platform, 'cancelled'] += 1
+        return 204, None, {}
+
+    def stats(self):
+        """Per-platform counts of submissions (and those with a negative prompt), 429s, 500s, status checks and cancels"""
+        with self.lock:
+            rows = defaultdict(dict)
+            for (platform, kind), count in self.counts.items():
+                rows[platform][kind] = count
+            return dict(rows)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; with Nagle on, keep-alive calls stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None, content_type='application/json'):
+        data = body if isinstance(body, bytes) else (json.dumps(body).encode('utf-8') if body is not None else b'')
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if data:
+            self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _api_key(self):
+        return self.headers.get('Authorization', '').removeprefix('Bearer ')
+
+    def _respond(self, platform, result):
+        simulator = self.server.simulator
+        if platform not in simulator.profiles:
+            return self._send(404, {'error': 'Unknown platform'})
+        if not self._api_key():
+            return self._send(401, {'error': 'Missing API key'})
+        simulator.clock.sleep(simulator.latency(platform))
+        self._send(*result())
+
+    def do_POST(self):
+        match = _SUBMIT_PATH.fullmatch(self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if not match:
+            return self._send(404, {'error': 'Not found'})
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            return self._send(400, {'error': 'Body must be JSON'})
+        platform = match.group(1)
+        self._respond(platform, lambda: self.server.simulator.submit(platform, self._api_key(), payload))
+
+    def do_GET(self):
+        match = _FILE_PATH.fullmatch(self.path)
+        if match:
+            return self._send(200, self.server.simulator.video, content_type='video/mp4')
+        match = _TASK_PATH.fullmatch(self.path)
+        if not match:
+            return self._send(404, {'error': 'Not found'})
+        platform, task_id = match.groups()
+        self._respond(platform, lambda: self.server.simulator.status(platform, task_id, self.server.url))
+
+    def do_DELETE(self):
+        match = _TASK_PATH.fullmatch(self.path)
+        if not match:
+            return self._send(404, {'error': 'Not found'})
+        platform, task_id = match.groups()
+        self._respond(platform, lambda: self.server.simulator.cancel(platform, task_id))
+
+
+class SimulatorServer(ThreadingHTTPServer):
+    """The simulated provider APIs on a local port (0 picks a free one)"""
+
+    daemon_threads = True
+
+    def __init__(self, simulator=None, host='127.0.0.1', port=0):
+        super().__init__((host, port), _Handler)
+        self.simulator = simulator or ProviderSimulator()
+        self.url = f"http://{host}:{self.server_address[1]}"
+        self._thread = None
+
+    def base_url(self, platform):
+        return f"{self.url}/{platform}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='provider-simulator', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class SimulatedProvider(providers.RunwayProvider):
+    """The RunwayML client pointed at one platform's simulated API"""
+
+    def __init__(self, name, base_url):
+        super().__init__(base_url)
+        self.name = name
+        self.label = f"{name} (simulated)"
+        # Platforms whose real API takes a negative prompt get one sent to the simulator too
+        if prompts.TEMPLATES.get(name, {}).get('negative'):
+            self.negative_prompt_field = 'negativePrompt'
+
+
+@contextlib.contextmanager
+def install(server, platforms=PLATFORMS):
+    """Route ``studio.providers`` calls for platforms to the server while the block runs"""
+    saved = dict(providers.PROVIDERS)
+    providers.PROVIDERS.clear()
+    providers.PROVIDERS.update({platform: SimulatedProvider(platform, server.base_url(platform)) for platform in platforms})
+    try:
+        yield server
+    finally:
+        providers.PROVIDERS.clear()
+        providers.PROVIDERS.update(saved)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m studio.simulator', description="Serve simulated provider APIs")
+    parser.add_argument('--port', type=int, default=8750)
+    parser.add_argument('--speed', type=float, default=1.0, help="simulated seconds per real second")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+    server = SimulatorServer(ProviderSimulator(Clock(args.speed), seed=args.seed), port=args.port)
+    for platform in PLATFORMS:
+        print(f"{platform:<9} {server.base_url(platform)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
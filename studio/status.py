@@ -0,0 +1,117 @@
+"""Summary and table rows for the live video status view
+
+The status view refreshes on a timer, so both are built to be cheap when
+little changed: ``StatusTable`` keeps one row per task and rebuilds only the
+rows whose task record changed since the last refresh, and the summary is a
+single pass over the task table. The ETA comes from throughput observed over
+the last hour - tasks finished per second - rather than from provider
+estimates.
+"""
+import time
+from datetime import datetime
+
+from studio import jobs, metering, retry, tasks
+
+# Finished tasks in this window set the throughput used for the ETA
+THROUGHPUT_WINDOW = 3600
+
+SUMMARY_GROUPS = {
+    **{status: 'running' for status in metering.IN_FLIGHT_STATUSES},
+    tasks.QUEUED: 'queued',
+    retry.RETRY_SCHEDULED: 'queued',
+    'SUCCEEDED': 'succeeded',
+    'FAILED': 'failed',
+    retry.DEAD_LETTER: 'failed',
+    jobs.CANCELLED: 'cancelled',
+}
+
+STATUS_LABELS = {
+    'SUCCEEDED': "✅ Complete",
+    'FAILED': "❌ Failed",
+    'PENDING': "🔄 Processing",
+    'RUNNING': "🔄 Processing",
+    tasks.QUEUED: "⏳ Queued",
+    jobs.CANCELLED: "🛑 Cancelled",
+    retry.RETRY_SCHEDULED: "🔁 Retry scheduled",
+    retry.DEAD_LETTER: "☠️ Dead letter",
+}
+
+
+def summarize(video_tasks, now=None):
+    """Counts per summary group, throughput (tasks/hour) and ETA in seconds for what is left"""
+    now = time.time() if now is None else now
+    counts = {'queued': 0, 'running': 0, 'succeeded': 0, 'failed': 0, 'cancelled': 0}
+    finished = []
+    for info in video_tasks.values():
+        group = SUMMARY_GROUPS.get(info.get('status'), 'running')
+        counts[group] += 1
+        finished_at = info.get('finished_at')
+        if finished_at and finished_at > now - THROUGHPUT_WINDOW:
+            finished.append(finished_at)
+
+    remaining = counts['queued'] + counts['running']
+    per_second = None
+    if len(finished) >= 2:
+        span = max(now - min(finished), 1)
+        per_second = len(finished) / span
+    eta = remaining / per_second if per_second and remaining else None
+    return {
+        **counts,
+        'remaining': remaining,
+        'per_hour': round(per_second * 3600, 1) if per_second else None,
+        'eta_seconds': round(eta) if eta is not None else None
+    }
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "—"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m {seconds:02d}s"
+
+
+def task_row(task_id, task_info, queue_position=None):
+    next_retry = task_info.get('next_retry_at') if task_info.get('status') == retry.RETRY_SCHEDULED else None
+    status = task_info.get('status', 'unknown')
+    label = STATUS_LABELS.get(status, f"⚠️ {status}")
+    if status == tasks.QUEUED and queue_position:
+        label = f"{label} #{queue_position}"
+    return {
+        'task_id': task_id,
+        'script': task_info.get('script_title'),
+        'scene': task_info.get('scene_number'),
+        'platform': task_info.get('next_platform', task_info.get('platform')),
+        'status': label,
+        'attempts': task_info.get('attempts', 0),
+        'next_retry': datetime.fromtimestamp(next_retry) if next_retry else None,
+        'detail': task_info.get('last_error') or task_info.get('failure') or ''
+    }
+
+
+class StatusTable:
+    """Status rows kept in step with the task table by diffing task records"""
+
+    def __init__(self):
+        self._fingerprints = {}
+        self._rows = {}
+
+    def update(self, video_tasks, scripts):
+        """Bring the rows up to date, returning the ids of tasks whose row changed"""
+        positions = {task_id: i + 1 for i, task_id in enumerate(jobs.queue_order(video_tasks, scripts))}
+        changed = set()
+        for task_id, info in video_tasks.items():
+            # repr is several times cheaper than json.dumps; a reordered dict only costs a row rebuild
+            fingerprint = (repr(info), positions.get(task_id))
+            if self._fingerprints.get(task_id) != fingerprint:
+                self._fingerprints[task_id] = fingerprint
+                self._rows[task_id] = task_row(task_id, info, positions.get(task_id))
+                changed.add(task_id)
+        for task_id in set(self._rows) - set(video_tasks):
+            del self._rows[task_id]
+            del self._fingerprints[task_id]
+            changed.add(task_id)
+        return changed
+
+    def rows(self):
+        return list(self._rows.values())
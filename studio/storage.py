@@ -0,0 +1,309 @@
+"""JSON persistence for the studio data directory
+
+Store files are only ever replaced atomically (write to a temp file, then
+``os.replace``) while holding a per-store lock, so readers never see a
+truncated file and concurrent writers - Streamlit sessions, other server
+processes, background workers - take turns.
+
+Each store's version is its file signature. ``SyncedStore`` keeps one
+session's view of a dict-shaped store: it only re-reads the file when the
+version changed, only writes when the session actually changed something,
+and on a version conflict merges the session's changes into what is on disk
+instead of overwriting other sessions' work. The merge is three-way against
+the last version the session saw and goes down into nested dicts and
+same-length lists, so two sessions editing different scenes of one script
+both keep their edits. A field both sides changed is a conflict: the
+session saving last wins and ``take_conflicts()`` lists the field.
+"""
+import contextlib
+import json
+import os
+import tempfile
+import threading
+
+from studio import perf
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DATA_DIR = 'horror_shorts_data'
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+class VersionConflict(Exception):
+    """Raised when a store changed on disk since the caller last read it"""
+
+
+def data_path(name, data_dir=DATA_DIR):
+    """Return the path of a store file inside the data directory"""
+    return os.path.join(data_dir, name)
+
+
+def _thread_lock(path):
+    with _thread_locks_guard:
+        lock = _thread_locks.get(path)
+        if lock is None:
+            lock = _thread_locks[path] = threading.RLock()
+        return lock
+
+
+@contextlib.contextmanager
+def store_lock(name, data_dir=DATA_DIR):
+    """Hold the exclusive lock for one store across threads and processes"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = data_path(name, data_dir)
+    with _thread_lock(path):
+        with open(path + '.lock', 'a+') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _version(stat):
+    return f"{stat.st_mtime_ns}:{stat.st_size}:{stat.st_ino}"
+
+
+def store_version(name, data_dir=DATA_DIR):
+    """Return a token that changes whenever the store file is replaced, or None"""
+    try:
+        return _version(os.stat(data_path(name, data_dir)))
+    except FileNotFoundError:
+        return None
+
+
+def temp_path(path, suffix='.tmp'):
+    """Create an empty, uniquely named file next to path and return its name
+
+    Write there and ``os.replace`` it onto path, so concurrent writers -
+    other processes or other sessions' threads - never share a temp file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.',
+                                    suffix=suffix)
+    os.close(fd)
+    return tmp_path
+
+
+def _atomic_write(path, data):
+    return _atomic_write_text(path, json.dumps(data))
+
+
+def _atomic_write_text(path, text):
+    """Replace path with text, returning the version of the file written"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+            version = _version(os.fstat(f.fileno()))
+        os.replace(tmp_path, path)
+        return version
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+
+
+# Versions come from the open file, so they always match what was read even
+# if another writer replaces the store in between
+def _read(name, default, data_dir):
+    path = data_path(name, data_dir)
+    try:
+        with open(path, 'r') as f:
+            return json.load(f), _version(os.fstat(f.fileno()))
+    except FileNotFoundError:
+        return default, None
+
+
+def _read_text(name, data_dir):
+    """(file text, version), or (None, None) when the store doesn't exist"""
+    try:
+        with open(data_path(name, data_dir), 'r') as f:
+            return f.read(), _version(os.fstat(f.fileno()))
+    except FileNotFoundError:
+        return None, None
+
+
+@perf.instrument('storage.save')
+def save_json(name, data, data_dir=DATA_DIR, expected_version=None):
+    """Atomically write one store file and return its new version
+
+    When expected_version is given the write only happens if the store is
+    still at that version; otherwise VersionConflict is raised.
+    """
+    with store_lock(name, data_dir):
+        if expected_version is not None and store_version(name, data_dir) != expected_version:
+            raise VersionConflict(name)
+        return _atomic_write(data_path(name, data_dir), data)
+
+
+@perf.instrument('storage.load')
+def load_json(name, default=None, data_dir=DATA_DIR):
+    """Read one store file, returning default when it does not exist"""
+    return _read(name, default, data_dir)[0]
+
+
+def update_json(name, mutate, default=None, data_dir=DATA_DIR):
+    """Read-modify-write a store under its lock, e.g. from a background worker
+
+    ``mutate`` receives the current data and may change it in place or
+    return a replacement.
+    """
+    with store_lock(name, data_dir):
+        data, _ = _read(name, default, data_dir)
+        result = mutate(data)
+        if result is not None:
+            data = result
+        _atomic_write(data_path(name, data_dir), data)
+        return data
+
+
+_MISSING = object()
+
+
+def _merge_values(base, ours, theirs, path=(), conflicts=None):
+    """Three-way merge of JSON values; ``_MISSING`` stands for an absent key
+
+    A side that left a value as it was in ``base`` takes the other side's.
+    Dicts are merged key by key and lists of the same length item by item;
+    anything else changed on both sides keeps ``ours`` and its path is
+    appended to ``conflicts``.
+    """
+    if ours == theirs or theirs == base:
+        return ours
+    if ours == base:
+        return theirs
+    if isinstance(base, dict) and isinstance(ours, dict) and isinstance(theirs, dict):
+        merged = {}
+        for key in list(theirs) + [key for key in ours if key not in theirs]:
+            value = _merge_values(base.get(key, _MISSING), ours.get(key, _MISSING), theirs.get(key, _MISSING),
+                                 path + (key,), conflicts)
+            if value is not _MISSING:
+                merged[key] = value
+        return merged
+    if isinstance(base, list) and isinstance(ours, list) and isinstance(theirs, list) \
+            and len(base) == len(ours) == len(theirs):
+        return [_merge_values(b, o, t, path + (i,), conflicts) for i, (b, o, t) in enumerate(zip(base, ours, theirs))]
+    if conflicts is not None:
+        conflicts.append(path)
+    return ours
+
+
+class SyncedStore:
+    """One session's synchronized view of a dict-shaped store file
+
+    ``derived`` maps entry fields computed from the rest of the entry to the
+    function that recomputes them in place, e.g. a script's
+    ``{'scene_counts': rebuild_scene_counts}``. Merges leave those fields
+    out and recompute them afterwards.
+    """
+
+    def __init__(self, name, data_dir=DATA_DIR, derived=None):
+        self.name = name
+        self.data_dir = data_dir
+        self.derived = derived or {}
+        self.version = None
+        # Private copy of the store as this session last read or wrote it
+        self._base = {}
+        self.conflicts = []
+
+    def _changes(self, data, keys=None):
+        """(changed keys, removed keys) against the base; ``keys`` limits which existing entries are compared"""
+        added = data.keys() - self._base.keys()
+        removed = self._base.keys() - data.keys()
+        candidates = data.keys() & self._base.keys() if keys is None else set(keys) & data.keys() & self._base.keys()
+        changed = added | {key for key in candidates if data[key] != self._base[key]}
+        return changed, removed
+
+    def _strip_derived(self, value):
+        if not self.derived or not isinstance(value, dict):
+            return value
+        return {field: item for field, item in value.items() if field not in self.derived}
+
+    def _merge_entry(self, key, ours, theirs):
+        values = [self._strip_derived(value) for value in (self._base.get(key, _MISSING), ours, theirs)]
+        merged = _merge_values(*values, (key,), self.conflicts)
+        if self.derived and isinstance(merged, dict):
+            for rebuild in self.derived.values():
+                rebuild(merged)
+        return merged
+
+    def _merge(self, disk, data, changed, removed):
+        merged = dict(disk)
+        for key in changed:
+            value = self._merge_entry(key, data[key], disk.get(key, _MISSING))
+            if value is _MISSING:
+                merged.pop(key, None)
+            else:
+                merged[key] = value
+        for key in removed:
+            # Deleting an entry another session has since changed keeps their version
+            if key in disk and disk[key] != self._base.get(key):
+                self.conflicts.append((key,))
+            else:
+                merged.pop(key, None)
+        return merged
+
+    def _rebase(self, text):
+        self._base = json.loads(text) if text else {}
+
+    @perf.instrument('storage.pull')
+    def pull(self, data):
+        """Return the store's latest contents, keeping this session's unsaved edits
+
+        Costs a single stat call when nothing changed on disk.
+        """
+        version = store_version(self.name, self.data_dir)
+        if version is None or version == self.version:
+            return data
+        text, version = _read_text(self.name, self.data_dir)
+        disk = json.loads(text) if text else {}
+        changed, removed = self._changes(data) if self.version is not None else (set(), set())
+        if changed or removed:
+            disk = self._merge(disk, data, changed, removed)
+        self.version = version
+        self._rebase(text)
+        return disk
+
+    @perf.instrument('storage.push')
+    def push(self, data, keys=None):
+        """Write this session's changes, merging with newer data on disk
+
+        ``keys`` names the entries the caller changed, so only those are
+        compared with the base; added and removed entries are always found.
+        Returns the data the session should keep, which includes other
+        sessions' updates when a merge happened.
+        """
+        changed, removed = self._changes(data, keys)
+        if not changed and not removed and self.version is not None:
+            return data
+        with store_lock(self.name, self.data_dir):
+            version = store_version(self.name, self.data_dir)
+            if version is not None and version != self.version:
+                disk, _ = _read(self.name, {}, self.data_dir)
+                data = self._merge(disk, data, changed, removed)
+            text = json.dumps(data)
+            self.version = _atomic_write_text(data_path(self.name, self.data_dir), text)
+        self._rebase(text)
+        return data
+
+    def take_conflicts(self):
+        """Paths of fields where a merge kept this session's value over another's, clearing them"""
+        conflicts, self.conflicts = self.conflicts, []
+        return conflicts
@@ -0,0 +1,285 @@
+"""The video task table: submitting scenes, polling tasks and running retries
+
+``video_tasks`` maps a provider task id to a record of the scene it renders
+(``script_title``, ``scene_number``), the ``platform`` it was sent to, its
+``status`` and retry bookkeeping. A submission that fails before the provider
+hands out an id is kept under a ``local-`` id until its retry goes through.
+"""
+import os
+import time
+import uuid
+
+import requests
+
+from studio import events, images, metering, prompts, retry
+from studio.providers import REQUEST_TIMEOUT, ProviderError, check_task_status, connected_providers, get_provider
+from studio.scenes import DONE_STATUS, scene_index, update_scene
+from studio.storage import DATA_DIR, temp_path
+
+# Waiting in the job queue for admission; see studio.jobs
+QUEUED = 'QUEUED'
+VIDEOS_DIR = 'videos'
+DOWNLOAD_CHUNK = 1024 * 1024
+# Finished, or not at the provider yet: nothing to ask the provider about
+NOT_POLLED_STATUSES = ('SUCCEEDED', 'CANCELLED', retry.DEAD_LETTER, retry.RETRY_SCHEDULED, QUEUED)
+# How long a task held back by a project budget waits before it is checked again
+BUDGET_RECHECK = 3600
+
+
+def start_image_path(scene, characters):
+    """Prefer the scene's keyframe, falling back to the character's reference image"""
+    keyframe = scene.get('keyframe_path')
+    if keyframe and os.path.exists(keyframe):
+        return keyframe
+    return characters.get(scene.get('assigned_character'), {}).get('image_path')
+
+
+def scene_prompt(scene, characters, platform):
+    """The compiled (prompt, negative prompt) for a scene on a platform"""
+    compiled = prompts.compile_prompt(scene, characters.get(scene.get('assigned_character')), platform)
+    return compiled['prompt'], compiled['negative_prompt']
+
+
+def set_scene_status(scripts, task_info, status):
+    """Mirror a task's progress onto its scene so the scene counts stay right
+
+    Of a scene's A/B variants (see studio.variants), only the winner moves
+    the scene once one is picked. Before that any variant can mark it
+    submitted or done, but one failing or being cancelled only fails the
+    scene once every other variant has too.
+    """
+    script = scripts.get(task_info.get('script_title'))
+    if not script:
+        return
+    index = scene_index(script, task_info.get('scene_number'))
+    if index is None:
+        return
+    scene = script['scenes'][index]
+    variant = task_info.get('variant')
+    if variant and scene.get('winner') is not None and scene['winner'] != variant:
+        return
+    if variant and scene.get('winner') is None:
+        ended = {}
+        for spec in scene.get('variants', []):
+            if spec['variant'] == variant:
+                spec['ended'] = status in ('failed', 'cancelled')
+            ended[spec['variant']] = spec.get('ended', False)
+        if status in ('failed', 'cancelled') and not all(ended.values()):
+            return
+        if status == 'submitted' and scene.get('status') == DONE_STATUS:
+            return
+    if scene.get('status') != status:
+        update_scene(script, index, status=status)
+
+
+def _defer(video_tasks, previous, script_title, scene, platform, reason, retry_at):
+    """Put a scene that admission control held back (back) in the job queue, without counting an attempt"""
+    task_info = dict(previous or {})
+    task_info.update({
+        'script_title': script_title,
+        'scene_number': scene['scene_number'],
+        'platform': task_info.get('platform', platform),
+        'attempts': task_info.get('attempts', 0),
+        'status': QUEUED,
+        'next_platform': platform,
+        'not_before': retry_at,
+        'last_error': reason
+    })
+    task_info.setdefault('enqueued_at', time.time())
+    task_info.pop('next_retry_at', None)
+    task_id = f"local-{uuid.uuid4().hex}"
+    video_tasks[task_id] = task_info
+    return task_id
+
+
+def submit_scene(video_tasks, scripts, script_title, scene, characters, platform, api_keys,
+                 http=requests, previous=None, now=None, meter=None, log=None):
+    """Submit one scene and add its task to video_tasks, returning the task id
+
+    ``previous`` is the record of an earlier attempt, whose retry history is
+    carried over. Submission errors are classified and turned into a
+    scheduled retry or a dead letter rather than raised. With a ``meter``,
+    the submission is admitted against budgets and rate limits first: a
+    rate-limited scene goes to the job queue, and metering.BudgetExceeded is
+    raised with nothing submitted. Any other failure after admission, such
+    as a malformed response or an unreadable start image, refunds the
+    reservation and is retried like a transient error. With a ``log`` (an
+    events.EventLog), the outcome is recorded there.
+    """
+    now = time.time() if now is None else now
+    # A timing plan may have picked the scene's clip length; otherwise the provider default
+    seconds = scene.get('clip_seconds') or metering.estimate(platform)[0]
+    reservation = None
+    if meter is not None:
+        try:
+            reservation = meter.reserve(platform, script_title, video_tasks, seconds=seconds, now=now)
+        except metering.RateLimited as e:
+            task_id = _defer(video_tasks, previous, script_title, scene, platform, str(e), e.retry_at)
+            set_scene_status(scripts, video_tasks[task_id], 'submitted')
+            if log:
+                log.record('deferred', now, **events.task_fields(task_id, video_tasks[task_id]), reason=str(e))
+            return task_id
+
+    task_info = dict(previous or {})
+    same_platform = bool(previous) and previous.get('platform') == platform
+    task_info.update({
+        'script_title': script_title,
+        'scene_number': scene['scene_number'],
+        'character': scene.get('assigned_character'),
+        'platform': platform,
+        'submitted_at': now,
+        'attempts': task_info.get('attempts', 0) + 1 if same_platform else 1
+    })
+    for key in ('next_retry_at', 'next_platform', 'not_before', 'video_url', 'failure', 'failure_code'):
+        task_info.pop(key, None)
+    tried = task_info.setdefault('platforms_tried', [])
+    if platform not in tried:
+        tried.append(platform)
+    if reservation:
+        task_info['clip_seconds'], task_info['estimated_cost'] = reservation
+
+    image_path = start_image_path(scene, characters)
+    try:
+        if not image_path or not os.path.exists(image_path):
+            raise ProviderError("scene has no start image", status_code=400)
+        image_data_uri = images.image_data_uri(image_path)
+        prompt, negative_prompt = scene_prompt(scene, characters, platform)
+        task_id = get_provider(platform).submit(image_data_uri, prompt, api_keys[platform], http, duration=seconds,
+                                                 seed=task_info.get('seed'), negative_prompt=negative_prompt)
+    except Exception as e:
+        if reservation:
+            meter.refund(platform, script_title, *reservation, now=now)
+            task_info.pop('estimated_cost', None)
+        task_id = f"local-{uuid.uuid4().hex}"
+        message = str(e) if isinstance(e, ProviderError) else f"{type(e).__name__}: {e}"
+        status = retry.handle_failure(
+            task_info, retry.classify(error=e), message, connected_providers(api_keys),
+            getattr(e, 'retry_after', None), now
+        )
+        set_scene_status(scripts, task_info, 'failed' if status == retry.DEAD_LETTER else 'submitted')
+        if log:
+            log.record('submit_failed', now, **events.task_fields(task_id, task_info),
+                       attempt=task_info['attempts'], error=message, outcome=status)
+    else:
+        task_info['status'] = 'PENDING'
+        task_info.pop('last_error', None)
+        set_scene_status(scripts, task_info, 'submitted')
+        if log:
+            log.record('submitted', now, **events.task_fields(task_id, task_info),
+                       attempt=task_info['attempts'], cost=task_info.get('estimated_cost'))
+
+    video_tasks[task_id] = task_info
+    return task_id
+
+
+def poll_tasks(video_tasks, scripts, api_keys, http=requests, now=None, log=None):
+    """Refresh every in-flight task; FAILED tasks are handed to the retry policy
+
+    Returns (task_id, message) pairs for status checks that could not be
+    made - those tasks are simply checked again next time. With a ``log``,
+    status changes and failed checks are recorded in one write.
+    """
+    errors = []
+    logged = []
+    for task_id, task_info in list(video_tasks.items()):
+        if task_info.get('status') in NOT_POLLED_STATUSES or task_id.startswith('local-'):
+            continue
+        platform = task_info.get('platform', 'runwayml')
+        previous = task_info.get('status')
+        try:
+            status = check_task_status(task_id, task_info, api_keys.get(platform, ''), http)
+        except ProviderError as e:
+            task_info['last_error'] = str(e)
+            errors.append((task_id, str(e)))
+            logged.append(('poll_error', {**events.task_fields(task_id, task_info), 'error': str(e)}))
+            continue
+
+        transition = {**events.task_fields(task_id, task_info), 'from': previous, 'to': status}
+        if status != previous:
+            logged.append(('status', transition))
+        if status == 'SUCCEEDED':
+            task_info['finished_at'] = time.time() if now is None else now
+            set_scene_status(scripts, task_info, 'done')
+            if task_info.get('submitted_at'):
+                transition['duration'] = round(task_info['finished_at'] - task_info['submitted_at'], 1)
+        elif status == 'FAILED':
+            failure_class = retry.classify(failure=task_info.get('failure'), failure_code=task_info.get('failure_code'))
+            message = task_info.get('failure') or task_info.get('failure_code') or 'Task failed'
+            status = retry.handle_failure(task_info, failure_class, message, connected_providers(api_keys), now=now)
+            transition.update(error=message, outcome=status)
+            if status == retry.DEAD_LETTER:
+                set_scene_status(scripts, task_info, 'failed')
+    if log:
+        log.record_many(logged, now)
+    return errors
+
+
+def run_due_retries(video_tasks, scripts, characters, api_keys, http=requests, now=None, meter=None, log=None):
+    """Resubmit every task whose retry is due, returning how many the providers accepted
+
+    Tasks held back by a budget stay scheduled until the budget allows them.
+    """
+    now = time.time() if now is None else now
+    resubmitted = 0
+    for task_id, task_info in list(video_tasks.items()):
+        if not retry.is_due(task_info, now):
+            continue
+        script = scripts.get(task_info.get('script_title'))
+        index = scene_index(script, task_info.get('scene_number')) if script else None
+        platform = task_info.get('next_platform', task_info.get('platform'))
+        if index is None or not api_keys.get(platform):
+            task_info['status'] = retry.DEAD_LETTER
+            task_info['last_error'] = "scene was deleted" if index is None else f"{platform} is no longer connected"
+            continue
+        del video_tasks[task_id]
+        try:
+            new_id = submit_scene(video_tasks, scripts, task_info['script_title'], script['scenes'][index], characters,
+                                  platform, api_keys, http, previous=task_info, now=now, meter=meter, log=log)
+        except metering.BudgetExceeded as e:
+            task_info['next_retry_at'] = e.retry_at or now + BUDGET_RECHECK
+            task_info['last_error'] = str(e)
+            video_tasks[task_id] = task_info
+            continue
+        except Exception:
+            # Keep the retry scheduled rather than losing it with the error
+            video_tasks[task_id] = task_info
+            raise
+        # Failing again only schedules the next retry or dead-letters the task
+        if video_tasks[new_id]['status'] in metering.IN_FLIGHT_STATUSES:
+            resubmitted += 1
+    return resubmitted
+
+
+def requeue(task_info, now=None):
+    """Send a dead-lettered task back for an immediate, fresh retry"""
+    task_info.update({
+        'status': retry.RETRY_SCHEDULED,
+        'next_retry_at': time.time() if now is None else now,
+        'next_platform': task_info.get('platform', 'runwayml'),
+        'attempts': 0,
+        'platforms_tried': []
+    })
+
+
+def download_video(task_id, task_info, http=requests, data_dir=DATA_DIR, log=None):
+    """Stream a finished task's video to ``videos/`` and record the path on the task"""
+    path = os.path.join(data_dir, VIDEOS_DIR, f"{task_id}.mp4")
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = temp_path(path)
+        started = time.time()
+        try:
+            response = http.get(task_info['video_url'], stream=True, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK):
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if log:
+            log.record('downloaded', **events.task_fields(task_id, task_info),
+                       bytes=os.path.getsize(path), duration=round(time.time() - started, 2))
+    task_info['video_path'] = path
+    return path
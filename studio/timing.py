@@ -0,0 +1,186 @@
+"""Scene timing: fitting a script's scenes to provider clip lengths and a runtime target
+
+A scene's narration takes about ``WORDS_PER_SECOND`` to read, or exactly its
+``tts_seconds`` once a voice-over has been rendered. Each scene needs a clip
+at least that long, and providers only render a few fixed clip lengths, so a
+short line still costs a whole clip. The planner walks the scenes once:
+
+* a scene too long for the longest clip is split into equal parts, using
+  whichever clip length needs the least footage, and
+* a short scene joins the clip before it when it has the same character and
+  still fits in that clip's length, saving a clip and its runtime.
+
+The short's runtime is the sum of its clip lengths. The plan reports that
+against the target (60 seconds for Shorts), plus the estimated cost from
+``studio.metering`` and the wall-clock time to render it within the
+provider's rate and in-flight limits. ``apply_plan`` rewrites the scenes to
+match.
+"""
+import math
+
+from studio import metering
+from studio.scenes import DONE_STATUS, SUBMITTED_STATUSES, set_scenes
+
+WORDS_PER_SECOND = 2.5
+# Beat between one line and the next
+SCENE_PAUSE = 0.4
+TARGET_SECONDS = 60
+
+# Clip lengths each provider renders, shortest first
+CLIP_LENGTHS = {
+    'runwayml': (5, 10),
+    'kling': (5, 10),
+    'pika': (5, 10),
+    'luma': (5, 9),
+}
+DEFAULT_CLIP_LENGTHS = (5,)
+
+# Typical seconds from submission to a finished clip, used until the event log has real figures
+RENDER_SECONDS = {'runwayml': 90, 'kling': 240, 'pika': 120, 'luma': 150}
+DEFAULT_RENDER_SECONDS = 180
+
+
+class PlanError(ValueError):
+    """Raised when a plan can't be applied to a script"""
+
+
+def narration_seconds(scene):
+    """How long a scene's narration runs, from its rendered voice-over if there is one"""
+    if scene.get('tts_seconds'):
+        return float(scene['tts_seconds'])
+    return len(scene.get('narration', '').split()) / WORDS_PER_SECOND + SCENE_PAUSE
+
+
+def clip_length(seconds, lengths):
+    """The shortest clip length that covers seconds, or the longest there is"""
+    for length in lengths:
+        if length >= seconds:
+            return length
+    return lengths[-1]
+
+
+def split_length(seconds, lengths):
+    """(parts, clip length) covering seconds with the least footage, then the fewest parts"""
+    return min(((math.ceil(seconds / length), length) for length in lengths),
+               key=lambda option: (option[0] * option[1], option[0]))
+
+
+def wall_clock(clip_count, platform, render_seconds=None):
+    """Seconds to render clip_count clips, paced by the provider's in-flight and per-minute limits"""
+    if not clip_count:
+        return 0
+    limits = metering.LIMITS.get(platform, metering.DEFAULT_LIMITS)
+    render_seconds = render_seconds or RENDER_SECONDS.get(platform, DEFAULT_RENDER_SECONDS)
+    by_slots = math.ceil(clip_count / limits['in_flight']) * render_seconds
+    by_rate = (clip_count - 1) * 60 / limits['per_minute'] + render_seconds
+    return round(max(by_slots, by_rate))
+
+
+def _locked(scene):
+    return scene.get('status') in SUBMITTED_STATUSES + (DONE_STATUS,)
+
+
+def plan_scenes(scenes, platform='runwayml', target=TARGET_SECONDS, render_seconds=None):
+    """Plan clips for a script's scenes in one pass
+
+    Each clip is ``{'scenes': [scene numbers], 'narration', 'clip_seconds',
+    'part', 'parts'}``; a split scene has one clip per part. Scenes already
+    submitted or done are never merged or split.
+    """
+    lengths = CLIP_LENGTHS.get(platform, DEFAULT_CLIP_LENGTHS)
+    longest = lengths[-1]
+    clips = []
+    narration = 0.0
+    # The clip the next scene may join, with the character it shows
+    last = None
+    for scene in scenes:
+        seconds = narration_seconds(scene)
+        narration += seconds
+        character = scene.get('assigned_character')
+        if _locked(scene):
+            clips.append({
+                'scenes': [scene['scene_number']], 'narration': seconds,
+                'clip_seconds': scene.get('clip_seconds') or clip_length(seconds, lengths), 'part': 1, 'parts': 1
+            })
+            last = None
+        elif seconds > longest:
+            parts, length = split_length(seconds, lengths)
+            for part in range(1, parts + 1):
+                clips.append({
+                    'scenes': [scene['scene_number']], 'narration': seconds / parts,
+                    'clip_seconds': length, 'part': part, 'parts': parts
+                })
+            last = None
+        elif last is not None and last[1] == character and last[0]['narration'] + seconds <= last[0]['clip_seconds']:
+            last[0]['scenes'].append(scene['scene_number'])
+            last[0]['narration'] += seconds
+        else:
+            clip = {
+                'scenes': [scene['scene_number']], 'narration': seconds,
+                'clip_seconds': clip_length(seconds, lengths), 'part': 1, 'parts': 1
+            }
+            clips.append(clip)
+            last = (clip, character)
+
+    runtime = 0
+    cost = 0.0
+    for clip in clips:
+        clip['narration'] = round(clip['narration'], 1)
+        runtime += clip['clip_seconds']
+        cost += metering.estimate(platform, clip['clip_seconds'])[1]
+    return {
+        'platform': platform,
+        'clips': clips,
+        'scene_count': len(scenes),
+        'clip_count': len(clips),
+        'narration_seconds': round(narration, 1),
+        'runtime_seconds': runtime,
+        'target_seconds': target,
+        'over_by': max(0, runtime - target) if target else 0,
+        'cost': round(cost, 2),
+        'wall_seconds': wall_clock(len(clips), platform, render_seconds)
+    }
+
+
+def changes(plan):
+    """Whether applying the plan would merge or split any scene"""
+    return plan['clip_count'] != plan['scene_count'] or any(clip['parts'] > 1 for clip in plan['clips'])
+
+
+def _split_words(text, parts):
+    words = text.split()
+    size = math.ceil(len(words) / parts) if words else 0
+    return [' '.join(words[i * size:(i + 1) * size]) for i in range(parts)]
+
+
+def apply_plan(script_data, plan):
+    """Rewrite a script's scenes to the plan's clips, numbering them afresh
+
+    A merged scene keeps its first scene's character and joins the narration
+    and visual descriptions; split parts share the original's fields. Every
+    scene gets the plan's ``clip_seconds``, which submissions then ask for.
+    """
+    scenes = script_data.get('scenes', [])
+    if any(_locked(scene) for scene in scenes):
+        raise PlanError("scenes have already been sent for generation; cancel them first")
+    by_number = {scene['scene_number']: scene for scene in scenes}
+    planned = []
+    for clip in plan['clips']:
+        sources = [by_number[number] for number in clip['scenes']]
+        scene = dict(sources[0])
+        if clip['parts'] > 1:
+            scene['narration'] = _split_words(sources[0]['narration'], clip['parts'])[clip['part'] - 1]
+            scene.pop('tts_seconds', None)
+        elif len(sources) > 1:
+            scene['narration'] = ' '.join(source['narration'] for source in sources)
+            descriptions = [source.get('visual_description') for source in sources if source.get('visual_description')]
+            scene['visual_description'] = '; '.join(dict.fromkeys(descriptions))
+            scene.pop('tts_seconds', None)
+        if clip['parts'] > 1 or len(sources) > 1:
+            # The keyframe was composed for the old scene
+            scene.pop('keyframe_path', None)
+        scene['scene_number'] = len(planned) + 1
+        scene['clip_seconds'] = clip['clip_seconds']
+        planned.append(scene)
+    set_scenes(script_data, planned)
+    return planned
@@ -0,0 +1,6 @@
+"""Streamlit pages shared by the studio apps
+
+``app.py`` and ``horror_app.py`` are thin entry points that pick their pages
+from ``studio.ui.pages``; session state, persistence and shared widgets live
+in ``studio.ui.common``. Nothing outside this package imports Streamlit.
+"""
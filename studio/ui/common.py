@@ -0,0 +1,383 @@
+"""Session state, persistence and widgets shared by every page"""
+import os
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from studio import animatic, backup, blobs, events, keyframes, media_cache, perf, phash, prompts, timing
+from studio.library import CharacterIndex, ScriptIndex
+from studio.metering import DEFAULT_BUDGETS
+from studio.scenes import rebuild_scene_counts
+from studio.settings import API_KEYS_FILE, empty_api_keys, migrate_settings
+from studio.status import format_eta
+from studio.storage import SyncedStore
+
+# Custom CSS for professional look
+CSS = """
+<style>
+    .main > div {
+        padding-top: 2rem;
+    }
+    .stApp {
+        background: linear-gradient(135deg, #0a0a0a, #1a1a1a);
+    }
+    .stButton > button {
+        background: linear-gradient(135deg, #ff4444, #8b5cf6);
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 0.5rem 1rem;
+        font-weight: 600;
+        transition: all 0.3s ease;
+    }
+    .stButton > button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 8px 25px rgba(255, 68, 68, 0.4);
+    }
+    .platform-card {
+        background: rgba(255, 255, 255, 0.05);
+        padding: 1.5rem;
+        border-radius: 12px;
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        margin-bottom: 1rem;
+    }
+    .character-card {
+        background: rgba(255, 255, 255, 0.05);
+        padding: 1rem;
+        border-radius: 12px;
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        margin-bottom: 1rem;
+    }
+    .scene-card {
+        background: rgba(139, 92, 246, 0.1);
+        padding: 1rem;
+        border-radius: 8px;
+        border-left: 4px solid #8b5cf6;
+        margin-bottom: 1rem;
+    }
+    .header-title {
+        font-size: 2.5rem;
+        background: linear-gradient(135deg, #ff4444, #8b5cf6);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+</style>
+"""
+
+# Session state key -> store file; both apps share one data directory layout
+STORES = {
+    'characters': 'characters.json',
+    'scripts': 'scripts.json',
+    'api_keys': API_KEYS_FILE,
+    'video_tasks': 'video_tasks.json',
+    'budgets': 'budgets.json'
+}
+
+# Backups larger than this are left on the server rather than read into memory for a download button
+BROWSER_DOWNLOAD_LIMIT = 256 * 1024 * 1024
+
+PLATFORM_KEYS = {
+    "RunwayML": 'runwayml',
+    "Kling AI": 'kling',
+    "Pika Labs": 'pika',
+    "Luma AI": 'luma'
+}
+
+CHARACTERS_PER_PAGE = 12
+CHARACTER_GRID_COLUMNS = 3
+SCRIPTS_PER_PAGE = 20
+# How long observed render times from the event log are reused
+RENDER_STATS_TTL = 300
+
+# Shared by every session; activity and task events outlive the session
+EVENT_LOG = events.EventLog()
+
+
+def init_session():
+    """Initialize session state"""
+    defaults = {
+        'characters': dict,
+        'scripts': dict,
+        'api_keys': empty_api_keys,
+        'video_tasks': dict,
+        'budgets': lambda: dict(DEFAULT_BUDGETS)
+    }
+    for key, default in defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = default()
+    if 'stores' not in st.session_state:
+        st.session_state.stores = {
+            key: SyncedStore(name, derived={'scene_counts': rebuild_scene_counts} if key == 'scripts' else None)
+            for key, name in STORES.items()
+        }
+
+
+def add_activity(message):
+    """Add activity to the activity log"""
+    EVENT_LOG.record('activity', message=message)
+
+
+def recent_activity(limit=5):
+    """The latest activity log entries, newest first, as {'time', 'message'}"""
+    return [
+        {'time': datetime.fromtimestamp(event['ts']).strftime('%H:%M:%S'), 'message': event['message']}
+        for event in EVENT_LOG.query(kinds=('activity',), limit=limit)
+    ]
+
+
+def log_slow_operation(name, ms):
+    """Record slow instrumented operations in the activity log"""
+    add_activity(f"🐢 Slow operation: {name} took {ms:.0f} ms")
+
+
+def warn_conflicts(store):
+    """Tell the user which of their edits overwrote another session's"""
+    conflicts = store.take_conflicts()
+    if conflicts:
+        fields = ', '.join(' › '.join(str(part) for part in path) for path in conflicts[:5])
+        more = f" and {len(conflicts) - 5} more" if len(conflicts) > 5 else ""
+        st.warning(f"⚠️ Another session changed the same {store.name} fields; your edits were kept: {fields}{more}")
+
+
+def save_data(*keys, entries=None):
+    """Save data to local JSON files
+
+    Widget callbacks pass the stores they changed so a fragment rerun only
+    writes those, and ``entries`` (e.g. a script title) when they know which
+    entries of those stores they edited so only those are compared.
+    """
+    try:
+        # Only changed stores are written; other sessions' updates are merged in
+        for key, store in st.session_state.stores.items():
+            if not keys or key in keys:
+                st.session_state[key] = store.push(st.session_state[key], entries)
+                warn_conflicts(store)
+    except Exception as e:
+        st.error(f"Error saving data: {e}")
+
+
+def load_data(*keys):
+    """Load data from local JSON files, or just the given stores"""
+    try:
+        # Stores are only re-read when another session or process changed them
+        for key, store in st.session_state.stores.items():
+            if not keys or key in keys:
+                st.session_state[key] = store.pull(st.session_state[key])
+                warn_conflicts(store)
+    except Exception:
+        st.write("Note: Loading fresh data (no previous save found)")
+
+
+def start(page_title):
+    """Configure the page and load the session's data; call first in an app"""
+    st.set_page_config(
+        page_title=page_title,
+        page_icon="🎬",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(CSS, unsafe_allow_html=True)
+    perf.set_slow_handler(log_slow_operation)
+    init_session()
+
+    # Fold a legacy settings.json into api_keys.json before the first load
+    if 'settings_migrated' not in st.session_state:
+        migrate_settings()
+        st.session_state.settings_migrated = True
+
+    # Load data on startup
+    load_data()
+
+    # Evict cached media over the quota or age limits in the background, whichever app is running
+    media_cache.ensure_sweeping()
+
+    # Move images saved under name-derived paths into the blob store once per session
+    if 'images_migrated' not in st.session_state:
+        if blobs.migrate_legacy_images(st.session_state.characters):
+            save_data()
+            blobs.reconcile()
+        st.session_state.images_migrated = True
+
+
+def sidebar_header(title, tagline):
+    st.sidebar.markdown(f"""
+<div style="text-align: center; padding: 1rem;">
+    <h1 style="color: #ff4444;">{title}</h1>
+    <p style="color: #8b5cf6;">{tagline}</p>
+</div>
+""", unsafe_allow_html=True)
+
+
+def run(pages, footer):
+    """Show the navigation, render the chosen page, then save
+
+    ``pages`` maps page names to render functions.
+    """
+    page = st.sidebar.selectbox("Navigate", list(pages))
+
+    render_timer = perf.start(f"page.render:{page}")
+    pages[page]()
+
+    # Footer
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("🎵 **Electronic Dance Horror House**")
+    st.sidebar.markdown(footer)
+
+    # Auto-save data
+    save_data()
+    perf.stop(render_timer)
+
+
+def character_index():
+    """Return the search index for the current characters, rebuilding it when they change"""
+    version = st.session_state.stores['characters'].version
+    index = st.session_state.get('character_index')
+    if index is None or version is None or index.version != version:
+        index = CharacterIndex(st.session_state.characters, version)
+        st.session_state.character_index = index
+    return index
+
+
+def script_index():
+    """Return the search index for the current scripts, re-indexing only scripts that changed"""
+    version = st.session_state.stores['scripts'].version
+    index = st.session_state.setdefault('script_index', ScriptIndex())
+    if version is None or index.version != version:
+        index.update(st.session_state.scripts, version)
+    return index
+
+
+def image_hash_index():
+    """Return the near-duplicate index over reference images, hashing any that predate it"""
+    version = st.session_state.stores['characters'].version
+    index = st.session_state.get('image_hash_index')
+    if index is None or version is None or index.version != version:
+        characters = st.session_state.characters
+        missing = [
+            name for name, data in characters.items()
+            if 'image_hash' not in data and data.get('image_path') and os.path.exists(data['image_path'])
+        ]
+        for name, image_hash in zip(missing, phash.dhash_batch([characters[name]['image_path'] for name in missing])):
+            characters[name]['image_hash'] = image_hash
+        hashes = {name: data['image_hash'] for name, data in characters.items() if data.get('image_hash')}
+        index = phash.HashIndex(hashes, version)
+        st.session_state.image_hash_index = index
+    return index
+
+
+def reset_character_page():
+    """Go back to the first page when the search changes"""
+    st.session_state.char_page = 1
+
+
+def show_prompt_preview(title, platform):
+    """Compile and show the prompts a project's ready scenes would be sent with"""
+    st.subheader("Prompt Preview")
+    prompt_rows = prompts.compile_script_prompts(st.session_state.scripts[title], st.session_state.characters, platform)
+    st.dataframe(
+        prompt_rows,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'scene_number': st.column_config.NumberColumn("Scene", width="small"),
+            'character': "Character",
+            'prompt': st.column_config.TextColumn("Prompt", width="large"),
+            'negative_prompt': "Negative prompt",
+            'length': st.column_config.NumberColumn("Chars", width="small"),
+            'warnings': "Warnings"
+        }
+    )
+    flagged = sum(1 for row in prompt_rows if row['warnings'])
+    if flagged:
+        st.warning(f"⚠️ {flagged} prompts have warnings")
+
+
+def prepare_keyframes(title):
+    """Compose keyframes for a project's ready scenes and report what was done"""
+    with st.spinner("Composing scene keyframes..."):
+        summary = keyframes.prepare_script_keyframes(st.session_state.scripts[title], st.session_state.characters)
+    save_data()
+    add_activity(f"Prepared keyframes for: {title}")
+    st.success(f"🖼️ {summary['rendered']} rendered, {summary['cached']} reused from cache")
+    if summary['skipped']:
+        st.warning(f"⚠️ {summary['skipped']} scenes skipped: their character has no reference image")
+
+
+def observed_render_seconds():
+    """Median render seconds per platform over the last week, from the event log"""
+    cached = st.session_state.get('render_seconds')
+    if cached is None or time.time() - cached[0] > RENDER_STATS_TTL:
+        _, rows = EVENT_LOG.stats(window=7 * 86400)
+        cached = (time.time(), {row['platform']: row['p50_seconds'] for row in rows if row['p50_seconds']})
+        st.session_state.render_seconds = cached
+    return cached[1]
+
+
+def show_timing_estimate(title, platform):
+    """One line of predicted runtime, cost and render time for a project, before it is submitted"""
+    plan = timing.plan_scenes(
+        st.session_state.scripts[title]['scenes'], platform, render_seconds=observed_render_seconds().get(platform)
+    )
+    estimate = (
+        f"⏱️ ~{plan['runtime_seconds']}s in {plan['clip_count']} clips · ~${plan['cost']:.2f} · "
+        f"~{format_eta(plan['wall_seconds'])} to render"
+    )
+    if plan['over_by']:
+        st.warning(f"{estimate} - {plan['over_by']}s over the {plan['target_seconds']}s target; "
+                   "see the timing plan in the Scene Builder")
+    else:
+        st.caption(estimate)
+
+
+def show_animatic(title):
+    """Start or show the low-res animatic preview of a project"""
+    jobs_by_title = st.session_state.setdefault('animatic_jobs', {})
+    if st.button("🎞️ Render Animatic", key=f"animatic_{title}", help="A quick local preview from keyframes or reference images"):
+        jobs_by_title[title] = animatic.start_render(st.session_state.scripts[title], st.session_state.characters)
+
+    future = jobs_by_title.get(title)
+    if future is None:
+        return
+    if not future.done():
+        st.info("🎞️ Rendering animatic in the background...")
+        st.button("🔄 Refresh", key=f"animatic_refresh_{title}")
+        return
+    try:
+        path = future.result()
+    except animatic.AnimaticError as e:
+        st.warning(f"⚠️ Couldn't render the animatic: {e}")
+        return
+    # Recorded so the media cache keeps an active project's animatic
+    if st.session_state.scripts[title].get('animatic') != path:
+        st.session_state.scripts[title]['animatic'] = path
+        save_data('scripts', entries=(title,))
+    if path.endswith('.mp4'):
+        st.video(path)
+    else:
+        st.image(path, caption="Install ffmpeg for an MP4 animatic")
+
+
+def offer_backup_download(path, label):
+    """Show a download button for a backup file written on the server
+
+    Streamlit serves downloads from memory, so the button holds the whole
+    file; above BROWSER_DOWNLOAD_LIMIT the backup is left on the server with
+    a pointer to the shell command instead.
+    """
+    size = os.path.getsize(path)
+    if size > BROWSER_DOWNLOAD_LIMIT:
+        st.info(f"📦 This backup is {size / (1024 * 1024):.0f} MB, too large to download through the browser. "
+                "Copy it from the server, or make backups from a shell with `python -m studio.backup export <path>`.")
+    else:
+        with open(path, 'rb') as f:
+            st.download_button(
+                label,
+                f.read(),
+                os.path.basename(path),
+                "application/zip" if path.endswith('.zip') else "application/x-ndjson",
+                use_container_width=True
+            )
+    st.caption(f"Saved on the server at `{path}` (the newest {backup.BACKUPS_KEPT} of each kind are kept)")
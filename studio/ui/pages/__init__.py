@@ -0,0 +1 @@
+"""One module per page, or per app for pages only one app shows"""
@@ -0,0 +1,140 @@
+"""Character Database page"""
+import os
+from datetime import datetime
+
+import streamlit as st
+from PIL import Image
+
+from studio import images, perf, phash
+from studio.library import paginate, parse_tags
+from studio.ui.common import (
+    CHARACTER_GRID_COLUMNS, CHARACTERS_PER_PAGE, add_activity, character_index, image_hash_index,
+    reset_character_page, save_data
+)
+
+
+def set_character_page(page_number):
+    st.session_state.char_page = page_number
+
+
+@st.fragment
+def character_library(char_count):
+    """Search, tag filter and grid; searching and paging rerun only this fragment"""
+    index = character_index()
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        query = st.text_input(
+            "🔍 Search",
+            placeholder="Search names and descriptions",
+            key="char_search",
+            on_change=reset_character_page
+        )
+    with col2:
+        tag_filter = st.multiselect("Tags", index.all_tags(), key="char_tag_filter", on_change=reset_character_page)
+    
+    matches = index.search(query, tag_filter)
+    page_items, page_number, page_count = paginate(matches, st.session_state.get('char_page', 1), CHARACTERS_PER_PAGE)
+    st.caption(f"{len(matches)} of {char_count} characters")
+    
+    # Only the current page's thumbnails are loaded
+    for i in range(0, len(page_items), CHARACTER_GRID_COLUMNS):
+        cols = st.columns(CHARACTER_GRID_COLUMNS)
+        for j, col in enumerate(cols):
+            if i + j < len(page_items):
+                char_name = page_items[i + j]
+                char_data = st.session_state.characters[char_name]
+                with col:
+                    with st.container():
+                        st.markdown('<div class="character-card">', unsafe_allow_html=True)
+                        
+                        if 'image_path' in char_data and os.path.exists(char_data['image_path']):
+                            with perf.timed('image.render'):
+                                st.image(images.thumbnail_path(char_data['image_path']), width=200)
+                        else:
+                            st.write("📷 No image uploaded")
+                        
+                        st.subheader(char_name)
+                        st.write(char_data['description'])
+                        if char_data.get('tags'):
+                            st.caption(" · ".join(char_data['tags']))
+                        
+                        if st.button(f"🗑️ Delete {char_name}", key=f"del_{char_name}"):
+                            if char_data.get('image_path'):
+                                images.release_reference_image(char_data['image_path'])
+                            del st.session_state.characters[char_name]
+                            save_data('characters')
+                            add_activity(f"Deleted character: {char_name}")
+                            # The character count and the scene builder's options change too
+                            st.rerun()
+                        
+                        st.markdown('</div>', unsafe_allow_html=True)
+    
+    if page_count > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("◀ Previous", disabled=page_number <= 1, key="char_prev",
+                      on_click=set_character_page, args=(page_number - 1,))
+        with col2:
+            st.write(f"Page {page_number} of {page_count}")
+        with col3:
+            st.button("Next ▶", disabled=page_number >= page_count, key="char_next",
+                      on_click=set_character_page, args=(page_number + 1,))
+
+
+def render():
+    """Character Database"""
+    st.title("Character Database")
+    
+    char_count = len(st.session_state.characters)
+    st.subheader(f"Your Characters ({char_count})")
+    
+    # Add new character section
+    with st.expander("➕ Add New Character", expanded=(char_count == 0)):
+        with st.form("add_character_form"):
+            char_name = st.text_input("Character Name", placeholder="Enter character name")
+            char_description = st.text_area("Description", placeholder="Describe your character's appearance, personality, etc.", height=100)
+            char_tags = st.text_input("Tags", placeholder="Comma separated, e.g. villain, series 2")
+            char_image = st.file_uploader("Reference Image", type=['png', 'jpg', 'jpeg'], help="Upload a reference image for your character")
+            allow_duplicate = st.checkbox("Save even if the image matches an existing character")
+            
+            submitted = st.form_submit_button("Save Character", use_container_width=True)
+            
+            if submitted:
+                duplicates = []
+                if char_name and char_description and char_image:
+                    reference_image = Image.open(char_image)
+                    image_hash = phash.dhash(reference_image)
+                    duplicates = image_hash_index().matches(image_hash)
+                
+                if not char_name or not char_description:
+                    st.error("Please fill in character name and description")
+                elif char_name in st.session_state.characters:
+                    st.error("Character name already exists")
+                elif duplicates and not allow_duplicate:
+                    matched = ", ".join(name for name, _ in duplicates)
+                    st.warning(f"⚠️ This image looks like the reference for: {matched}. Tick the box above to save it anyway.")
+                else:
+                    character_data = {
+                        'name': char_name,
+                        'description': char_description,
+                        'tags': parse_tags(char_tags),
+                        'created': datetime.now().isoformat()
+                    }
+                    
+                    if char_image:
+                        character_data['image_path'] = images.save_reference_image(reference_image)
+                        character_data['image_hash'] = image_hash
+                    
+                    st.session_state.characters[char_name] = character_data
+                    save_data()
+                    add_activity(f"Added character: {char_name}")
+                    st.success(f"Character '{char_name}' saved successfully!")
+                    st.rerun()
+    
+    # Search, filter and page through the library
+    if st.session_state.characters:
+        character_library(char_count)
+    else:
+        st.info("No characters added yet. Add your first character above!")
+
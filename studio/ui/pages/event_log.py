@@ -0,0 +1,90 @@
+"""Event log page: task history and generation throughput"""
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from studio import events
+from studio.ui.common import EVENT_LOG, PLATFORM_KEYS
+
+STATS_WINDOWS = {"Last hour": 3600, "Last 24 hours": 86400, "Last 7 days": 7 * 86400}
+# Fields shown in their own columns; the rest go in the detail column
+COLUMNS = ('ts', 'kind', 'platform', 'script', 'scene')
+
+
+def event_row(event):
+    return {
+        'time': datetime.fromtimestamp(event['ts']),
+        'kind': event['kind'],
+        'platform': event.get('platform'),
+        'script': event.get('script'),
+        'scene': event.get('scene'),
+        'detail': ", ".join(f"{key}={value}" for key, value in event.items() if key not in COLUMNS)
+    }
+
+
+def render():
+    """Event Log"""
+    st.title("Event Log")
+
+    st.subheader("📈 Throughput")
+    window = st.selectbox("Window", list(STATS_WINDOWS), index=1)
+    per_hour, rows = EVENT_LOG.stats(window=STATS_WINDOWS[window])
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Scenes / hour", per_hour)
+    col2.metric("Submitted", sum(row['submitted'] for row in rows))
+    col3.metric("Finished", sum(row['succeeded'] for row in rows))
+    col4.metric("Failures", sum(row['failed'] for row in rows))
+    if rows:
+        st.dataframe(
+            rows,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'platform': "Platform",
+                'submitted': "Submitted",
+                'succeeded': "Finished",
+                'failed': "Failures",
+                'per_hour': st.column_config.NumberColumn("Scenes / hour"),
+                'p50_seconds': st.column_config.NumberColumn("p50 latency (s)", format="%.0f"),
+                'p95_seconds': st.column_config.NumberColumn("p95 latency (s)", format="%.0f")
+            }
+        )
+        st.caption("Latency runs from submission to the finished video being seen by a status check")
+    else:
+        st.info("No video submissions logged in this window yet")
+
+    st.subheader("🔎 Events")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        kinds = st.multiselect("Kinds", events.KINDS)
+    with col2:
+        platform = st.selectbox("Platform", ["All"] + list(PLATFORM_KEYS.values()))
+    with col3:
+        script = st.selectbox("Project", ["All"] + sorted(st.session_state.scripts))
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        text = st.text_input("Search", placeholder="Task id, error message...")
+    with col2:
+        since = st.selectbox("Since", ["Any time"] + list(STATS_WINDOWS))
+    with col3:
+        limit = st.number_input("Show at most", 10, 5000, 200, step=50)
+
+    matches = EVENT_LOG.query(
+        kinds=kinds,
+        platform=None if platform == "All" else platform,
+        script=None if script == "All" else script,
+        since=None if since == "Any time" else time.time() - STATS_WINDOWS[since],
+        text=text,
+        limit=int(limit)
+    )
+    if matches:
+        st.dataframe(
+            [event_row(event) for event in matches],
+            use_container_width=True,
+            hide_index=True,
+            column_config={'time': st.column_config.DatetimeColumn("Time", format="YYYY-MM-DD HH:mm:ss")}
+        )
+        st.caption(f"{len(matches)} events, newest first · kept in `{EVENT_LOG.path}` and its rotated files")
+    else:
+        st.info("No events match these filters")
@@ -0,0 +1,292 @@
+"""Pages of the multi-platform app"""
+import time
+
+import streamlit as st
+
+from studio import metering
+from studio.scenes import find_ready_projects, is_scene_ready, total_counts
+from studio.ui.common import (
+    PLATFORM_KEYS, add_activity, prepare_keyframes, save_data, show_animatic, show_prompt_preview,
+    show_timing_estimate
+)
+
+
+def platform_status():
+    """Platform status in sidebar"""
+    st.sidebar.markdown("### 🔗 Platform Status")
+    for platform, key in PLATFORM_KEYS.items():
+        status = "🟢 Connected" if st.session_state.api_keys.get(key) else "🔴 Not Connected"
+        st.sidebar.write(f"**{platform}**: {status}")
+
+
+def dashboard():
+    """Dashboard"""
+    st.markdown('<h1 class="header-title">🎬 Multi-Platform Horror Shorts Studio</h1>', unsafe_allow_html=True)
+    
+    # Stats
+    col1, col2, col3, col4, col5 = st.columns(5)
+    usage = metering.load_usage()
+    
+    with col1:
+        st.metric("Characters", len(st.session_state.characters))
+    
+    with col2:
+        st.metric("Scripts", len(st.session_state.scripts))
+    
+    with col3:
+        totals = total_counts(st.session_state.scripts)
+        total_scenes = totals['total']
+        st.metric("Scenes", total_scenes)
+    
+    with col4:
+        connected_platforms = sum(1 for key in st.session_state.api_keys.values() if key)
+        st.metric("Connected Platforms", connected_platforms)
+    
+    with col5:
+        daily_budget = st.session_state.budgets.get('daily_total') or 0
+        st.metric(
+            "Spend Today",
+            f"${metering.spend_today(usage):.2f}",
+            help=f"Estimated from list prices; daily budget ${daily_budget:.2f}" if daily_budget else "Estimated from list prices"
+        )
+    
+    # Per-provider usage, from the shared metering ledger
+    today = metering.usage_for_day(usage)
+    usage_rows = []
+    for platform, key in PLATFORM_KEYS.items():
+        if not st.session_state.api_keys.get(key) and key not in today:
+            continue
+        entry = today.get(key, {})
+        limits = metering.LIMITS.get(key, metering.DEFAULT_LIMITS)
+        budget = st.session_state.budgets.get('daily', {}).get(key) or 0
+        usage_rows.append({
+            'Platform': platform,
+            'Clips today': entry.get('submissions', 0),
+            'Seconds': entry.get('seconds', 0),
+            'Est. spend': f"${entry.get('cost', 0.0):.2f}",
+            'Daily budget': f"${budget:.2f}" if budget else "—",
+            'Rendering': f"{metering.in_flight(st.session_state.video_tasks, key)}/{limits['in_flight']}"
+        })
+    if usage_rows:
+        st.subheader("📊 Provider Usage")
+        st.dataframe(usage_rows, use_container_width=True, hide_index=True)
+    
+    # Platform Overview
+    st.subheader("🚀 Supported Platforms")
+    
+    platform_info = {
+        "RunwayML": {
+            "description": "High-quality realistic videos, excellent character consistency",
+            "best_for": "Professional-grade horror shorts",
+            "speed": "Medium",
+            "quality": "⭐⭐⭐⭐⭐"
+        },
+        "Kling AI": {
+            "description": "Great motion and character fidelity, good for action scenes",
+            "best_for": "Dynamic horror sequences",
+            "speed": "Fast",
+            "quality": "⭐⭐⭐⭐"
+        },
+        "Pika Labs": {
+            "description": "Creative effects and transitions, good for atmospheric scenes",
+            "best_for": "Cinematic horror effects",
+            "speed": "Fast",
+            "quality": "⭐⭐⭐"
+        },
+        "Luma AI": {
+            "description": "Smooth motion and natural movements",
+            "best_for": "Character-focused scenes",
+            "speed": "Medium",
+            "quality": "⭐⭐⭐⭐"
+        }
+    }
+    
+    cols = st.columns(2)
+    for i, (platform, info) in enumerate(platform_info.items()):
+        with cols[i % 2]:
+            with st.container():
+                st.markdown('<div class="platform-card">', unsafe_allow_html=True)
+                is_connected = st.session_state.api_keys.get(platform.lower().replace(' ', '_'), '')
+                status_text = "🟢 Connected" if is_connected else "🔴 Setup Required"
+                
+                st.write(f"**{platform}** - {status_text}")
+                st.write(info['description'])
+                st.write(f"**Best for:** {info['best_for']}")
+                st.write(f"**Speed:** {info['speed']} | **Quality:** {info['quality']}")
+                st.markdown('</div>', unsafe_allow_html=True)
+
+
+def video_generation():
+    """Video Generation"""
+    st.title("Multi-Platform Video Generation")
+    
+    # Check if any API keys are configured
+    connected_platforms = [k for k, v in st.session_state.api_keys.items() if v]
+    
+    if not connected_platforms:
+        st.warning("Please configure at least one API key in API Settings first!")
+    else:
+        # Find ready projects
+        ready_projects = find_ready_projects(st.session_state.scripts)
+        
+        if ready_projects:
+            st.subheader("🎬 Ready for Video Generation")
+            
+            for project in ready_projects:
+                with st.expander(f"📝 {project['title']} ({project['ready_scenes']} scenes ready)"):
+                    
+                    # Platform selection
+                    available_platforms = [
+                        platform for platform, key in PLATFORM_KEYS.items() if st.session_state.api_keys.get(key)
+                    ]
+                    
+                    selected_platform = st.selectbox(
+                        "Choose Video Generation Platform",
+                        available_platforms,
+                        key=f"platform_{project['title']}"
+                    )
+                    show_timing_estimate(project['title'], PLATFORM_KEYS[selected_platform])
+                    
+                    col1, col2, col3 = st.columns(3)
+                    
+                    with col1:
+                        if st.button(f"👀 Preview Prompts", key=f"preview_{project['title']}"):
+                            show_prompt_preview(project['title'], PLATFORM_KEYS[selected_platform])
+                    
+                    with col3:
+                        if st.button(f"🖼️ Prepare Keyframes", key=f"keyframes_{project['title']}"):
+                            prepare_keyframes(project['title'])
+                        
+                        show_animatic(project['title'])
+                    
+                    with col2:
+                        if st.button(f"🎥 Generate Videos ({selected_platform})", key=f"generate_{project['title']}"):
+                            st.info(f"Starting video generation with {selected_platform}...")
+                            
+                            # Simulate video generation (replace with actual API calls)
+                            # Nothing is sent, so nothing is metered and scene status is left alone
+                            project_script = st.session_state.scripts[project['title']]
+                            for scene in project_script['scenes']:
+                                if not is_scene_ready(scene):
+                                    continue
+                                character = st.session_state.characters.get(scene['assigned_character'])
+                                if character and 'image_path' in character:
+                                    start_frame = "keyframe" if scene.get('keyframe_path') else "reference image"
+                                    st.write(f"Generating Scene {scene['scene_number']} with {selected_platform} from {start_frame}...")
+                                    time.sleep(1)  # Simulate processing
+                                    st.success(f"✅ Scene {scene['scene_number']} submitted!")
+                            
+                            st.success(f"🎉 All scenes submitted to {selected_platform}!")
+                            add_activity(f"Generated videos with {selected_platform} for: {project['title']}")
+        else:
+            st.info("No projects ready for generation. Complete scene assignments first in Scene Builder!")
+
+
+def api_settings():
+    """API Settings"""
+    st.title("API Configuration")
+    st.write("Configure your API keys for different video generation platforms:")
+    
+    # RunwayML
+    with st.expander("🎬 RunwayML", expanded=True):
+        st.write("**Best for:** High-quality, realistic videos with excellent character consistency")
+        st.write("**Get API Key:** https://runwayml.com/")
+        
+        runwayml_key = st.text_input(
+            "RunwayML API Key",
+            value=st.session_state.api_keys.get('runwayml', ''),
+            type="password",
+            key="runwayml_input"
+        )
+        
+        if st.button("Save RunwayML Key"):
+            st.session_state.api_keys['runwayml'] = runwayml_key
+            save_data()
+            st.success("RunwayML API key saved!")
+            st.rerun()
+    
+    # Kling AI
+    with st.expander("⚡ Kling AI"):
+        st.write("**Best for:** Dynamic motion and character fidelity")
+        st.write("**Get API Key:** https://klingai.com/")
+        
+        kling_key = st.text_input(
+            "Kling AI API Key",
+            value=st.session_state.api_keys.get('kling', ''),
+            type="password",
+            key="kling_input"
+        )
+        
+        if st.button("Save Kling Key"):
+            st.session_state.api_keys['kling'] = kling_key
+            save_data()
+            st.success("Kling AI API key saved!")
+            st.rerun()
+    
+    # Pika Labs
+    with st.expander("🎨 Pika Labs"):
+        st.write("**Best for:** Creative effects and atmospheric scenes")
+        st.write("**Get API Key:** https://pika.art/")
+        
+        pika_key = st.text_input(
+            "Pika Labs API Key",
+            value=st.session_state.api_keys.get('pika', ''),
+            type="password",
+            key="pika_input"
+        )
+        
+        if st.button("Save Pika Key"):
+            st.session_state.api_keys['pika'] = pika_key
+            save_data()
+            st.success("Pika Labs API key saved!")
+            st.rerun()
+    
+    # Luma AI
+    with st.expander("🌟 Luma AI"):
+        st.write("**Best for:** Smooth motion and natural movements")
+        st.write("**Get API Key:** https://lumalabs.ai/")
+        
+        luma_key = st.text_input(
+            "Luma AI API Key",
+            value=st.session_state.api_keys.get('luma', ''),
+            type="password",
+            key="luma_input"
+        )
+        
+        if st.button("Save Luma Key"):
+            st.session_state.api_keys['luma'] = luma_key
+            save_data()
+            st.success("Luma AI API key saved!")
+            st.rerun()
+    
+    # Budgets
+    with st.expander("💰 Budgets & Rate Limits"):
+        st.write("Spend is estimated from each platform's list price per second of video. Set a limit to 0 for no limit.")
+        budgets = st.session_state.budgets
+        
+        with st.form("budgets_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                daily_total = st.number_input("Daily budget, all platforms ($)", min_value=0.0, step=1.0,
+                                              value=float(budgets.get('daily_total') or 0))
+            with col2:
+                project_budget = st.number_input("Budget per project ($)", min_value=0.0, step=1.0,
+                                                 value=float(budgets.get('project') or 0))
+            
+            daily = {}
+            cols = st.columns(len(PLATFORM_KEYS))
+            for col, (platform, key) in zip(cols, PLATFORM_KEYS.items()):
+                with col:
+                    daily[key] = st.number_input(f"{platform} per day ($)", min_value=0.0, step=1.0,
+                                                 value=float(budgets.get('daily', {}).get(key) or 0))
+            
+            if st.form_submit_button("Save Budgets"):
+                st.session_state.budgets = {'daily_total': daily_total, 'daily': daily, 'project': project_budget}
+                save_data()
+                add_activity("Updated budgets")
+                st.success("Budgets saved!")
+        
+        st.caption("Submissions are paced per platform: " + ", ".join(
+            f"{platform} {metering.LIMITS[key]['per_minute']}/min with {metering.LIMITS[key]['in_flight']} rendering at once"
+            for platform, key in PLATFORM_KEYS.items()
+        ))
@@ -0,0 +1,607 @@
+"""Pages of the RunwayML app"""
+import os
+import time
+from datetime import datetime
+
+import requests
+import streamlit as st
+
+from studio import consistency, export, jobs, metering, poller, retry, status, tasks, variants
+from studio.library import paginate
+from studio.providers import REQUEST_TIMEOUT
+from studio.scenes import DONE_STATUS, SUBMITTED_STATUSES, filter_ready_scenes, find_ready_projects, total_counts
+from studio.ui.common import (
+    EVENT_LOG, add_activity, load_data, prepare_keyframes, recent_activity, save_data, show_animatic,
+    show_prompt_preview, show_timing_estimate
+)
+
+LIVE_REFRESH = 5
+TASKS_PER_PAGE = 20
+
+
+def runway_keys():
+    """This app only sends work to RunwayML"""
+    return {'runwayml': st.session_state.api_keys.get('runwayml', '')}
+
+
+def video_data(task_info):
+    """Download data fetched only when the button is clicked, from the local copy if there is one"""
+    path = task_info.get('video_path')
+    url = task_info['video_url']
+
+    def fetch():
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read()
+        return requests.get(url, timeout=REQUEST_TIMEOUT).content
+    return fetch
+
+
+def file_data(path):
+    """Download data read only when the button is clicked"""
+    def read():
+        with open(path, 'rb') as f:
+            return f.read()
+    return read
+
+
+def bump_task(task_id):
+    jobs.bump(st.session_state.video_tasks[task_id])
+    save_data('video_tasks')
+
+
+def cancel_task(task_id):
+    task_info = st.session_state.video_tasks[task_id]
+    _, errors = jobs.cancel_scene(
+        st.session_state.video_tasks, st.session_state.scripts, task_info['script_title'],
+        task_info['scene_number'], runway_keys()
+    )
+    save_data('video_tasks', 'scripts')
+    st.session_state.status_messages = [f"⚠️ Couldn't cancel: {message}" for _, message in errors]
+
+
+def requeue_task(task_id):
+    tasks.requeue(st.session_state.video_tasks[task_id])
+    save_data('video_tasks')
+
+
+def dismiss_task(task_id):
+    del st.session_state.video_tasks[task_id]
+    save_data('video_tasks')
+
+
+def set_task_page(page_number):
+    st.session_state.task_page = page_number
+
+
+def status_table(table):
+    st.dataframe(
+        table.rows(),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'task_id': None,
+            'script': "Script",
+            'scene': st.column_config.NumberColumn("Scene", width="small"),
+            'platform': "Platform",
+            'status': "Status",
+            'attempts': st.column_config.NumberColumn("Attempts", width="small"),
+            'next_retry': st.column_config.DatetimeColumn("Next retry", format="HH:mm:ss"),
+            'detail': "Detail"
+        }
+    )
+
+
+@st.fragment(run_every=LIVE_REFRESH)
+def live_status(table_slot):
+    """Summary bar and task table, refreshed from the background poller's writes
+
+    The table lives in ``table_slot``, a placeholder outside the fragment, so
+    a refresh in which no task changed leaves it alone instead of sending
+    every row to the browser again.
+    """
+    # A stat call per store when the poller and other sessions changed nothing
+    load_data('video_tasks', 'scripts')
+    table = st.session_state.setdefault('status_table', status.StatusTable())
+    changed = table.update(st.session_state.video_tasks, st.session_state.scripts)
+    summary = status.summarize(st.session_state.video_tasks)
+    
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Queued", summary['queued'])
+    col2.metric("Rendering", summary['running'])
+    col3.metric("Succeeded", summary['succeeded'])
+    col4.metric("Failed", summary['failed'])
+    col5.metric(
+        "ETA",
+        status.format_eta(summary['eta_seconds']),
+        help=f"{summary['per_hour']} videos/hour over the last hour" if summary['per_hour'] else "Not enough finished videos to estimate yet"
+    )
+    done = summary['succeeded'] + summary['failed']
+    total = done + summary['remaining']
+    if total:
+        st.progress(done / total, text=f"{done}/{total} videos finished")
+
+    # A full rerun makes a new, empty placeholder
+    if changed or not st.session_state.get('status_table_drawn'):
+        with table_slot.container():
+            status_table(table)
+        st.session_state.status_table_drawn = True
+    checked = poller.ensure_running()
+    last_poll = f"last checked {datetime.fromtimestamp(checked.last_poll):%H:%M:%S}" if checked.last_poll else "checking..."
+    st.caption(f"📡 Live · {last_poll} · {len(changed)} rows changed since the last refresh")
+    for task_id, message in checked.errors:
+        st.caption(f"⚠️ {task_id[:8]} {message}")
+
+
+@st.fragment
+def video_status(meter):
+    """Status table and dead letters; their buttons rerun only this fragment"""
+    st.subheader("🎬 Video Generation Status")
+    
+    if st.button("🔄 Check All Video Status"):
+        api_keys = runway_keys()
+        with st.spinner("Checking video status..."):
+            # Failed tasks are classified and scheduled for retry or dead-lettered
+            errors = tasks.poll_tasks(
+                st.session_state.video_tasks, st.session_state.scripts, api_keys, log=EVENT_LOG
+            )
+            resubmitted = tasks.run_due_retries(
+                st.session_state.video_tasks, st.session_state.scripts, st.session_state.characters, api_keys,
+                meter=meter, log=EVENT_LOG
+            )
+            dispatched = jobs.dispatch(
+                st.session_state.video_tasks, st.session_state.scripts, st.session_state.characters, api_keys,
+                meter=meter, log=EVENT_LOG
+            )
+        save_data('video_tasks', 'scripts')
+        for task_id, message in errors:
+            st.warning(f"⚠️ Couldn't check task {task_id[:8]}... ({message}); it will be checked again next time")
+        if resubmitted:
+            st.info(f"🔁 Resubmitted {resubmitted} scenes")
+            add_activity(f"Retried {resubmitted} failed scenes")
+        if dispatched:
+            st.info(f"📤 Sent {dispatched} queued scenes")
+    
+    for message in st.session_state.pop('status_messages', []):
+        st.warning(message)
+    
+    # Display video tasks with their status a page at a time; dead letters get their own list
+    queue_position = {task_id: i + 1 for i, task_id in enumerate(
+        jobs.queue_order(st.session_state.video_tasks, st.session_state.scripts)
+    )}
+    listed = [task_id for task_id, info in st.session_state.video_tasks.items() if info.get('status') != retry.DEAD_LETTER]
+    page_items, page_number, page_count = paginate(listed, st.session_state.get('task_page', 1), TASKS_PER_PAGE)
+    for task_id in page_items:
+        task_info = st.session_state.video_tasks[task_id]
+        col1, col2, col3, col4, col5 = st.columns([2, 2, 2, 2, 1])
+        
+        with col1:
+            st.write(f"**Scene {task_info['scene_number']}**")
+            st.write(f"Script: {task_info['script_title']}")
+        
+        with col2:
+            status = task_info.get('status', 'unknown')
+            if status == 'SUCCEEDED':
+                st.success("✅ Complete")
+                if task_info.get('consistency', {}).get('outlier'):
+                    st.caption(f"🧪 Drifts from reference (distance {task_info['consistency']['distance']:.2f})")
+            elif status == 'FAILED':
+                st.error("❌ Failed")
+            elif status in ['PENDING', 'RUNNING']:
+                st.info("🔄 Processing")
+            elif status == tasks.QUEUED:
+                bumped = " ⏫" if task_info.get('priority') == jobs.BUMPED else ""
+                st.info(f"⏳ Queued #{queue_position.get(task_id, '?')}{bumped}")
+            elif status == jobs.CANCELLED:
+                st.warning("🛑 Cancelled")
+            elif status == retry.RETRY_SCHEDULED:
+                wait = max(0, int(task_info.get('next_retry_at', 0) - time.time()))
+                st.info(f"🔁 Retry #{task_info.get('attempts', 1)} on {task_info.get('next_platform')} in {wait}s "
+                        f"({task_info.get('failure_class', 'failure').replace('_', ' ')})")
+            else:
+                st.warning(f"⚠️ {status}")
+        
+        with col3:
+            st.code(f"ID: {task_id[:8]}...")
+        
+        with col4:
+            if task_info.get('video_url'):
+                st.download_button(
+                    "📥 Download",
+                    data=video_data(task_info),
+                    file_name=f"scene_{task_info['scene_number']}.mp4",
+                    mime="video/mp4",
+                    key=f"download_{task_id}",
+                    on_click='ignore'
+                )
+            elif task_info.get('status') == 'SUCCEEDED':
+                # Clicking reruns the fragment, which shows the URL once it is known
+                st.button("🔄 Get URL", key=f"geturl_{task_id}")
+            elif task_info.get('last_error'):
+                st.caption(task_info['last_error'])
+        
+        with col5:
+            if status == tasks.QUEUED and task_info.get('priority') != jobs.BUMPED:
+                st.button("⏫", key=f"bump_{task_id}", help="Send this scene next", on_click=bump_task, args=(task_id,))
+            if status not in jobs.FINISHED_STATUSES:
+                st.button("✖", key=f"cancel_{task_id}", help="Cancel this scene's video",
+                          on_click=cancel_task, args=(task_id,))
+    
+    if page_count > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("◀ Previous", disabled=page_number <= 1, key="task_prev",
+                      on_click=set_task_page, args=(page_number - 1,))
+        with col2:
+            st.write(f"Page {page_number} of {page_count}")
+        with col3:
+            st.button("Next ▶", disabled=page_number >= page_count, key="task_next",
+                      on_click=set_task_page, args=(page_number + 1,))
+    
+    dead = retry.dead_letters(st.session_state.video_tasks)
+    if dead:
+        st.subheader(f"☠️ Dead Letters ({len(dead)})")
+        st.caption("Scenes that failed and won't be retried automatically")
+        for task_id, task_info in dead:
+            col1, col2, col3 = st.columns([4, 1, 1])
+            
+            with col1:
+                st.write(f"**Scene {task_info['scene_number']}** · {task_info['script_title']} · "
+                         f"{task_info.get('failure_class', 'unknown').replace('_', ' ')}")
+                st.caption(task_info.get('last_error', ''))
+            
+            with col2:
+                st.button("🔁 Retry", key=f"requeue_{task_id}", help="Try again on the same platform",
+                          on_click=requeue_task, args=(task_id,))
+            
+            with col3:
+                st.button("🗑️ Dismiss", key=f"dismiss_{task_id}", on_click=dismiss_task, args=(task_id,))
+
+
+def dashboard():
+    """Dashboard"""
+    st.markdown('<h1 class="header-title">🎬 Horror Shorts Studio</h1>', unsafe_allow_html=True)
+    
+    # Stats
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Characters", len(st.session_state.characters), help="Total characters created")
+    
+    with col2:
+        st.metric("Scripts", len(st.session_state.scripts), help="Total scripts added")
+    
+    with col3:
+        totals = total_counts(st.session_state.scripts)
+        total_scenes = totals['total']
+        st.metric("Scenes", total_scenes, help="Total scenes generated")
+    
+    with col4:
+        ready_scenes = totals['ready']
+        st.metric("Ready for Video", ready_scenes, help="Scenes ready for video generation")
+    
+    # Quick Actions
+    st.subheader("Quick Actions")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if st.button("➕ Add Character", use_container_width=True):
+            st.session_state.page = "👥 Characters"
+    
+    with col2:
+        if st.button("📝 New Script", use_container_width=True):
+            st.session_state.page = "📝 Scripts"
+    
+    with col3:
+        if st.button("🎥 Generate Videos", use_container_width=True):
+            st.session_state.page = "🎥 Video Queue"
+    
+    # Recent Activity
+    st.subheader("Recent Activity")
+    activity = recent_activity()
+    if activity:
+        for entry in activity:
+            st.write(f"**{entry['time']}** - {entry['message']}")
+    else:
+        st.info("No recent activity. Start by adding characters or scripts!")
+
+
+def export_projects(titles):
+    """Assemble each project's master, then export them all in every preset; returns error messages"""
+    masters = []
+    errors = []
+    for title in titles:
+        try:
+            master_path = export.project_master(title, st.session_state.scripts[title],
+                                                st.session_state.video_tasks, log=EVENT_LOG)
+        except export.ExportError as e:
+            errors.append(f"{title}: {e}")
+            continue
+        # Recorded so the media cache keeps the master while the project is active
+        st.session_state.scripts[title]['master'] = master_path
+        masters.append((title, master_path))
+    if masters:
+        try:
+            results = export.export_masters([path for _, path in masters])
+        except export.ExportError as e:
+            return errors + [str(e)]
+        exported = 0
+        for (title, _), (paths, error) in zip(masters, results):
+            if error:
+                errors.append(f"{title}: {error}")
+            else:
+                st.session_state.scripts[title]['exports'] = paths
+                exported += 1
+        save_data()
+        add_activity(f"Exported {exported} projects in {len(export.PRESETS)} presets")
+    return errors
+
+
+def assembly(script_title, ready):
+    """Assembly readiness (variants.assembly_status), winner picking for variant scenes, and exports"""
+    script_data = st.session_state.scripts[script_title]
+    has_variants = any(scene.get('variants') for scene in script_data['scenes'])
+    if not ready['clips'] and not has_variants:
+        return
+    waiting = []
+    if ready['pick']:
+        waiting.append(f"a pick for scenes {', '.join(map(str, ready['pick']))}")
+    if ready['rendering']:
+        waiting.append(f"clips for scenes {', '.join(map(str, ready['rendering']))}")
+    st.caption(f"🎞️ {len(ready['clips'])}/{len(script_data['scenes'])} chosen clips ready for assembly"
+               + (f"; waiting on {' and '.join(waiting)}" if waiting else ""))
+    if has_variants:
+        pick_winners(script_title)
+
+    if not waiting and st.button("📦 Export", key=f"export_{script_title}",
+                                 help=f"Assemble the clips and export {', '.join(p['label'] for p in export.PRESETS.values())}"):
+        with st.spinner("Assembling and exporting..."):
+            errors = export_projects([script_title])
+        for error in errors:
+            st.warning(f"⚠️ Couldn't export {error}")
+    exports = {name: path for name, path in script_data.get('exports', {}).items()
+               if name in export.PRESETS and os.path.exists(path)}
+    for col, (name, path) in zip(st.columns(max(1, len(exports))), exports.items()):
+        with col:
+            label = export.PRESETS[name]['label']
+            st.download_button(f"⬇️ {label}", data=file_data(path), file_name=f"{script_title} - {label}.mp4",
+                               mime="video/mp4", key=f"export_{name}_{script_title}", on_click='ignore')
+
+
+def pick_winners(script_title):
+    """Each variant scene's candidates to choose from"""
+    video_tasks = st.session_state.video_tasks
+    script_data = st.session_state.scripts[script_title]
+    if not st.toggle("🏆 Pick winners", key=f"pick_{script_title}"):
+        return
+    by_scene = variants.project_variants(video_tasks, script_title)
+    for scene in script_data['scenes']:
+        candidates = by_scene.get(scene['scene_number'])
+        if not scene.get('variants') or not candidates:
+            continue
+        st.write(f"**Scene {scene['scene_number']}**" + (f" · variant {scene['winner']} chosen" if scene.get('winner') else ""))
+        for col, (number, (task_id, task_info)) in zip(st.columns(len(candidates)), sorted(candidates.items())):
+            with col:
+                st.caption(f"Variant {number} · {task_info['status']}")
+                if task_info['status'] != 'SUCCEEDED':
+                    continue
+                st.video(task_info.get('video_path') or task_info['video_url'])
+                if scene.get('winner') != number and st.button("✅ Pick", key=f"winner_{task_id}"):
+                    cancelled, errors = variants.pick_winner(
+                        video_tasks, st.session_state.scripts, script_title, scene['scene_number'], number, runway_keys()
+                    )
+                    save_data()
+                    add_activity(f"Picked variant {number} for scene {scene['scene_number']} of: {script_title}"
+                                 + (f", cancelled {cancelled} others" if cancelled else ""))
+                    for failed_id, message in errors:
+                        st.warning(f"⚠️ Couldn't cancel task {failed_id[:8]}... ({message})")
+                    st.rerun()
+
+
+def video_queue():
+    """Video Queue"""
+    st.title("Video Generation Queue")
+    
+    # API Configuration
+    with st.expander("🔑 RunwayML API Configuration", expanded=(not st.session_state.api_keys.get('runwayml'))):
+        api_key = st.text_input(
+            "API Key",
+            value=st.session_state.api_keys.get('runwayml', ''),
+            type="password",
+            placeholder="Enter your RunwayML API key",
+            help="Get your API key from RunwayML dashboard"
+        )
+        
+        if st.button("Save API Key"):
+            st.session_state.api_keys['runwayml'] = api_key
+            save_data()
+            add_activity("Updated API key")
+            st.success("API Key saved!")
+            st.rerun()
+        
+        st.write("**Budgets** (estimated from RunwayML's list price; 0 means no limit)")
+        col1, col2 = st.columns(2)
+        with col1:
+            daily_budget = st.number_input("Per day ($)", min_value=0.0, step=1.0,
+                                           value=float(st.session_state.budgets.get('daily', {}).get('runwayml') or 0))
+        with col2:
+            project_budget = st.number_input("Per project ($)", min_value=0.0, step=1.0,
+                                             value=float(st.session_state.budgets.get('project') or 0))
+        if st.button("Save Budgets"):
+            st.session_state.budgets = {**st.session_state.budgets, 'daily': {'runwayml': daily_budget}, 'project': project_budget}
+            save_data()
+            add_activity("Updated budgets")
+            st.success("Budgets saved!")
+    
+    meter = metering.Meter(st.session_state.budgets)
+    
+    if st.session_state.api_keys.get('runwayml'):
+        st.success("✅ API Key configured - Ready for video generation!")
+        usage = metering.load_usage()
+        st.caption(
+            f"💰 Estimated RunwayML spend today: ${metering.spend_today(usage, 'runwayml'):.2f} · "
+            f"{metering.in_flight(st.session_state.video_tasks, 'runwayml')} videos rendering"
+        )
+        
+        # Find ready projects
+        ready_projects = find_ready_projects(st.session_state.scripts)
+        
+        if ready_projects:
+            st.subheader("Ready for Video Generation")
+            readiness = {
+                project['title']: variants.assembly_status(st.session_state.scripts[project['title']],
+                                                           st.session_state.video_tasks, project['title'])
+                for project in ready_projects
+            }
+            finished = [title for title, ready in readiness.items() if not ready['pick'] and not ready['rendering']]
+            if len(finished) > 1 and st.button(f"📦 Export {len(finished)} finished projects"):
+                with st.spinner("Assembling and exporting..."):
+                    errors = export_projects(finished)
+                for error in errors:
+                    st.warning(f"⚠️ Couldn't export {error}")
+            
+            for project in ready_projects:
+                with st.expander(f"📝 {project['title']} ({project['ready_scenes']}/{project['total_scenes']} scenes ready)"):
+                    project_script = st.session_state.scripts[project['title']]
+                    show_timing_estimate(project['title'], 'runwayml')
+                    
+                    # Priority and deadline order this project's scenes in the job queue
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        priority_names = list(jobs.PRIORITIES)
+                        priority = st.selectbox(
+                            "Priority",
+                            priority_names,
+                            index=priority_names.index(project_script.get('priority', jobs.DEFAULT_PRIORITY)),
+                            key=f"priority_{project['title']}"
+                        )
+                    with col2:
+                        deadline = st.date_input(
+                            "Deadline",
+                            value=datetime.fromisoformat(project_script['deadline']).date() if project_script.get('deadline') else None,
+                            key=f"deadline_{project['title']}"
+                        )
+                    deadline = deadline.isoformat() if deadline else None
+                    with col3:
+                        variant_count = st.number_input(
+                            "Variants per scene", min_value=1, max_value=variants.MAX_VARIANTS,
+                            value=project_script.get('variant_count', 1), key=f"variants_{project['title']}",
+                            help="Render several candidates per scene with different seeds and pick the best"
+                        )
+                    if (priority != project_script.get('priority', jobs.DEFAULT_PRIORITY) or deadline != project_script.get('deadline')
+                            or variant_count != project_script.get('variant_count', 1)):
+                        project_script['priority'] = priority
+                        project_script['deadline'] = deadline
+                        project_script['variant_count'] = variant_count
+                        save_data()
+                    with col4:
+                        active = jobs.active_tasks(st.session_state.video_tasks, project['title'])
+                        if active and st.button(f"🛑 Cancel {len(active)} jobs", key=f"cancel_project_{project['title']}"):
+                            cancelled, errors = jobs.cancel_project(
+                                st.session_state.video_tasks, st.session_state.scripts, project['title'],
+                                runway_keys()
+                            )
+                            save_data()
+                            add_activity(f"Cancelled {cancelled} jobs for: {project['title']}")
+                            for task_id, message in errors:
+                                st.warning(f"⚠️ Couldn't cancel task {task_id[:8]}... ({message})")
+                            st.rerun()
+                    
+                    col1, col2, col3 = st.columns(3)
+                    
+                    with col1:
+                        if st.button(f"👀 Preview Prompts", key=f"preview_{project['title']}"):
+                            show_prompt_preview(project['title'], 'runwayml')
+
+                        if st.button(f"🧪 Check Consistency", key=f"consistency_{project['title']}"):
+                            try:
+                                with st.spinner("Comparing finished clips with character references..."):
+                                    rows, errors = consistency.check_project(
+                                        st.session_state.video_tasks, st.session_state.scripts,
+                                        st.session_state.characters, project['title']
+                                    )
+                                save_data()
+                            except consistency.ConsistencyError as e:
+                                st.error(f"❌ {e}")
+                            else:
+                                for task_id, message in errors:
+                                    st.warning(f"⚠️ Couldn't check task {task_id[:8]}... ({message})")
+                                if rows:
+                                    st.dataframe(rows, use_container_width=True, hide_index=True)
+                                else:
+                                    st.info("No finished clips with a character reference to check yet")
+
+                        flagged_scenes = sorted({
+                            info['scene_number'] for info in st.session_state.video_tasks.values()
+                            if info.get('script_title') == project['title']
+                            and info.get('status') == 'SUCCEEDED'
+                            and info.get('consistency', {}).get('outlier')
+                        })
+                        if flagged_scenes and st.button(f"🔁 Regenerate {len(flagged_scenes)} flagged",
+                                                        key=f"regenerate_{project['title']}"):
+                            for task_info in st.session_state.video_tasks.values():
+                                if task_info.get('script_title') == project['title'] and task_info.get('consistency', {}).get('outlier'):
+                                    task_info['consistency']['outlier'] = False
+                            for scene in project_script['scenes']:
+                                if scene['scene_number'] in flagged_scenes:
+                                    jobs.enqueue_scene(st.session_state.video_tasks, st.session_state.scripts,
+                                                       project['title'], scene, 'runwayml')
+                            jobs.dispatch(
+                                st.session_state.video_tasks, st.session_state.scripts, st.session_state.characters,
+                                runway_keys(), meter=meter, log=EVENT_LOG
+                            )
+                            save_data()
+                            add_activity(f"Regenerating {len(flagged_scenes)} inconsistent scenes for: {project['title']}")
+                            st.rerun()
+
+                    with col3:
+                        if st.button(f"🖼️ Prepare Keyframes", key=f"keyframes_{project['title']}"):
+                            prepare_keyframes(project['title'])
+                        
+                        show_animatic(project['title'])
+                    
+                    with col2:
+                        if st.button(f"🎥 Generate Videos", key=f"generate_{project['title']}"):
+                            with st.spinner("Submitting scenes to RunwayML..."):
+                                api_keys = runway_keys()
+                                queued = []
+                                for scene in filter_ready_scenes(project_script['scenes']):
+                                    if scene.get('status') in SUBMITTED_STATUSES + (DONE_STATUS,):
+                                        continue
+                                    if variant_count > 1:
+                                        queued += variants.enqueue_variants(
+                                            st.session_state.video_tasks, st.session_state.scripts, project['title'],
+                                            scene, variants.plan_variants(['runwayml'], variant_count)
+                                        )
+                                    else:
+                                        queued.append(jobs.enqueue_scene(st.session_state.video_tasks, st.session_state.scripts,
+                                                                         project['title'], scene, 'runwayml'))
+                                # Higher-priority projects' jobs go first; the rest wait in the queue
+                                submitted = jobs.dispatch(
+                                    st.session_state.video_tasks, st.session_state.scripts,
+                                    st.session_state.characters, api_keys, meter=meter, log=EVENT_LOG
+                                )
+                                save_data()
+                                
+                                outcomes = [st.session_state.video_tasks[task_id]['status'] for task_id in queued
+                                            if task_id in st.session_state.video_tasks]
+                                st.success(f"✅ Queued {len(queued)} jobs for '{project['title']}'; {submitted} sent to RunwayML")
+                                if outcomes.count(tasks.QUEUED):
+                                    st.info(f"⏳ {outcomes.count(tasks.QUEUED)} jobs are waiting in the queue for budget or rate limits")
+                                if outcomes.count(retry.DEAD_LETTER):
+                                    st.error(f"☠️ {outcomes.count(retry.DEAD_LETTER)} scenes could not be submitted - see Dead Letters below")
+                                add_activity(f"Submitted videos for: {project['title']}")
+
+                    assembly(project['title'], readiness[project['title']])
+        else:
+            st.info("No projects ready for generation. Complete scene assignments first in Scene Builder!")
+    
+    # Video Status Tracking Section
+    if st.session_state.video_tasks:
+        if st.toggle("📡 Live status", key="live_status", help="Check rendering videos in the background and refresh every few seconds"):
+            st.session_state.status_table_drawn = False
+            live_status(st.empty())
+        video_status(meter)
+    
+    else:
+        st.warning("Please configure your RunwayML API key first.")
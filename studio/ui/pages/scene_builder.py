@@ -0,0 +1,187 @@
+"""Scene Builder page"""
+import streamlit as st
+
+from studio import timing
+from studio.scenes import is_scene_ready, scene_counts, update_scene
+from studio.status import format_eta
+from studio.ui.common import PLATFORM_KEYS, add_activity, observed_render_seconds, save_data
+
+
+def set_scene_field(script_title, index, field, widget_key):
+    """Widget callback: write one edited scene field straight away"""
+    update_scene(st.session_state.scripts[script_title], index, **{field: st.session_state[widget_key]})
+    save_data('scripts', entries=(script_title,))
+
+
+@st.fragment
+def scene_editor(script_title, index, char_options, was_ready):
+    """One scene's editor; its edits rerun only this fragment"""
+    scene = st.session_state.scripts[script_title]['scenes'][index]
+    with st.expander(f"Scene {scene['scene_number']}", expanded=(not scene.get('assigned_character'))):
+        st.markdown('<div class="scene-card">', unsafe_allow_html=True)
+        
+        st.write(f"**Narration:** {scene['narration']}")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Character assignment
+            current_char = scene.get('assigned_character', '')
+            char_key = f"char_{script_title}_{index}"
+            st.selectbox(
+                "Assign Character",
+                char_options,
+                index=char_options.index(current_char) if current_char in char_options else 0,
+                key=char_key,
+                on_change=set_scene_field,
+                args=(script_title, index, 'assigned_character', char_key)
+            )
+        
+        with col2:
+            # Visual description
+            visual_key = f"visual_{script_title}_{index}"
+            st.text_area(
+                "Visual Description",
+                scene.get('visual_description', ''),
+                height=100,
+                key=visual_key,
+                placeholder="Describe what should be shown in this scene...",
+                on_change=set_scene_field,
+                args=(script_title, index, 'visual_description', visual_key)
+            )
+        
+        # Status indicator
+        if scene.get('assigned_character') and scene.get('visual_description'):
+            st.success("✅ Ready for video generation")
+        elif scene.get('assigned_character'):
+            st.warning("⚠️ Missing visual description")
+        elif scene.get('visual_description'):
+            st.warning("⚠️ No character assigned")
+        else:
+            st.error("❌ Incomplete - needs character and visual description")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # The progress bar above counts ready scenes, so refresh the page when that changes
+    if is_scene_ready(scene) != was_ready:
+        st.rerun()
+
+
+def clip_label(clip):
+    scenes = " + ".join(str(number) for number in clip['scenes'])
+    return f"{scenes} (part {clip['part']}/{clip['parts']})" if clip['parts'] > 1 else scenes
+
+
+def timing_plan(script_title):
+    """Fit the script's scenes to clip lengths and a runtime target, and apply the merges and splits"""
+    script_data = st.session_state.scripts[script_title]
+    col1, col2 = st.columns(2)
+    with col1:
+        target = st.number_input("Target runtime (seconds)", 5, 600, timing.TARGET_SECONDS, step=5,
+                                 key=f"timing_target_{script_title}")
+    with col2:
+        platform_label = st.selectbox("Platform", list(PLATFORM_KEYS), key=f"timing_platform_{script_title}")
+
+    observed = observed_render_seconds()
+    plans = {
+        label: timing.plan_scenes(script_data['scenes'], platform, target, observed.get(platform))
+        for label, platform in PLATFORM_KEYS.items()
+    }
+    st.dataframe(
+        [
+            {
+                'platform': label, 'clips': plan['clip_count'], 'runtime': plan['runtime_seconds'],
+                'over_by': plan['over_by'], 'cost': plan['cost'], 'render_time': format_eta(plan['wall_seconds'])
+            }
+            for label, plan in plans.items()
+        ],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'platform': "Platform",
+            'clips': "Clips",
+            'runtime': st.column_config.NumberColumn("Runtime (s)"),
+            'over_by': st.column_config.NumberColumn("Over target (s)"),
+            'cost': st.column_config.NumberColumn("Est. cost", format="$%.2f"),
+            'render_time': "Render time"
+        }
+    )
+
+    plan = plans[platform_label]
+    with st.expander(f"Clips for {platform_label}"):
+        st.dataframe(
+            [
+                {
+                    'clip': i + 1, 'scenes': clip_label(clip),
+                    'narration': clip['narration'], 'clip_seconds': clip['clip_seconds']
+                }
+                for i, clip in enumerate(plan['clips'])
+            ],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'clip': st.column_config.NumberColumn("Clip", width="small"),
+                'scenes': "Scenes",
+                'narration': st.column_config.NumberColumn("Narration (s)", format="%.1f"),
+                'clip_seconds': st.column_config.NumberColumn("Clip (s)")
+            }
+        )
+    if plan['over_by']:
+        st.warning(f"⚠️ {plan['over_by']}s over the {target}s target even after merging; trim the narration")
+    else:
+        st.success(f"✅ Fits in {target}s with {target - plan['runtime_seconds']}s to spare")
+
+    if timing.changes(plan) and st.button(f"✂️ Apply {plan['clip_count']} clip plan for {platform_label}",
+                                          key=f"timing_apply_{script_title}"):
+        try:
+            timing.apply_plan(script_data, plan)
+        except timing.PlanError as e:
+            st.error(f"Couldn't apply the plan: {e}")
+            return
+        # Scene editors are keyed by position, which now holds a different scene
+        for key in [key for key in st.session_state
+                    if key.startswith((f"char_{script_title}_", f"visual_{script_title}_"))]:
+            del st.session_state[key]
+        save_data('scripts', entries=(script_title,))
+        add_activity(f"Planned {plan['clip_count']} clips for: {script_title}")
+        st.rerun()
+
+
+def render():
+    """Scene Builder"""
+    st.title("Scene Builder")
+    
+    if not st.session_state.scripts:
+        st.warning("Please add some scripts first in the Script Manager!")
+    elif not st.session_state.characters:
+        st.warning("Please add some characters first in the Character Database!")
+    else:
+        # Script selection
+        script_options = list(st.session_state.scripts.keys())
+        selected_script = st.selectbox("Select Script", script_options, key="scene_script_select")
+        
+        if selected_script:
+            script_data = st.session_state.scripts[selected_script]
+            
+            if not script_data.get('scenes'):
+                st.info("No scenes generated yet. Go to Script Manager and click 'Generate Scenes'.")
+            else:
+                st.subheader(f"Scenes for '{selected_script}'")
+                
+                # Progress bar
+                counts = scene_counts(script_data)
+                total_scenes = counts['total']
+                ready_scenes = counts['ready']
+                progress = ready_scenes / total_scenes if total_scenes > 0 else 0
+                
+                st.progress(progress, text=f"Scene Progress: {ready_scenes}/{total_scenes} scenes ready")
+                
+                if st.toggle("⏱️ Timing plan", key=f"timing_{selected_script}",
+                             help="Estimate runtime, cost and render time, and merge or split scenes to fit"):
+                    timing_plan(selected_script)
+                
+                # Scene editing; each scene re-renders on its own when edited
+                char_options = [""] + list(st.session_state.characters.keys())
+                
+                for i, scene in enumerate(script_data['scenes']):
+                    scene_editor(selected_script, i, char_options, is_scene_ready(scene))
@@ -0,0 +1,160 @@
+"""Script Manager page"""
+from datetime import datetime
+
+import streamlit as st
+
+from studio import script_import
+from studio.library import paginate
+from studio.scenes import generate_scenes, set_scenes
+from studio.ui.common import SCRIPTS_PER_PAGE, add_activity, save_data, script_index
+
+
+def set_script_page(page_number):
+    st.session_state.script_page = page_number
+
+
+def reset_script_page():
+    """Go back to the first page when the search changes"""
+    st.session_state.script_page = 1
+
+
+def bulk_import():
+    """Import uploaded files, zips or a folder on the server in one go"""
+    source = st.radio("Source", ["Upload files", "Folder on the server"], horizontal=True, key="import_source")
+    if source == "Upload files":
+        uploads = st.file_uploader(
+            "Scripts", type=['txt', 'md', 'zip'], accept_multiple_files=True,
+            help="Text or Markdown files, or zips of them; a Markdown file's first # heading becomes its title"
+        )
+        folder = None
+    else:
+        folder = st.text_input(
+            "Folder", placeholder="scripts/batch-1",
+            help=f"A folder or zip inside {script_import.IMPORT_ROOT}; every .txt and .md file below it is imported"
+        )
+        uploads = []
+    overwrite = st.checkbox("Replace scripts that already exist", help="Replaced scripts lose their scene assignments")
+
+    if st.button("📥 Import Scripts", use_container_width=True, disabled=not (uploads or folder)):
+        with st.spinner("Importing scripts..."):
+            try:
+                if folder:
+                    results = script_import.parse_sources(script_import.resolve_import_folder(folder))
+                else:
+                    results = script_import.parse_sources(
+                        [(upload.name, upload.getvalue()) for upload in uploads if not upload.name.endswith('.zip')]
+                    )
+                    for upload in uploads:
+                        if upload.name.endswith('.zip'):
+                            results += script_import.parse_sources(upload)
+            except script_import.ScriptImportError as e:
+                st.error(f"Import failed: {e}")
+                return
+            summary = script_import.add_scripts(results, st.session_state.scripts, overwrite)
+        save_data('scripts')
+        add_activity(f"Imported {summary['imported'] + summary['replaced']} scripts")
+        st.success(
+            f"✅ Imported {summary['imported']} scripts with {summary['scenes']} scenes"
+            + (f", replaced {summary['replaced']}" if summary['replaced'] else "")
+        )
+        if summary['skipped']:
+            st.warning(f"⚠️ Skipped {summary['skipped']} files")
+            for error in summary['errors']:
+                st.caption(error)
+
+
+@st.fragment
+def script_list(script_count):
+    """Search and one page of scripts; searching and paging rerun only this fragment"""
+    query = st.text_input(
+        "🔍 Search",
+        placeholder="Search titles and script text",
+        key="script_search",
+        on_change=reset_script_page
+    )
+    matches = script_index().search(query)
+    page_items, page_number, page_count = paginate(matches, st.session_state.get('script_page', 1), SCRIPTS_PER_PAGE)
+    st.caption(f"{len(matches)} of {script_count} scripts")
+
+    # Only the current page's scripts are rendered
+    for script_title in page_items:
+        script_data = st.session_state.scripts[script_title]
+        with st.expander(f"📜 {script_title}"):
+            st.text_area("Content", script_data['content'], height=150, disabled=True, key=f"view_{script_title}")
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if st.button(f"🎬 Generate Scenes", key=f"gen_{script_title}"):
+                    # Generate scenes from script
+                    scenes = generate_scenes(script_data['content'])
+
+                    set_scenes(st.session_state.scripts[script_title], scenes)
+                    save_data('scripts', entries=(script_title,))
+                    add_activity(f"Generated {len(scenes)} scenes for: {script_title}")
+                    st.success(f"Generated {len(scenes)} scenes!")
+                    st.rerun()
+
+            with col2:
+                scene_count = len(script_data.get('scenes', []))
+                if scene_count > 0:
+                    st.info(f"📊 {scene_count} scenes")
+                else:
+                    st.warning("No scenes generated")
+
+            with col3:
+                if st.button(f"🗑️ Delete", key=f"del_script_{script_title}"):
+                    del st.session_state.scripts[script_title]
+                    save_data('scripts')
+                    add_activity(f"Deleted script: {script_title}")
+                    # The script count and other pages' project lists change too
+                    st.rerun()
+
+    if page_count > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("◀ Previous", disabled=page_number <= 1, key="script_prev",
+                      on_click=set_script_page, args=(page_number - 1,))
+        with col2:
+            st.write(f"Page {page_number} of {page_count}")
+        with col3:
+            st.button("Next ▶", disabled=page_number >= page_count, key="script_next",
+                      on_click=set_script_page, args=(page_number + 1,))
+
+
+def render():
+    """Script Manager"""
+    st.title("Script Manager")
+    
+    # Add new script section
+    with st.expander("➕ Add New Script", expanded=(len(st.session_state.scripts) == 0)):
+        with st.form("add_script_form"):
+            script_title = st.text_input("Script Title", placeholder="Enter script title")
+            script_content = st.text_area("Script Content", placeholder="Enter your YouTube Short script here...", height=200)
+            
+            submitted = st.form_submit_button("Save Script", use_container_width=True)
+            
+            if submitted:
+                if not script_title or not script_content:
+                    st.error("Please fill in script title and content")
+                elif script_title in st.session_state.scripts:
+                    st.error("Script title already exists")
+                else:
+                    st.session_state.scripts[script_title] = {
+                        'content': script_content,
+                        'created': datetime.now().isoformat(),
+                        'scenes': []
+                    }
+                    save_data()
+                    add_activity(f"Added script: {script_title}")
+                    st.success(f"Script '{script_title}' saved successfully!")
+                    st.rerun()
+    
+    with st.expander("📥 Bulk Import"):
+        bulk_import()
+    
+    # Display scripts
+    if st.session_state.scripts:
+        st.subheader(f"Your Scripts ({len(st.session_state.scripts)})")
+        script_list(len(st.session_state.scripts))
+    else:
+        st.info("No scripts added yet. Add your first script above!")
@@ -0,0 +1,227 @@
+"""Export, import, storage and performance page"""
+import json
+import time
+
+import streamlit as st
+
+from studio import backup, blobs, media_cache, perf
+from studio.scenes import rebuild_scene_counts
+from studio.settings import keys_from_export
+from studio.ui.common import EVENT_LOG, add_activity, offer_backup_download, save_data
+
+# Scanning the media folders is reused this long between reruns
+MEDIA_USAGE_TTL = 60
+
+
+def media_usage():
+    """Bytes and files per media category, rescanned at most once a minute"""
+    cached = st.session_state.get('media_usage')
+    if cached is None or time.time() - cached[0] > MEDIA_USAGE_TTL:
+        cached = (time.time(), media_cache.usage(media_cache.scan()))
+        st.session_state.media_usage = cached
+    return cached[1]
+
+
+def media_storage():
+    """Media cache limits, an on-demand sweep, and usage by category"""
+    config = media_cache.load_config()
+    col1, col2 = st.columns(2)
+    with col1:
+        quota_gb = st.number_input("Quota (GB, 0 for none)", min_value=0.0, step=1.0, value=float(config['quota_gb']))
+    with col2:
+        max_age_days = st.number_input("Evict after days unused (0 for never)", min_value=0, step=1,
+                                       value=int(config['max_age_days']))
+    evict_deliverables = st.checkbox(
+        "Also evict downloaded clips and platform exports", value=bool(config['evict_deliverables']),
+        help="Clips can't be downloaded again once the provider's link expires"
+    )
+    limits = {'quota_gb': quota_gb, 'max_age_days': max_age_days, 'evict_deliverables': evict_deliverables}
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Save Limits", use_container_width=True):
+            media_cache.save_config(limits)
+            add_activity("Updated media cache limits")
+            st.success("Limits saved!")
+    with col2:
+        if st.button("🧹 Free Space Now", use_container_width=True):
+            with st.spinner("Evicting cached media..."):
+                summary = media_cache.sweep(config=limits, log=EVENT_LOG)
+            st.session_state.pop('media_usage', None)
+            st.success(f"Removed {summary['removed']} files and freed {summary['freed_bytes'] / (1024 * 1024):.1f} MB")
+            if summary['over_quota_bytes']:
+                st.warning(f"⚠️ Still {summary['over_quota_bytes'] / (1024 * 1024):.1f} MB over the quota in media "
+                           "that active projects use or that can't be evicted")
+
+    totals = media_usage()
+    total_bytes = sum(row['bytes'] for row in totals.values())
+    if quota_gb:
+        st.progress(min(1.0, total_bytes / (quota_gb * media_cache.GB)),
+                    text=f"{total_bytes / media_cache.GB:.2f} of {quota_gb:g} GB used")
+    else:
+        st.caption(f"{total_bytes / media_cache.GB:.2f} GB used, no quota")
+    evictable = media_cache.evictable_categories(limits)
+    st.dataframe(
+        [
+            {
+                'Category': label,
+                'Files': totals[category]['files'],
+                'MB': round(totals[category]['bytes'] / (1024 * 1024), 1),
+                'Evictable': category in evictable
+            }
+            for category, (label, _, _) in media_cache.CATEGORIES.items()
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+    st.caption("Keyframes, clips, masters, animatics and thumbnails that active projects use are never evicted")
+
+
+def render():
+    """Export, import, storage and performance"""
+    st.title("Settings")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📤 Export Data")
+        
+        export_format = st.radio(
+            "Format",
+            ["Zip bundle (with images and videos)", "NDJSON (records only)"],
+            help="Backups are written record by record to the server's exports folder"
+        )
+        include_keys = st.checkbox("Include API keys", value=False)
+        
+        if st.button("Export Characters", use_container_width=True):
+            if st.session_state.characters:
+                path = backup.write_backup(
+                    lambda path: backup.export_ndjson(path, st.session_state.characters, {}), 'ndjson', 'characters'
+                )
+                offer_backup_download(path, "Download Characters NDJSON")
+        
+        if st.button("Export Scripts", use_container_width=True):
+            if st.session_state.scripts:
+                path = backup.write_backup(
+                    lambda path: backup.export_ndjson(path, {}, st.session_state.scripts), 'ndjson', 'scripts'
+                )
+                offer_backup_download(path, "Download Scripts NDJSON")
+        
+        if st.button("Export All Data", use_container_width=True):
+            api_keys = st.session_state.api_keys if include_keys else None
+            if export_format.startswith("Zip"):
+                path = backup.write_backup(
+                    lambda path: backup.export_bundle(path, st.session_state.characters, st.session_state.scripts, api_keys),
+                    'zip'
+                )
+            else:
+                path = backup.write_backup(
+                    lambda path: backup.export_ndjson(path, st.session_state.characters, st.session_state.scripts, api_keys),
+                    'ndjson'
+                )
+            offer_backup_download(path, "Download Backup")
+    
+    with col2:
+        st.subheader("📥 Import Data")
+        
+        uploaded_file = st.file_uploader("Import Backup", type=['zip', 'ndjson', 'json'])
+        import_keys = st.checkbox("Import API keys", value=False)
+        
+        if uploaded_file and st.button("Import Data", use_container_width=True):
+            try:
+                if not uploaded_file.name.endswith('.json'):
+                    summary = backup.import_backup(
+                        uploaded_file,
+                        st.session_state.characters,
+                        st.session_state.scripts,
+                        st.session_state.api_keys if import_keys else None
+                    )
+                    save_data()
+                    # Count the imported images once the characters pointing at them are on disk
+                    blobs.reconcile()
+                    add_activity(f"Imported {summary['characters']} characters and {summary['scripts']} scripts")
+                    if summary['errors']:
+                        st.warning(f"Skipped {summary['skipped']} invalid records:\n\n" + "\n\n".join(summary['errors']))
+                    else:
+                        st.success("Data imported successfully!")
+                        st.rerun()
+                else:
+                    # Legacy single-document JSON export
+                    data = json.load(uploaded_file)
+                    
+                    if 'characters' in data:
+                        st.session_state.characters.update(data['characters'])
+                    if 'scripts' in data:
+                        for imported_script in data['scripts'].values():
+                            rebuild_scene_counts(imported_script)
+                        st.session_state.scripts.update(data['scripts'])
+                    if import_keys:
+                        # Exports from either app: {'api_keys': {...}} or {'settings': {'api_key': ...}}
+                        st.session_state.api_keys.update(keys_from_export(data))
+                    
+                    save_data()
+                    add_activity("Imported data from file")
+                    st.success("Data imported successfully!")
+                    st.rerun()
+            except Exception as e:
+                st.error(f"Error importing data: {e}")
+
+    # Image store
+    st.subheader("🗄️ Image Store")
+    
+    blob_count, blob_bytes = blobs.usage()
+    st.write(f"**{blob_count}** stored images using **{blob_bytes / (1024 * 1024):.1f} MB**")
+    
+    if st.button("🧹 Clean Up Images"):
+        # Counts come from the saved characters, so save this session's first
+        save_data('characters')
+        summary = blobs.collect_garbage()
+        add_activity(f"Removed {summary['removed']} unused images")
+        st.success(f"Removed {summary['removed']} unused images and freed {summary['freed_bytes'] / (1024 * 1024):.1f} MB")
+    
+    # Generated media
+    st.subheader("💽 Media Storage")
+    media_storage()
+    
+    # Performance panel
+    st.subheader("⏱️ Performance")
+    
+    perf_enabled = st.toggle(
+        "Enable timing instrumentation",
+        value=perf.is_enabled(),
+        help="Times persistence, image I/O, provider requests and page renders"
+    )
+    if perf_enabled != perf.is_enabled():
+        perf.enable(perf_enabled)
+    
+    perf_rows = perf.snapshot()
+    if perf_rows:
+        st.dataframe(
+            [{k: v for k, v in row.items() if k != 'buckets'} for row in perf_rows],
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.download_button(
+                "Download JSON",
+                perf.export_json(),
+                "studio_perf.json",
+                "application/json",
+                use_container_width=True
+            )
+        with col2:
+            st.download_button(
+                "Download Prometheus",
+                perf.export_prometheus(),
+                "studio_perf.prom",
+                "text/plain",
+                use_container_width=True
+            )
+        with col3:
+            if st.button("Reset Timings", use_container_width=True):
+                perf.reset()
+                st.rerun()
+    else:
+        st.info("No timings recorded yet. Enable instrumentation and use the app to collect them.")
@@ -0,0 +1,105 @@
+"""A/B variants: several candidate clips per scene, and picking the winner
+
+A project can ask for up to ``MAX_VARIANTS`` clips per scene, spread over
+the platforms it uses and given different seeds. Every variant is an
+ordinary job in the queue carrying its ``variant`` number and ``seed``, so
+the dispatcher fans them out as fast as each provider's rate and in-flight
+limits allow, and retries and cancellation work as for any job.
+
+The scene records what was asked for (``scene['variants']``) and, once
+picked, which one won (``scene['winner']``). Until a winner is picked the
+first variant to finish marks the scene done; after that only the winner
+counts, and the variants still rendering can be cancelled. Assembly waits
+only for each scene's winner - or its only clip - to be ready.
+"""
+import random
+
+import requests
+
+from studio import jobs
+from studio.scenes import scene_index, update_scene
+
+MAX_VARIANTS = 4
+SEED_RANGE = 2 ** 32
+
+
+def plan_variants(platforms, count, rng=random):
+    """Variant specs ``{'variant', 'platform', 'seed'}``, taking the platforms in turn"""
+    count = max(1, min(count, MAX_VARIANTS))
+    return [
+        {'variant': i + 1, 'platform': platforms[i % len(platforms)], 'seed': rng.randrange(SEED_RANGE)}
+        for i in range(count)
+    ]
+
+
+def enqueue_variants(video_tasks, scripts, script_title, scene, specs, now=None):
+    """Queue one job per variant spec for a scene, returning their task ids"""
+    script = scripts[script_title]
+    index = scene_index(script, scene['scene_number'])
+    update_scene(script, index, variants=specs, winner=None)
+    task_ids = []
+    for spec in specs:
+        task_id = jobs.enqueue_scene(video_tasks, scripts, script_title, scene, spec['platform'], now)
+        video_tasks[task_id].update(variant=spec['variant'], seed=spec['seed'])
+        task_ids.append(task_id)
+    return task_ids
+
+
+def project_variants(video_tasks, script_title):
+    """``{scene number: {variant: (task_id, task_info)}}`` for one project's variant jobs"""
+    found = {}
+    for task_id, info in video_tasks.items():
+        if info.get('script_title') == script_title and info.get('variant'):
+            found.setdefault(info['scene_number'], {})[info['variant']] = (task_id, info)
+    return found
+
+
+def pick_winner(video_tasks, scripts, script_title, scene_number, variant, api_keys, http=requests):
+    """Choose a scene's winning variant and cancel its variants that are still queued or rendering
+
+    Returns jobs.cancel_tasks' (cancelled, errors).
+    """
+    script = scripts[script_title]
+    update_scene(script, scene_index(script, scene_number), winner=variant, status='done')
+    losers = [
+        task_id for number, (task_id, info) in project_variants(video_tasks, script_title).get(scene_number, {}).items()
+        if number != variant and info.get('status') in jobs.WAITING_STATUSES
+    ]
+    return jobs.cancel_tasks(video_tasks, scripts, losers, api_keys, http)
+
+
+def assembly_status(script, video_tasks, script_title):
+    """What assembling a project is waiting on, in one pass over the tasks
+
+    A scene without variants uses its one successful clip. Returns ``{'clips': [(scene number, task id)], 'pick': [scene numbers
+    with a finished variant but no winner], 'rendering': [scene numbers whose
+    chosen clip isn't ready]}``. Losing variants still rendering are ignored.
+    """
+    by_scene = {}
+    singles = {}
+    for task_id, info in video_tasks.items():
+        if info.get('script_title') != script_title:
+            continue
+        if info.get('variant'):
+            by_scene.setdefault(info['scene_number'], {})[info['variant']] = (task_id, info)
+        elif info.get('status') == 'SUCCEEDED':
+            singles.setdefault(info['scene_number'], task_id)
+
+    status = {'clips': [], 'pick': [], 'rendering': []}
+    for scene in script.get('scenes', []):
+        number = scene['scene_number']
+        if scene.get('variants'):
+            variants = by_scene.get(number, {})
+            winner = variants.get(scene.get('winner'))
+            if winner and winner[1].get('status') == 'SUCCEEDED':
+                status['clips'].append((number, winner[0]))
+            elif scene.get('winner') is None and any(info.get('status') == 'SUCCEEDED' for _, info in variants.values()):
+                status['pick'].append(number)
+            else:
+                status['rendering'].append(number)
+        elif number in singles:
+            status['clips'].append((number, singles[number]))
+        else:
+            status['rendering'].append(number)
+    return status
+
@@ -0,0 +1,149 @@
+"""SyncedStore merging and the three-way merge underneath it"""
+import pytest
+
+from studio import storage
+from studio.scenes import rebuild_scene_counts
+from studio.storage import SyncedStore, load_json, save_json
+
+
+def merge(base, ours, theirs):
+    conflicts = []
+    return storage._merge_values(base, ours, theirs, (), conflicts), conflicts
+
+
+def test_merge_takes_the_side_that_changed():
+    assert merge(1, 2, 1) == (2, [])
+    assert merge(1, 1, 3) == (3, [])
+    assert merge(1, 4, 4) == (4, [])
+
+
+def test_merge_combines_different_dict_keys():
+    merged, conflicts = merge({'a': 1, 'b': 1}, {'a': 2, 'b': 1}, {'a': 1, 'b': 3, 'c': 4})
+    assert merged == {'a': 2, 'b': 3, 'c': 4}
+    assert conflicts == []
+
+
+def test_merge_drops_keys_deleted_on_one_side():
+    merged, conflicts = merge({'a': 1, 'b': 1}, {'a': 1}, {'a': 2, 'b': 1})
+    assert merged == {'a': 2}
+    assert conflicts == []
+
+
+def test_merge_goes_into_same_length_lists():
+    base = [{'n': 1}, {'n': 2}]
+    merged, conflicts = merge(base, [{'n': 10}, {'n': 2}], [{'n': 1}, {'n': 20}])
+    assert merged == [{'n': 10}, {'n': 20}]
+    assert conflicts == []
+
+
+def test_merge_keeps_ours_for_lists_resized_on_both_sides():
+    merged, conflicts = merge([1, 2], [1, 2, 3], [1])
+    assert merged == [1, 2, 3]
+    assert conflicts == [()]
+
+
+def test_merge_reports_the_path_of_a_field_changed_on_both_sides():
+    merged, conflicts = merge({'s': [{'x': 1}]}, {'s': [{'x': 2}]}, {'s': [{'x': 3}]})
+    assert merged == {'s': [{'x': 2}]}
+    assert conflicts == [('s', 0, 'x')]
+
+
+@pytest.fixture
+def scripts_store(tmp_path):
+    script = {'content': 'text', 'scenes': [
+        {'scene_number': number, 'narration': f"scene {number}", 'status': 'pending'} for number in (1, 2, 3)
+    ]}
+    rebuild_scene_counts(script)
+    save_json('scripts.json', {'Night': script}, str(tmp_path))
+    return str(tmp_path)
+
+
+def session(data_dir):
+    store = SyncedStore('scripts.json', data_dir, derived={'scene_counts': rebuild_scene_counts})
+    return store, store.pull({})
+
+
+def test_sessions_editing_different_scenes_keep_both_edits(scripts_store):
+    first, ours = session(scripts_store)
+    second, theirs = session(scripts_store)
+    ours['Night']['scenes'][0]['narration'] = "ours"
+    theirs['Night']['scenes'][2]['status'] = 'ready'
+    first.push(ours, ['Night'])
+    merged = second.push(theirs, ['Night'])
+
+    scenes = load_json('scripts.json', data_dir=scripts_store)['Night']['scenes']
+    assert [scene['narration'] for scene in scenes] == ["ours", "scene 2", "scene 3"]
+    assert scenes[2]['status'] == 'ready'
+    assert merged['Night']['scenes'][0]['narration'] == "ours"
+    assert first.take_conflicts() == [] and second.take_conflicts() == []
+
+
+def test_same_field_edited_twice_is_reported(scripts_store):
+    first, ours = session(scripts_store)
+    second, theirs = session(scripts_store)
+    ours['Night']['content'] = "ours"
+    theirs['Night']['content'] = "theirs"
+    first.push(ours)
+    second.push(theirs)
+
+    assert load_json('scripts.json', data_dir=scripts_store)['Night']['content'] == "theirs"
+    assert second.take_conflicts() == [('Night', 'content')]
+    assert second.take_conflicts() == []
+
+
+def test_pull_keeps_unsaved_edits(scripts_store):
+    first, ours = session(scripts_store)
+    second, theirs = session(scripts_store)
+    theirs['Dawn'] = {'content': 'new', 'scenes': []}
+    second.push(theirs)
+    ours['Night']['scenes'][1]['narration'] = "unsaved"
+
+    pulled = first.pull(ours)
+    assert 'Dawn' in pulled
+    assert pulled['Night']['scenes'][1]['narration'] == "unsaved"
+    assert first.version == storage.store_version('scripts.json', scripts_store)
+
+
+def test_push_with_marked_keys_still_finds_added_and_removed_entries(scripts_store):
+    store, data = session(scripts_store)
+    data['Dawn'] = {'content': 'new', 'scenes': []}
+    data = store.push(data, [])
+    assert 'Dawn' in load_json('scripts.json', data_dir=scripts_store)
+    del data['Night']
+    store.push(data, [])
+    assert 'Night' not in load_json('scripts.json', data_dir=scripts_store)
+
+
+def test_deleting_an_entry_another_session_changed_keeps_it(scripts_store):
+    first, ours = session(scripts_store)
+    second, theirs = session(scripts_store)
+    theirs['Night']['content'] = "edited"
+    second.push(theirs)
+    del ours['Night']
+
+    merged = first.push(ours)
+    assert merged['Night']['content'] == "edited"
+    assert first.take_conflicts() == [('Night',)]
+
+
+def test_version_matches_the_text_that_was_read(scripts_store, monkeypatch):
+    """A writer replacing the file right after the read must not lend its version to the old text"""
+    store, data = session(scripts_store)
+    real_read_text = storage._read_text
+
+    def read_then_replace(name, data_dir):
+        result = real_read_text(name, data_dir)
+        save_json(name, {'Other': {'content': 'x', 'scenes': []}}, data_dir)
+        return result
+
+    save_json('scripts.json', {**data, 'Dawn': {'content': 'new', 'scenes': []}}, scripts_store)
+    monkeypatch.setattr(storage, '_read_text', read_then_replace)
+    data = store.pull(data)
+    monkeypatch.undo()
+
+    assert store.version != storage.store_version('scripts.json', scripts_store)
+    data['Dawn']['content'] = "ours"
+    store.push(data, ['Dawn'])
+    on_disk = load_json('scripts.json', data_dir=scripts_store)
+    # The push noticed the newer file and merged into it instead of overwriting it
+    assert 'Other' in on_disk